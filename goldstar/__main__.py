@@ -1,4 +1,9 @@
-﻿from .gui import main
+﻿import multiprocessing
+import sys
+
+from .cli import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Frozen builds re-run this entry point in icon render workers.
+    multiprocessing.freeze_support()
+    sys.exit(main())
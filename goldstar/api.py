@@ -0,0 +1,196 @@
+﻿import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .behavior import SyncReport, sync_behavior_pack
+from .config import DEFAULT_NAMESPACE
+from .entity import (
+    ENTITY_PACK_NAME,
+    EntitySpec,
+    commit_entity_batch,
+    expand_archive_spec,
+    plan_entity_files,
+    plan_shared_entity_files,
+    validate_entity_spec,
+)
+from .file_plan import FilePlan, PlanIssue
+from .models import PackIndex
+from .pack_ops import check_missing_packs, create_missing_packs
+from .roots import FileIndexCache
+from .scanner import blf_pack_dirs
+
+DEFAULT_API_WORKERS = 4
+
+
+@dataclass
+class PackCheckResult:
+    root: Path
+    missing: List[str] = field(default_factory=list)
+    created: List[Path] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing
+
+
+@dataclass
+class EntityResult:
+    name: str
+    issues: List[PlanIssue] = field(default_factory=list)
+    created: List[Path] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+@dataclass
+class _PendingEntity:
+    spec: EntitySpec
+    behavior: bool
+    plan: FilePlan
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+
+
+def _resolve(future: asyncio.Future, result=None, error: Optional[BaseException] = None) -> None:
+    # The caller may have been cancelled while its entity was being committed.
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class GoldStarAPI:
+    def __init__(
+        self,
+        resource_root: Path,
+        workers: int = DEFAULT_API_WORKERS,
+        fallback_icon: Optional[Path] = None,
+    ) -> None:
+        self.resource_root = resource_root
+        self.fallback_icon = fallback_icon
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="goldstar-api")
+        # Planning overlaps freely; anything that writes to the packs runs on this one thread, one commit at a time.
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="goldstar-writer")
+        self._index_cache = FileIndexCache()
+        self._pending: List[_PendingEntity] = []
+        self._pending_lock = threading.Lock()
+        self.closed = False
+
+    async def __aenter__(self) -> "GoldStarAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        # Blocks until queued jobs finish; from a coroutine use aclose instead.
+        self.closed = True
+        self._executor.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        self.closed = True
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise RuntimeError("GoldStarAPI is closed")
+
+    async def _run(self, func, *args, **kwargs):
+        self._check_open()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _write(self, func, *args, **kwargs):
+        self._check_open()
+        return await asyncio.get_running_loop().run_in_executor(self._writer, partial(func, *args, **kwargs))
+
+    async def scan(self, refresh: bool = False) -> List[PackIndex]:
+        pack_dirs = await self._run(blf_pack_dirs, self.resource_root)
+        return list(await asyncio.gather(*(self._run(self._index_cache.get, p, refresh) for p in pack_dirs)))
+
+    async def check_packs(self) -> PackCheckResult:
+        return PackCheckResult(self.resource_root, await self._run(check_missing_packs, self.resource_root))
+
+    async def create_packs(self, names: Optional[Iterable[str]] = None) -> PackCheckResult:
+        result = await self._write(self._create_packs, None if names is None else set(names))
+        for pack_dir in result.created:
+            self._index_cache.discard(pack_dir)
+        return result
+
+    async def create_entity(self, spec: EntitySpec, behavior: bool = False) -> EntityResult:
+        spec, plan = await self._run(self._plan_entity, spec)
+        if plan.issues:
+            return EntityResult(spec.name, list(plan.issues), notes=list(plan.notes))
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        pending = _PendingEntity(spec, behavior, plan, loop.create_future(), loop)
+        with self._pending_lock:
+            self._pending.append(pending)
+        self._writer.submit(self._drain)
+        return await pending.future
+
+    async def create_entities(self, specs: Iterable[EntitySpec], behavior: bool = False) -> List[EntityResult]:
+        return list(await asyncio.gather(*(self.create_entity(spec, behavior) for spec in specs)))
+
+    async def sync_behavior(self, dry_run: bool = False, namespace: str = DEFAULT_NAMESPACE) -> SyncReport:
+        return await self._write(sync_behavior_pack, self.resource_root, dry_run, namespace, self.fallback_icon)
+
+    def _create_packs(self, names: Optional[set]) -> PackCheckResult:
+        missing = check_missing_packs(self.resource_root)
+        wanted = [name for name in missing if names is None or name in names]
+        created = create_missing_packs(self.resource_root, wanted)
+        return PackCheckResult(self.resource_root, check_missing_packs(self.resource_root), created)
+
+    def _plan_entity(self, spec: EntitySpec) -> Tuple[EntitySpec, FilePlan]:
+        spec, issues = expand_archive_spec(spec)
+        plan = FilePlan(self.resource_root.parent)
+        plan.issues.extend(issues or validate_entity_spec(spec))
+        pack_root = self.resource_root / ENTITY_PACK_NAME
+        if not plan.issues and not pack_root.is_dir():
+            plan.issues.append(PlanIssue("missing_pack_warning", {"name": ENTITY_PACK_NAME}))
+        if not plan.issues:
+            plan_entity_files(plan, pack_root, spec)
+        return spec, plan
+
+    def _drain(self) -> None:
+        # Every job that finished planning while an earlier commit ran goes into the next one.
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            results = self._commit(batch)
+        except Exception as exc:
+            for item in batch:
+                item.loop.call_soon_threadsafe(_resolve, item.future, None, exc)
+            return
+        for item, result in zip(batch, results):
+            item.loop.call_soon_threadsafe(_resolve, item.future, result)
+
+    def _commit(self, batch: List[_PendingEntity]) -> List[EntityResult]:
+        # Specs are matched by identity: two jobs may carry equal specs.
+        jobs = {id(item.spec): item for item in batch}
+
+        def plan_batch(specs: List[EntitySpec]) -> FilePlan:
+            plan = FilePlan(self.resource_root.parent)
+            chosen = [jobs[id(spec)] for spec in specs]
+            for item in chosen:
+                plan.extend(item.plan)
+            behavior_specs = [item.spec for item in chosen if item.behavior]
+            plan_shared_entity_files(plan, self.resource_root, specs, behavior_specs, self.fallback_icon)
+            return plan
+
+        outcomes = commit_entity_batch(self.resource_root, [item.spec for item in batch], plan_batch)
+        return [
+            EntityResult(item.spec.name, outcome.issues, outcome.created, list(item.plan.notes))
+            for item, outcome in zip(batch, outcomes)
+        ]
@@ -0,0 +1,163 @@
+﻿import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from .bbmodel import (
+    BBMODEL_SUFFIX,
+    decode_data_uri,
+    embedded_textures,
+    geometry_identifier,
+    to_animations,
+    to_geometry,
+)
+from .jsonio import dumps, load
+
+ZIP_SUFFIX = ".zip"
+ARCHIVE_SUFFIXES = (ZIP_SUFFIX, BBMODEL_SUFFIX)
+CHUNK_SIZE = 1024 * 1024
+
+ROLE_MODEL = "model"
+ROLE_TEXTURE = "texture"
+ROLE_ANIMATION = "animation"
+ROLE_CONTROLLER = "controller"
+ROLE_ICON = "icon"
+
+# Zip members are matched by suffix; icons are checked before textures so they are not taken for one.
+ROLE_SUFFIXES = {
+    ROLE_MODEL: (".geo.json",),
+    ROLE_ANIMATION: (".animation.json",),
+    ROLE_CONTROLLER: (".animation_controllers.json", ".ac.json"),
+    ROLE_ICON: (".icon.png",),
+    ROLE_TEXTURE: (".png", ".tga"),
+}
+ICON_NAMES = ("icon.png",)
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    label: str
+    suffix: str
+    chunks: Callable[[], Iterable[bytes]]
+    path: Optional[Path] = None
+
+    def read_bytes(self) -> bytes:
+        if self.path is not None:
+            return self.path.read_bytes()
+        return b"".join(self.chunks())
+
+    def read_text(self) -> str:
+        return self.read_bytes().decode("utf-8-sig")
+
+
+def is_archive(path: Optional[Path]) -> bool:
+    return path is not None and path.suffix.lower() in ARCHIVE_SUFFIXES
+
+
+def file_source(path: Path) -> SourceFile:
+    return SourceFile(str(path), path.suffix, lambda: _file_chunks(path), path)
+
+
+def _file_chunks(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        yield from iter(lambda: handle.read(CHUNK_SIZE), b"")
+
+
+def _zip_chunks(path: Path, member: str) -> Iterator[bytes]:
+    with zipfile.ZipFile(path) as archive, archive.open(member) as handle:
+        yield from iter(lambda: handle.read(CHUNK_SIZE), b"")
+
+
+def _member_role(name: str) -> Optional[str]:
+    lowered = PurePosixPath(name).name.lower()
+    if lowered in ICON_NAMES:
+        return ROLE_ICON
+    for role, suffixes in ROLE_SUFFIXES.items():
+        if lowered.endswith(suffixes):
+            return role
+    return None
+
+
+def zip_roles(path: Path) -> Dict[str, str]:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            infos = archive.infolist()
+    except zipfile.BadZipFile as exc:
+        raise ArchiveError(f"{path}: {exc}") from None
+    names = sorted(
+        info.filename
+        for info in infos
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not PurePosixPath(info.filename).name.startswith(".")
+    )
+    stem = path.stem.lower()
+
+    def preferred(name: str) -> bool:
+        return PurePosixPath(name).name.lower().startswith(stem + ".")
+
+    roles: Dict[str, str] = {}
+    for name in names:
+        role = _member_role(name)
+        # Prefer the member named after the archive when several share a role.
+        if role is not None and (role not in roles or (preferred(name) and not preferred(roles[role]))):
+            roles[role] = name
+    return roles
+
+
+def bbmodel_roles(path: Path) -> Dict[str, str]:
+    data = load(path, cached=True)
+    roles: Dict[str, str] = {}
+    if not isinstance(data, dict):
+        return roles
+    roles[ROLE_MODEL] = geometry_identifier(data, path.stem)
+    if to_animations(data):
+        roles[ROLE_ANIMATION] = "animations"
+    for name, _ in embedded_textures(data):
+        role = ROLE_ICON if _member_role(name) == ROLE_ICON else ROLE_TEXTURE
+        roles.setdefault(role, name)
+    return roles
+
+
+def archive_roles(path: Path) -> Dict[str, str]:
+    if path.suffix.lower() == BBMODEL_SUFFIX:
+        return bbmodel_roles(path)
+    return zip_roles(path)
+
+
+def open_source(path: Path, role: str) -> Optional[SourceFile]:
+    if not is_archive(path):
+        return file_source(path)
+    member = archive_roles(path).get(role)
+    if member is None:
+        return None
+    label = f"{path}!{member}"
+    if path.suffix.lower() == ZIP_SUFFIX:
+        return SourceFile(label, _suffix(member), lambda: _zip_chunks(path, member))
+    return _bbmodel_source(path, role, member, label)
+
+
+def _bbmodel_source(path: Path, role: str, member: str, label: str) -> Optional[SourceFile]:
+    data = load(path, cached=True)
+    if role == ROLE_MODEL:
+        text = dumps(to_geometry(data, member)) + "\n"
+        return SourceFile(label, ".geo.json", lambda: [text.encode("utf-8")])
+    if role == ROLE_ANIMATION:
+        text = dumps(to_animations(data)) + "\n"
+        return SourceFile(label, ".animation.json", lambda: [text.encode("utf-8")])
+    for name, uri in embedded_textures(data):
+        if name == member:
+            return SourceFile(label, _suffix(name) or ".png", lambda: decode_data_uri(uri))
+    return None
+
+
+def _suffix(name: str) -> str:
+    lowered = PurePosixPath(name).name.lower()
+    for suffix in (".tga", ".png"):
+        if lowered.endswith(suffix):
+            return suffix
+    return PurePosixPath(name).suffix
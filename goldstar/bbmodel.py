@@ -0,0 +1,248 @@
+﻿import base64
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BBMODEL_SUFFIX = ".bbmodel"
+LOOSE_CUBES_BONE = "bb_main"
+BASE64_CHUNK = 64 * 1024
+FACE_NAMES = ("north", "east", "south", "west", "up", "down")
+ANIMATION_CHANNELS = ("rotation", "position", "scale")
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _clean(value: float):
+    value = round(value, 4)
+    return int(value) if value == int(value) else value
+
+
+def _vector(values, default: float = 0.0) -> List[float]:
+    values = values if isinstance(values, list) else []
+    return [_number(values[i]) if i < len(values) else default for i in range(3)]
+
+
+def _is_zero(values: List[float]) -> bool:
+    return all(value == 0 for value in values)
+
+
+def _list(value) -> list:
+    return value if isinstance(value, list) else []
+
+
+def _dict(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def geometry_identifier(data: dict, fallback: str) -> str:
+    meta = _dict(data.get("meta"))
+    identifier = data.get("model_identifier") or meta.get("model_identifier") or data.get("name") or fallback
+    identifier = str(identifier)
+    return identifier if identifier.startswith("geometry.") else f"geometry.{identifier}"
+
+
+def to_geometry(data: dict, identifier: str) -> dict:
+    # Same axis conventions as Blockbench's own Bedrock export: X is mirrored, rotations flip on X and Y.
+    elements = {
+        str(element.get("uuid")): element
+        for element in _list(data.get("elements"))
+        if isinstance(element, dict) and element.get("type", "cube") == "cube"
+    }
+    groups = {str(group.get("uuid")): group for group in _list(data.get("groups")) if isinstance(group, dict)}
+    global_box_uv = bool(_dict(data.get("meta")).get("box_uv", True))
+    bones: List[dict] = []
+    loose: List[dict] = []
+
+    def visit(node, parent: Optional[str]) -> None:
+        if isinstance(node, str):
+            element = elements.get(node)
+            if element is not None:
+                (bone_cubes[-1] if parent else loose).append(_cube(element, global_box_uv))
+            return
+        if not isinstance(node, dict):
+            return
+        group = dict(groups.get(str(node.get("uuid")), {}))
+        group.update({key: value for key, value in node.items() if key != "children"})
+        origin = _vector(group.get("origin"))
+        rotation = _vector(group.get("rotation"))
+        bone = {
+            "name": str(group.get("name", f"bone{len(bones)}")),
+            "pivot": [_clean(-origin[0]), _clean(origin[1]), _clean(origin[2])],
+        }
+        if parent:
+            bone["parent"] = parent
+        if not _is_zero(rotation):
+            bone["rotation"] = [_clean(-rotation[0]), _clean(-rotation[1]), _clean(rotation[2])]
+        if group.get("mirror_uv"):
+            bone["mirror"] = True
+        bones.append(bone)
+        bone_cubes.append([])
+        for child in _list(node.get("children")):
+            visit(child, bone["name"])
+        cubes = bone_cubes.pop()
+        if cubes:
+            bone["cubes"] = cubes
+
+    bone_cubes: List[List[dict]] = []
+    for node in _list(data.get("outliner")):
+        visit(node, None)
+    if loose:
+        bones.append({"name": LOOSE_CUBES_BONE, "pivot": [0, 0, 0], "cubes": loose})
+
+    resolution = _dict(data.get("resolution"))
+    description = {
+        "identifier": identifier,
+        "texture_width": _clean(_number(resolution.get("width", 16))),
+        "texture_height": _clean(_number(resolution.get("height", 16))),
+    }
+    visible_box = data.get("visible_box") or _dict(data.get("meta")).get("visible_box")
+    if isinstance(visible_box, list) and len(visible_box) == 3:
+        description["visible_bounds_width"] = _clean(_number(visible_box[0]))
+        description["visible_bounds_height"] = _clean(_number(visible_box[1]))
+        description["visible_bounds_offset"] = [0, _clean(_number(visible_box[2])), 0]
+    return {"format_version": "1.12.0", "minecraft:geometry": [{"description": description, "bones": bones}]}
+
+
+def _cube(element: dict, global_box_uv: bool) -> dict:
+    start = _vector(element.get("from"))
+    end = _vector(element.get("to"))
+    size = [end[i] - start[i] for i in range(3)]
+    cube = {
+        "origin": [_clean(-end[0]), _clean(start[1]), _clean(start[2])],
+        "size": [_clean(value) for value in size],
+    }
+    rotation = _vector(element.get("rotation"))
+    if not _is_zero(rotation):
+        origin = _vector(element.get("origin"))
+        cube["pivot"] = [_clean(-origin[0]), _clean(origin[1]), _clean(origin[2])]
+        cube["rotation"] = [_clean(-rotation[0]), _clean(-rotation[1]), _clean(rotation[2])]
+    if _number(element.get("inflate")):
+        cube["inflate"] = _clean(_number(element.get("inflate")))
+    if element.get("mirror_uv"):
+        cube["mirror"] = True
+
+    if element.get("box_uv", global_box_uv):
+        offset = element.get("uv_offset") if isinstance(element.get("uv_offset"), list) else [0, 0]
+        cube["uv"] = [_clean(_number(value)) for value in offset[:2]]
+        return cube
+    faces = {}
+    for name in FACE_NAMES:
+        face = _dict(element.get("faces")).get(name)
+        if not isinstance(face, dict) or ("texture" in face and face["texture"] is None):
+            continue
+        uv = [_number(value) for value in (_list(face.get("uv")) or [0, 0, 0, 0])[:4]]
+        if len(uv) < 4:
+            continue
+        # Up and down faces are stored flipped in Bedrock, so they start from the far corner.
+        start_u, start_v, end_u, end_v = (uv[2], uv[3], uv[0], uv[1]) if name in ("up", "down") else uv
+        faces[name] = {
+            "uv": [_clean(start_u), _clean(start_v)],
+            "uv_size": [_clean(end_u - start_u), _clean(end_v - start_v)],
+        }
+    cube["uv"] = faces
+    return cube
+
+
+def to_animations(data: dict) -> Optional[dict]:
+    animations = {}
+    for animation in _list(data.get("animations")):
+        if not isinstance(animation, dict) or not animation.get("name"):
+            continue
+        entry: dict = {}
+        loop = animation.get("loop")
+        if loop == "loop":
+            entry["loop"] = True
+        elif loop == "hold":
+            entry["loop"] = "hold_on_last_frame"
+        if _number(animation.get("length")):
+            entry["animation_length"] = _clean(_number(animation.get("length")))
+        bones: Dict[str, dict] = {}
+        animators = _dict(animation.get("animators"))
+        for animator in animators.values():
+            if not isinstance(animator, dict) or animator.get("type", "bone") != "bone":
+                continue
+            channels = _channels(animator.get("keyframes"))
+            if channels:
+                bones[str(animator.get("name"))] = channels
+        if bones:
+            entry["bones"] = bones
+        animations[str(animation["name"])] = entry
+    if not animations:
+        return None
+    return {"format_version": "1.8.0", "animations": animations}
+
+
+def _channels(keyframes) -> Dict[str, dict]:
+    channels: Dict[str, Dict[float, object]] = {}
+    for keyframe in _list(keyframes):
+        if not isinstance(keyframe, dict) or keyframe.get("channel") not in ANIMATION_CHANNELS:
+            continue
+        channel = keyframe["channel"]
+        points = [
+            _keyframe_vector(point, channel) for point in _list(keyframe.get("data_points")) if isinstance(point, dict)
+        ]
+        if not points:
+            continue
+        if len(points) > 1:
+            value = {"pre": points[0], "post": points[1]}
+        elif keyframe.get("interpolation") == "catmullrom":
+            value = {"post": points[0], "lerp_mode": "catmullrom"}
+        else:
+            value = points[0]
+        channels.setdefault(channel, {})[_number(keyframe.get("time"))] = value
+    return {
+        channel: {_time_key(time): value for time, value in sorted(frames.items())}
+        for channel, frames in channels.items()
+    }
+
+
+def _keyframe_vector(point: dict, channel: str) -> list:
+    values = [_molang(point.get(axis, 0)) for axis in ("x", "y", "z")]
+    negate = (True, True, False) if channel == "rotation" else (True, False, False) if channel == "position" else ()
+    for index, flip in enumerate(negate):
+        if flip:
+            values[index] = _negate(values[index])
+    return values
+
+
+def _molang(value):
+    if isinstance(value, (int, float)):
+        return _clean(float(value))
+    text = str(value).strip()
+    try:
+        return _clean(float(text)) if text else 0
+    except ValueError:
+        return text
+
+
+def _negate(value):
+    if isinstance(value, (int, float)):
+        return _clean(-value) if value else 0
+    return f"-({value})"
+
+
+def _time_key(time: float) -> str:
+    text = f"{time:.4f}".rstrip("0")
+    return text + "0" if text.endswith(".") else text
+
+
+def embedded_textures(data: dict) -> List[Tuple[str, str]]:
+    textures = []
+    for index, texture in enumerate(_list(data.get("textures"))):
+        if not isinstance(texture, dict):
+            continue
+        source = texture.get("source")
+        if isinstance(source, str) and source.startswith("data:") and "," in source:
+            textures.append((str(texture.get("name") or f"texture_{index}.png"), source))
+    return textures
+
+
+def decode_data_uri(source: str) -> Iterator[bytes]:
+    # Decoded in 4-character aligned slices so only one chunk of image bytes exists at a time.
+    start = source.index(",") + 1
+    step = BASE64_CHUNK - BASE64_CHUNK % 4
+    for offset in range(start, len(source), step):
+        yield base64.b64decode(source[offset : offset + step], validate=True)
@@ -0,0 +1,299 @@
+﻿import copy
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .config import DEFAULT_NAMESPACE
+from .file_plan import FilePlan, execute_plan
+from .jsonio import JsonParseError, load
+from .pack_ops import expected_pack_names
+from .scanner import blf_pack_dirs
+from .snapshots import take_snapshot
+
+BEHAVIOR_PACK_NAME = "BLF_CustomTest"
+BEHAVIOR_ROOT_NAME = "development_behavior_packs"
+ARMOR_SAMPLES = [
+    ("test_armor_helmet", "slot.armor.head", "default_helmet"),
+    ("test_armor_chestplate", "slot.armor.chest", "default_chest"),
+    ("test_armor_leggings", "slot.armor.legs", "default_leggings"),
+    ("test_armor_boots", "slot.armor.feet", "default_boots"),
+]
+
+
+@dataclass(frozen=True)
+class ClientEntity:
+    pack: str
+    path: Path
+    namespace: str
+    name: str
+
+    @property
+    def identifier(self) -> str:
+        return f"{self.namespace}:{self.name}"
+
+
+@dataclass(frozen=True)
+class SyncAction:
+    kind: str
+    path: Path
+    identifier: str
+
+
+@dataclass
+class SyncReport:
+    dry_run: bool
+    entity_count: int = 0
+    actions: List[SyncAction] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for action in self.actions if action.kind == kind)
+
+
+def behavior_pack_path(resource_root: Path) -> Path:
+    return resource_root.parent / BEHAVIOR_ROOT_NAME / BEHAVIOR_PACK_NAME
+
+
+def plan_behavior_pack_base(
+    plan: FilePlan, resource_root: Path, namespace: str, fallback_icon: Optional[Path] = None
+) -> List[Path]:
+    pack_dir = behavior_pack_path(resource_root)
+    manifest_path = pack_dir / "manifest.json"
+    if not manifest_path.is_file():
+        plan.write_json(manifest_path, build_behavior_manifest())
+    icon_path = pack_dir / "pack_icon.png"
+    if not icon_path.is_file():
+        icon_source = find_pack_icon_source(resource_root) or fallback_icon
+        if icon_source and icon_source.is_file():
+            plan.copy(icon_source, icon_path)
+    created = []
+    for identifier, slot, icon in ARMOR_SAMPLES:
+        item_path = pack_dir / "items" / f"{identifier}.json"
+        if not item_path.is_file():
+            plan.write_json(item_path, build_behavior_armor_item(namespace, identifier, slot, icon))
+            created.append(item_path)
+    return created
+
+
+def build_behavior_manifest() -> dict:
+    return {
+        "format_version": 2,
+        "header": {
+            "name": BEHAVIOR_PACK_NAME,
+            "description": f"{BEHAVIOR_PACK_NAME} (generated by goldstar)",
+            "uuid": str(uuid.uuid4()),
+            "version": [1, 0, 0],
+            "min_engine_version": [1, 20, 0],
+        },
+        "modules": [
+            {
+                "type": "data",
+                "uuid": str(uuid.uuid4()),
+                "version": [1, 0, 0],
+            }
+        ],
+    }
+
+
+def find_pack_icon_source(resource_root: Path) -> Optional[Path]:
+    for name in expected_pack_names():
+        icon_path = resource_root / name / "pack_icon.png"
+        if icon_path.is_file():
+            return icon_path
+    return None
+
+
+def build_behavior_entity(namespace: str, name: str) -> dict:
+    return {
+        "format_version": "1.20.0",
+        "minecraft:entity": {
+            "description": {
+                "identifier": f"{namespace}:{name}",
+                "is_spawnable": True,
+                "is_summonable": True,
+                "is_experimental": False,
+            },
+            "components": {
+                "minecraft:health": {"value": 1, "max": 1},
+                "minecraft:movement": {"value": 0},
+                "minecraft:collision_box": {"width": 0.6, "height": 1.8},
+                "minecraft:pushable": {
+                    "is_pushable": False,
+                    "is_pushable_by_piston": False,
+                },
+            },
+        },
+    }
+
+
+def build_behavior_spawn_item(namespace: str, name: str) -> dict:
+    return {
+        "format_version": "1.20.0",
+        "minecraft:item": {
+            "description": {"identifier": f"{namespace}:{name}_spawn"},
+            "components": {
+                "minecraft:display_name": {"value": f"{name} spawn"},
+                "minecraft:icon": {"texture": name},
+                "minecraft:entity_placer": {"entity": f"{namespace}:{name}"},
+            },
+        },
+    }
+
+
+def build_behavior_armor_item(namespace: str, identifier: str, slot: str, icon: str) -> dict:
+    return {
+        "format_version": "1.20.0",
+        "minecraft:item": {
+            "description": {"identifier": f"{namespace}:{identifier}"},
+            "components": {
+                "minecraft:display_name": {"value": identifier},
+                "minecraft:icon": {"texture": icon},
+                "minecraft:wearable": {"slot": slot},
+                "minecraft:armor": {"protection": 1},
+                "minecraft:durability": {"max_durability": 1},
+            },
+        },
+    }
+
+
+def behavior_entity_path(pack_dir: Path, name: str) -> Path:
+    return pack_dir / "entities" / f"{name}.json"
+
+
+def behavior_spawn_item_path(pack_dir: Path, name: str) -> Path:
+    return pack_dir / "items" / f"{name}_spawn.json"
+
+
+def entity_pack_dirs(resource_root: Path) -> List[Path]:
+    pack_dirs = []
+    try:
+        candidates = blf_pack_dirs(resource_root)
+    except OSError:
+        return []
+    for pack_dir in candidates:
+        if (pack_dir / "entity").is_dir():
+            pack_dirs.append(pack_dir)
+    return pack_dirs
+
+
+def iter_client_entities(resource_root: Path, errors: Optional[List[str]] = None) -> Iterator[ClientEntity]:
+    for pack_dir in entity_pack_dirs(resource_root):
+        with os.scandir(pack_dir / "entity") as it:
+            items = sorted((item for item in it if item.name.endswith(".json")), key=lambda item: item.name)
+        for item in items:
+            if item.name.startswith("default_"):
+                continue
+            try:
+                identifier = _client_identifier(Path(item.path))
+            except (OSError, JsonParseError) as exc:
+                if errors is not None:
+                    errors.append(str(exc))
+                continue
+            if identifier is None or ":" not in identifier:
+                if errors is not None:
+                    errors.append(f"{pack_dir.name}/entity/{item.name}: missing identifier")
+                continue
+            namespace, name = identifier.split(":", 1)
+            yield ClientEntity(pack_dir.name, Path(item.path), namespace, name)
+
+
+def _client_identifier(path: Path) -> Optional[str]:
+    data = load(path, cached=True)
+    client = data.get("minecraft:client_entity") if isinstance(data, dict) else None
+    desc = client.get("description") if isinstance(client, dict) else None
+    identifier = desc.get("identifier") if isinstance(desc, dict) else None
+    return identifier if isinstance(identifier, str) else None
+
+
+def _list_names(directory: Path) -> Set[str]:
+    try:
+        with os.scandir(directory) as it:
+            return {item.name for item in it if item.is_file()}
+    except OSError:
+        return set()
+
+
+def sync_behavior_pack(
+    resource_root: Path,
+    dry_run: bool = False,
+    namespace: str = DEFAULT_NAMESPACE,
+    fallback_icon: Optional[Path] = None,
+) -> SyncReport:
+    report = SyncReport(dry_run=dry_run)
+    pack_dir = behavior_pack_path(resource_root)
+    entity_names = _list_names(pack_dir / "entities")
+    item_names = _list_names(pack_dir / "items")
+
+    plan = FilePlan(resource_root.parent)
+    seen: Dict[str, ClientEntity] = {}
+    for entity in iter_client_entities(resource_root, report.errors):
+        report.entity_count += 1
+        if entity.name in seen:
+            report.errors.append(
+                f"{entity.pack}/entity/{entity.path.name}: duplicate name '{entity.name}' "
+                f"(already in {seen[entity.name].pack})"
+            )
+            continue
+        seen[entity.name] = entity
+
+        targets = (
+            (behavior_entity_path(pack_dir, entity.name), entity_names, build_behavior_entity, _patch_entity),
+            (behavior_spawn_item_path(pack_dir, entity.name), item_names, build_behavior_spawn_item, _patch_spawn_item),
+        )
+        for path, names, build, patch in targets:
+            if path.name not in names:
+                plan.write_json(path, build(entity.namespace, entity.name))
+                report.actions.append(SyncAction("create", path, entity.identifier))
+                continue
+            try:
+                # The parse cache is read-only; only a file that needs patching is copied.
+                current = load(path, cached=True)
+            except (OSError, JsonParseError) as exc:
+                report.errors.append(str(exc))
+                continue
+            data = copy.deepcopy(current)
+            if patch(data, entity):
+                plan.write_json(path, data, overwrite=True)
+                report.actions.append(SyncAction("update", path, entity.identifier))
+
+    for path in plan_behavior_pack_base(plan, resource_root, namespace, fallback_icon):
+        report.actions.append(SyncAction("create", path, f"{namespace}:{path.stem}"))
+
+    if dry_run or not report.actions:
+        return report
+    issues = plan.validate()
+    if issues:
+        report.errors.extend(str(issue) for issue in issues)
+        return report
+    take_snapshot(resource_root, [pack_dir], "sync_behavior")
+    execute_plan(plan)
+    return report
+
+
+def _patch_entity(data: dict, entity: ClientEntity) -> bool:
+    if not isinstance(data, dict):
+        return False
+    desc = data.get("minecraft:entity", {}).get("description") if isinstance(data.get("minecraft:entity"), dict) else None
+    if not isinstance(desc, dict) or desc.get("identifier") == entity.identifier:
+        return False
+    desc["identifier"] = entity.identifier
+    return True
+
+
+def _patch_spawn_item(data: dict, entity: ClientEntity) -> bool:
+    item = data.get("minecraft:item") if isinstance(data, dict) else None
+    if not isinstance(item, dict):
+        return False
+    changed = False
+    desc = item.get("description")
+    spawn_identifier = f"{entity.identifier}_spawn"
+    if isinstance(desc, dict) and desc.get("identifier") != spawn_identifier:
+        desc["identifier"] = spawn_identifier
+        changed = True
+    placer = item.get("components", {}).get("minecraft:entity_placer") if isinstance(item.get("components"), dict) else None
+    if isinstance(placer, dict) and placer.get("entity") != entity.identifier:
+        placer["entity"] = entity.identifier
+        changed = True
+    return changed
@@ -0,0 +1,662 @@
+﻿import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .behavior import behavior_pack_path, sync_behavior_pack
+from .config import DEFAULT_NAMESPACE
+from .entity import ENTITY_PACK_NAME, plan_pack_icons, plan_shared_animations
+from .file_plan import FilePlan, execute_plan
+from .geometry import (
+    DEFAULT_PRECISION,
+    optimize_geometry_files,
+    pack_geometry_files,
+    pack_reference_files,
+    referenced_bones,
+)
+from .icons import ICON_SIZE
+from .lang import lang_path, merge_lang_files, normalize_pack_lang, pack_languages, update_languages_json
+from .orphans import QUARANTINE_DIR_NAME, find_orphans, plan_quarantine, quarantine_dir
+from .paths import default_root, normalize_root
+from .references import build_reference_index, save_reference_index
+from .rename import plan_entity_rename
+from .roots import (
+    DEFAULT_WORKERS,
+    FileIndexCache,
+    collect_status,
+    discover_roots,
+    format_size,
+    format_status_table,
+    read_root_list,
+)
+from .scanner import blf_pack_dirs, scan_pack
+from .snapshots import DEFAULT_KEEP, plan_pack_dirs, snapshot_store, take_snapshot
+from .sounds import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_STREAM_SECONDS,
+    ISSUE_CASE,
+    ISSUE_MISSING,
+    SoundHeaderCache,
+    audit_sounds,
+    sound_cache_path,
+)
+from .subpacks import (
+    DEFAULT_TIERS,
+    ensure_subpack_dirs,
+    load_subpack_state,
+    parse_tier,
+    plan_subpacks,
+    save_subpack_state,
+    subpack_state_path,
+)
+from .watch import DEFAULT_INTERVAL_SECONDS, DEFAULT_SETTLE_SECONDS, DEFAULT_WATCH_WORKERS, DropFolderWatcher
+
+
+def _root_from_args(args: argparse.Namespace) -> Path:
+    return normalize_root(args.root) if args.root else default_root()
+
+
+def _cmd_sync_behavior(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    logo_path = Path(__file__).resolve().parents[1] / "logo.png"
+    start = time.perf_counter()
+    report = sync_behavior_pack(
+        root_path,
+        dry_run=args.dry_run,
+        namespace=args.namespace,
+        fallback_icon=logo_path if logo_path.is_file() else None,
+    )
+    elapsed = time.perf_counter() - start
+    prefix = "would " if args.dry_run else ""
+    for action in report.actions:
+        print(f"{prefix}{action.kind}: {action.path} ({action.identifier})")
+    for error in report.errors:
+        print(f"skipped: {error}", file=sys.stderr)
+    print(
+        f"{report.entity_count} entities checked, "
+        f"{report.count('create')} to create, {report.count('update')} to update "
+        f"in {elapsed:.2f}s{' (dry run)' if args.dry_run else ''}"
+    )
+    return 0
+
+
+def _cmd_status(args: argparse.Namespace) -> int:
+    patterns = list(args.roots)
+    if args.roots_file:
+        patterns.extend(read_root_list(Path(args.roots_file)))
+    roots = discover_roots(patterns) if patterns else [default_root()]
+    if not roots:
+        print("No resource pack roots matched.", file=sys.stderr)
+        return 2
+    cache = FileIndexCache()
+    start = time.perf_counter()
+    statuses = collect_status(roots, cache=cache, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    for line in format_status_table(statuses):
+        print(line)
+    problems = sum(1 for status in statuses if not status.ok)
+    print(
+        f"{len(statuses)} roots, {problems} with problems, "
+        f"{cache.misses} packs scanned ({cache.hits} shared) in {elapsed:.2f}s"
+    )
+    return 1 if problems else 0
+
+
+def _cmd_snapshot_list(args: argparse.Namespace) -> int:
+    store = snapshot_store(_root_from_args(args))
+    snapshots = store.list()
+    for snapshot in snapshots:
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.created))
+        packs = ", ".join(f"{key}{'' if digest else ' (absent)'}" for key, digest in snapshot.packs.items())
+        print(f"{snapshot.snapshot_id}  {created}  {snapshot.label}: {packs}")
+    print(f"{len(snapshots)} snapshots, store size {format_size(store.size())} ({store.path})")
+    return 0
+
+
+def _cmd_snapshot_create(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    pack_dirs = blf_pack_dirs(root_path)
+    behavior_dir = behavior_pack_path(root_path)
+    if behavior_dir.is_dir():
+        pack_dirs.append(behavior_dir)
+    store = snapshot_store(root_path)
+    start = time.perf_counter()
+    snapshot = store.create(pack_dirs, args.label)
+    print(f"created {snapshot.snapshot_id} ({len(pack_dirs)} packs) in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def _cmd_snapshot_restore(args: argparse.Namespace) -> int:
+    store = snapshot_store(_root_from_args(args))
+    try:
+        report = store.restore(args.snapshot_id, args.pack or None)
+    except KeyError as exc:
+        print(f"Unknown snapshot or pack: {exc}", file=sys.stderr)
+        return 2
+    print(
+        f"restored {report.snapshot_id}: {len(report.written)} written, {len(report.deleted)} deleted, "
+        f"{len(report.removed_packs)} packs removed"
+    )
+    return 0
+
+
+def _cmd_snapshot_gc(args: argparse.Namespace) -> int:
+    store = snapshot_store(_root_from_args(args))
+    report = store.gc(keep=args.keep, max_age_days=args.max_age_days)
+    print(
+        f"removed {len(report.removed_snapshots)} snapshots and {report.removed_objects} objects, "
+        f"freed {format_size(report.freed_bytes)}; store size {format_size(store.size())}"
+    )
+    return 0
+
+
+def _cmd_lang_sort(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    files = 0
+    take_snapshot(root_path, blf_pack_dirs(root_path), "lang sort")
+    for pack_dir in blf_pack_dirs(root_path):
+        for path, count in normalize_pack_lang(pack_dir):
+            print(f"{path.relative_to(root_path)}: {count} keys")
+            files += 1
+    print(f"sorted {files} lang files in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def _cmd_lang_merge(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    target = root_path / args.into
+    if not target.is_dir():
+        print(f"Pack not found: {target}", file=sys.stderr)
+        return 2
+    # The target pack comes first so its own translations win over copies in other packs.
+    pack_dirs = [target] + [p for p in blf_pack_dirs(root_path) if p != target]
+    languages = args.language or pack_languages(pack_dirs)
+    start = time.perf_counter()
+    take_snapshot(root_path, [target], "lang merge")
+    merged = []
+    for language in languages:
+        sources = [lang_path(pack_dir, language) for pack_dir in pack_dirs]
+        sources = [path for path in sources if path.is_file()]
+        if not sources:
+            continue
+        count = merge_lang_files(sources, lang_path(target, language))
+        merged.append(language)
+        print(f"{language}: {len(sources)} files -> {count} keys in {lang_path(target, language).relative_to(root_path)}")
+    update_languages_json(target, merged)
+    print(f"merged in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def _cmd_optimize_geometry(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    all_packs = blf_pack_dirs(root_path)
+    pack_dirs = [root_path / name for name in args.pack] if args.pack else all_packs
+    for pack_dir in pack_dirs:
+        if not pack_dir.is_dir():
+            print(f"Pack not found: {pack_dir}", file=sys.stderr)
+            return 2
+    start = time.perf_counter()
+    # Animations in any pack may drive a bone, so every pack's references are kept.
+    keep = referenced_bones(pack_reference_files(all_packs))
+    paths = [path for pack_dir in pack_dirs for path in pack_geometry_files(pack_dir)]
+    results = optimize_geometry_files(paths, keep, None if args.no_quantize else args.precision)
+
+    plan = FilePlan(root_path.parent)
+    before = after = 0
+    for report, text in results:
+        if report.error:
+            print(f"skipped: {report.error}", file=sys.stderr)
+            continue
+        if text is None:
+            continue
+        before += report.size_before
+        after += report.size_after
+        if args.verbose:
+            for change in report.changes:
+                print(f"{report.path.relative_to(root_path)}: {change}")
+        counts = {}
+        for change in report.changes:
+            counts[change.kind] = counts.get(change.kind, 0) + 1
+        summary = ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+        print(
+            f"{report.path.relative_to(root_path)}: {summary}; "
+            f"{format_size(report.size_before)} -> {format_size(report.size_after)}"
+        )
+        plan.write_text(report.path, text, overwrite=True)
+
+    if len(plan) and not args.dry_run:
+        take_snapshot(root_path, plan_pack_dirs(plan), "optimize geometry")
+        execute_plan(plan)
+    print(
+        f"{len(paths)} models checked, {len(plan)} {'to optimize' if args.dry_run else 'optimized'}, "
+        f"{format_size(before)} -> {format_size(after)} in {time.perf_counter() - start:.2f}s"
+        f"{' (dry run)' if args.dry_run else ''}"
+    )
+    return 0
+
+
+def _cmd_watch(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    drop_dir = Path(args.folder).expanduser()
+    for path in (root_path, drop_dir):
+        if not path.is_dir():
+            print(f"Folder not found: {path}", file=sys.stderr)
+            return 2
+    logo_path = Path(__file__).resolve().parents[1] / "logo.png"
+    watcher = DropFolderWatcher(
+        drop_dir,
+        root_path,
+        namespace=args.namespace,
+        settle=args.settle,
+        workers=args.workers,
+        behavior=args.behavior,
+        optimize_geometry=args.optimize_geometry,
+        shared_animations=args.shared_animations,
+        fallback_icon=logo_path if logo_path.is_file() else None,
+        on_result=lambda result: print(result.describe(), file=sys.stdout if result.ok else sys.stderr),
+    )
+    print(f"watching {drop_dir} -> {root_path} (log: {watcher.log_path})")
+    try:
+        watcher.run(interval=args.interval, once=args.once)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_share_animations(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    pack_root = root_path / ENTITY_PACK_NAME
+    if not pack_root.is_dir():
+        print(f"Pack not found: {pack_root}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    plan = FilePlan(root_path.parent)
+    collapsed = plan_shared_animations(plan, pack_root)
+    if plan.issues:
+        for issue in plan.issues:
+            print(issue, file=sys.stderr)
+        return 1
+    for name, removed in collapsed:
+        print(f"{name}: {format_size(removed)} of animation copies")
+    if len(plan) and not args.dry_run:
+        take_snapshot(root_path, plan_pack_dirs(plan), "share animations")
+        execute_plan(plan)
+    print(
+        f"{len(collapsed)} entities {'to share' if args.dry_run else 'now share'} the template animations, "
+        f"{format_size(sum(removed for _, removed in collapsed))} in {len(collapsed) * 2} files "
+        f"{'to remove' if args.dry_run else 'removed'} in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+def _cmd_rename(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    index = build_reference_index(root_path)
+    plan = FilePlan(root_path.parent)
+    report = plan_entity_rename(plan, root_path, index, args.old, args.new)
+    issues = plan.validate()
+    if issues:
+        for issue in issues:
+            print(issue, file=sys.stderr)
+        return 1
+    base = root_path.parent
+    for source, destination in report.moved:
+        print(f"move {source.relative_to(base)} -> {destination.relative_to(base)}")
+    for path in report.rewritten:
+        print(f"rewrite {path.relative_to(base)}")
+    if len(plan) and not args.dry_run:
+        take_snapshot(root_path, plan_pack_dirs(plan), "rename entity")
+        execute_plan(plan)
+        if index.update_root(root_path):
+            save_reference_index(root_path, index)
+    print(
+        f"{report.old_identifier} -> {report.new_identifier}: {len(report.moved)} files "
+        f"{'to move' if args.dry_run else 'moved'}, {len(report.rewritten)} rewritten "
+        f"({report.references} references) in {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+def _cmd_orphans(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    index = build_reference_index(root_path)
+    indexed = time.perf_counter() - start
+    report = find_orphans(index)
+    if args.list:
+        for pack, rel_path, size in report.files:
+            print(f"{pack}/{rel_path} ({format_size(size)})")
+        for pack, name in report.entries:
+            print(f"{pack}/textures/item_texture.json: texture_data.{name} (not named by any indexed file)")
+    for pack, (count, size) in sorted(report.pack_sizes().items()):
+        print(f"{pack}: {count} unreachable files, {format_size(size)}")
+    print(
+        f"{len(index)} files indexed in {indexed:.2f}s, {report.roots} roots, {report.reachable} assets reachable; "
+        f"{len(report.files)} unreachable files ({format_size(report.size)}), "
+        f"{len(report.entries)} item_texture entries not named by any indexed file "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    prune = args.quarantine and args.prune_atlas
+    if not args.quarantine or not (report.files or (prune and report.entries)):
+        return 0
+    base = root_path.parent
+    destination = quarantine_dir(base)
+    plan = FilePlan(base)
+    pack_dirs = plan_quarantine(plan, base, report, destination, prune)
+    issues = plan.validate()
+    if issues:
+        for issue in issues:
+            print(issue, file=sys.stderr)
+        return 1
+    take_snapshot(root_path, pack_dirs, "quarantine orphans")
+    execute_plan(plan)
+    if index.update_root(root_path):
+        save_reference_index(root_path, index)
+    print(f"moved to {destination}")
+    return 0
+
+
+def _cmd_icons(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    pack_root = root_path / ENTITY_PACK_NAME
+    if not pack_root.is_dir():
+        print(f"Pack not found: {pack_root}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    plan = FilePlan(root_path.parent)
+    results = plan_pack_icons(plan, pack_root, force=args.force, size=args.size, workers=args.workers or None)
+    failed = 0
+    for path, result in results:
+        if result.png is None:
+            failed += 1
+            print(f"skipped: {path.relative_to(root_path)} ({result.error})", file=sys.stderr)
+    if len(plan) and not args.dry_run:
+        take_snapshot(root_path, plan_pack_dirs(plan), "render icons")
+        execute_plan(plan)
+    cached = sum(1 for _, result in results if result.cached)
+    print(
+        f"{len(results) - failed} icons rendered ({cached} from cache), {failed} failed, "
+        f"{len(plan)} {'to write' if args.dry_run else 'written'} in {time.perf_counter() - start:.2f}s"
+        f"{' (dry run)' if args.dry_run else ''}"
+    )
+    return 1 if failed else 0
+
+
+def _cmd_subpacks(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    pack_names = args.pack or [ENTITY_PACK_NAME]
+    try:
+        tiers = [parse_tier(text) for text in args.tier] if args.tier else list(DEFAULT_TIERS)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    plan = FilePlan(root_path.parent)
+    builds = []
+    for name in pack_names:
+        pack_dir = root_path / name
+        if not pack_dir.is_dir():
+            print(f"Pack not found: {pack_dir}", file=sys.stderr)
+            return 2
+        state_path = subpack_state_path(pack_dir)
+        report, state = plan_subpacks(
+            plan, pack_dir, tiers, load_subpack_state(state_path), args.workers or None, args.force
+        )
+        builds.append((pack_dir, state_path, state))
+        for error in report.errors:
+            print(f"skipped: {name}/{error}", file=sys.stderr)
+        sizes = ", ".join(f"{folder} {format_size(size)}" for folder, size in report.bytes_after.items())
+        print(
+            f"{name}: {report.textures} textures ({format_size(report.bytes_before)}), "
+            f"{len(report.rebuilt)} rebuilt, {len(report.removed)} removed"
+            f"{', manifest updated' if report.manifest_changed else ''}; {sizes}"
+        )
+    if plan.issues:
+        for issue in plan.issues:
+            print(issue, file=sys.stderr)
+        return 1
+    if not args.dry_run:
+        if len(plan):
+            take_snapshot(root_path, plan_pack_dirs(plan), "build subpacks")
+            execute_plan(plan)
+        # State is saved only after the files it describes are in place.
+        for pack_dir, state_path, state in builds:
+            ensure_subpack_dirs(pack_dir, tiers)
+            save_subpack_state(state_path, state)
+    print(
+        f"{len(plan)} files {'to write' if args.dry_run else 'written'} in {time.perf_counter() - start:.2f}s"
+        f"{' (dry run)' if args.dry_run else ''}"
+    )
+    return 0
+
+
+def _cmd_sounds(args: argparse.Namespace) -> int:
+    root_path = _root_from_args(args)
+    if not root_path.is_dir():
+        print(f"Resource pack path not found: {root_path}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    indexes = [scan_pack(pack_dir) for pack_dir in blf_pack_dirs(root_path)]
+    audit = audit_sounds(
+        indexes,
+        SoundHeaderCache(sound_cache_path(root_path)),
+        max_bytes=int(args.max_kb * 1024),
+        stream_seconds=args.stream_seconds,
+    )
+    elapsed = time.perf_counter() - start
+    if args.list:
+        for sound in audit.sounds:
+            duration = f"{sound.duration:.2f}s" if sound.duration is not None else "?"
+            print(
+                f"{sound.pack}/{sound.rel_path}  {sound.codec or '?'}  {sound.channels}ch  "
+                f"{sound.sample_rate} Hz  {duration}  {format_size(sound.size)}"
+            )
+    for issue in sorted(audit.issues, key=lambda issue: (issue.kind, issue.path)):
+        print(issue)
+    for error in audit.errors:
+        print(f"skipped: {error}", file=sys.stderr)
+    counts = ", ".join(f"{audit.count(kind)} {kind}" for kind in sorted({issue.kind for issue in audit.issues}))
+    print(
+        f"{len(audit.sounds)} sound files ({format_size(audit.total_size)}), {audit.events} events, "
+        f"{len(audit.references)} references; {counts or 'no issues'}; "
+        f"{audit.headers_read} headers read in {elapsed:.2f}s"
+    )
+    return 1 if audit.count(ISSUE_MISSING) or audit.count(ISSUE_CASE) or audit.errors else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="goldstar", description="GoldStar resource pack automation.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    sync = subparsers.add_parser(
+        "sync-behavior",
+        help="Create or update BLF_CustomTest entities and spawn items for every client entity.",
+    )
+    sync.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    sync.add_argument("--namespace", default=DEFAULT_NAMESPACE, help="namespace for the armor samples")
+    sync.add_argument("--dry-run", action="store_true", help="only report what would change")
+    sync.set_defaults(func=_cmd_sync_behavior)
+
+    status = subparsers.add_parser(
+        "status",
+        help="Check and scan BLF_ packs in several resource pack roots at once.",
+    )
+    status.add_argument(
+        "roots",
+        nargs="*",
+        help="root folders, Minecraft profile folders or glob patterns (default: auto-detect)",
+    )
+    status.add_argument("--roots-file", help="file with one root or glob pattern per line")
+    status.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of scan threads")
+    status.set_defaults(func=_cmd_status)
+
+    optimize = subparsers.add_parser(
+        "optimize-geometry",
+        help="Remove degenerate cubes and empty bones, flatten plain bones and round floats in .geo.json models.",
+    )
+    optimize.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    optimize.add_argument("--pack", action="append", help="only this pack, e.g. BLF_CustomEntity (repeatable)")
+    optimize.add_argument("--precision", type=int, default=DEFAULT_PRECISION, help="decimal digits to keep")
+    optimize.add_argument("--no-quantize", action="store_true", help="leave numbers untouched")
+    optimize.add_argument("--dry-run", action="store_true", help="only report what would change")
+    optimize.add_argument("-v", "--verbose", action="store_true", help="list every change")
+    optimize.set_defaults(func=_cmd_optimize_geometry)
+
+    share = subparsers.add_parser(
+        "share-animations",
+        help="Point entities whose animations are unchanged template copies at the template and delete the copies.",
+    )
+    share.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    share.add_argument("--dry-run", action="store_true", help="only report what would change")
+    share.set_defaults(func=_cmd_share_animations)
+
+    rename = subparsers.add_parser(
+        "rename",
+        help="Rename an entity or change its namespace in every resource and behavior pack file at once.",
+    )
+    rename.add_argument("old", help="current name, e.g. wolf or blf:wolf")
+    rename.add_argument("new", help="new name, optionally with a new namespace, e.g. wolf2 or abc:wolf2")
+    rename.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    rename.add_argument("--dry-run", action="store_true", help="only report what would change")
+    rename.set_defaults(func=_cmd_rename)
+
+    orphans = subparsers.add_parser(
+        "orphans",
+        help="Find textures, models, animations and item_texture entries nothing references any more.",
+    )
+    orphans.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    orphans.add_argument("--list", action="store_true", help="list every unreachable file and entry")
+    orphans.add_argument(
+        "--quarantine", action="store_true", help=f"move them to {QUARANTINE_DIR_NAME} next to the pack roots"
+    )
+    orphans.add_argument(
+        "--prune-atlas",
+        action="store_true",
+        help="with --quarantine, also remove item_texture entries no indexed file names "
+        "(packs outside the index may still use them)",
+    )
+    orphans.set_defaults(func=_cmd_orphans)
+
+    icons = subparsers.add_parser(
+        "icons",
+        help="Render spawn-egg icons for CustomEntity entities from their model and texture.",
+    )
+    icons.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    icons.add_argument("--size", type=int, default=ICON_SIZE, help="icon width and height in pixels")
+    icons.add_argument("--workers", type=int, default=0, help="render processes (default: one per CPU)")
+    icons.add_argument("--force", action="store_true", help="also replace icons that are not the template icon")
+    icons.add_argument("--dry-run", action="store_true", help="only report what would change")
+    icons.set_defaults(func=_cmd_icons)
+
+    subpacks = subparsers.add_parser(
+        "subpacks",
+        help="Build memory-tier subpacks with downscaled entity textures and list them in the manifest.",
+    )
+    subpacks.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    subpacks.add_argument("--pack", action="append", help=f"pack to build (default: {ENTITY_PACK_NAME}, repeatable)")
+    subpacks.add_argument(
+        "--tier",
+        action="append",
+        help="folder:memory_tier:scale, e.g. low:0:4 (repeatable; default: low:0:4, medium:1:2, full:2:1)",
+    )
+    subpacks.add_argument("--workers", type=int, default=0, help="resize processes (default: one per CPU)")
+    subpacks.add_argument("--force", action="store_true", help="rebuild every texture, not just changed ones")
+    subpacks.add_argument("--dry-run", action="store_true", help="only report what would change")
+    subpacks.set_defaults(func=_cmd_subpacks)
+
+    sounds = subparsers.add_parser(
+        "sounds",
+        help="Audit sound_definitions.json and sound files: broken references, unused and oversized sounds.",
+    )
+    sounds.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    sounds.add_argument("--max-kb", type=float, default=DEFAULT_MAX_BYTES / 1024, help="size budget per file in KB")
+    sounds.add_argument(
+        "--stream-seconds",
+        type=float,
+        default=DEFAULT_STREAM_SECONDS,
+        help="flag longer sounds that are not marked stream: true",
+    )
+    sounds.add_argument("--list", action="store_true", help="also list every sound with its header data")
+    sounds.set_defaults(func=_cmd_sounds)
+
+    watch = subparsers.add_parser(
+        "watch",
+        help="Turn model/texture/animation files dropped into a folder into CustomEntity entities.",
+    )
+    watch.add_argument("folder", help="drop folder; files are grouped by base name, e.g. wolf.geo.json + wolf.png")
+    watch.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+    watch.add_argument("--namespace", default=DEFAULT_NAMESPACE, help="identifier prefix for new entities")
+    watch.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS, help="seconds files must stay unchanged")
+    watch.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_SECONDS, help="seconds between folder scans")
+    watch.add_argument("--workers", type=int, default=DEFAULT_WATCH_WORKERS, help="threads that validate jobs")
+    watch.add_argument("--behavior", action="store_true", help="also create test behavior pack files")
+    watch.add_argument("--optimize-geometry", action="store_true", help="optimize models while importing")
+    watch.add_argument(
+        "--shared-animations", action="store_true", help="reference the template animations when they are unchanged"
+    )
+    watch.add_argument("--once", action="store_true", help="import what is ready, then exit")
+    watch.set_defaults(func=_cmd_watch)
+
+    snapshot = subparsers.add_parser("snapshot", help="List, create, restore or prune pack snapshots.")
+    snapshot_commands = snapshot.add_subparsers(dest="snapshot_command", required=True)
+    snapshot_list = snapshot_commands.add_parser("list", help="list snapshots, oldest first")
+    snapshot_list.set_defaults(func=_cmd_snapshot_list)
+    snapshot_create = snapshot_commands.add_parser("create", help="snapshot every BLF_ pack and the behavior pack")
+    snapshot_create.add_argument("--label", default="manual", help="label stored with the snapshot")
+    snapshot_create.set_defaults(func=_cmd_snapshot_create)
+    snapshot_restore = snapshot_commands.add_parser("restore", help="restore packs to a snapshot")
+    snapshot_restore.add_argument("snapshot_id", help="snapshot id or a unique prefix of it")
+    snapshot_restore.add_argument(
+        "--pack", action="append", help="restore only this pack, e.g. development_resource_packs/BLF_CustomEntity"
+    )
+    snapshot_restore.set_defaults(func=_cmd_snapshot_restore)
+    snapshot_gc = snapshot_commands.add_parser("gc", help="drop old snapshots and unreferenced objects")
+    snapshot_gc.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="number of newest snapshots to keep")
+    snapshot_gc.add_argument("--max-age-days", type=float, help="also drop snapshots older than this")
+    snapshot_gc.set_defaults(func=_cmd_snapshot_gc)
+    for command in (snapshot_list, snapshot_create, snapshot_restore, snapshot_gc):
+        command.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+
+    lang = subparsers.add_parser("lang", help="Sort, dedupe and merge texts/*.lang files.")
+    lang_commands = lang.add_subparsers(dest="lang_command", required=True)
+    lang_sort = lang_commands.add_parser("sort", help="sort and dedupe every lang file in place")
+    lang_sort.set_defaults(func=_cmd_lang_sort)
+    lang_merge = lang_commands.add_parser("merge", help="merge every pack's lang files into one pack")
+    lang_merge.add_argument("--into", default="BLF_CustomCore", help="pack that receives the merged files")
+    lang_merge.add_argument("--language", action="append", help="only this language, e.g. en_US (repeatable)")
+    lang_merge.set_defaults(func=_cmd_lang_merge)
+    for command in (lang_sort, lang_merge):
+        command.add_argument("--root", help="development_resource_packs folder (default: auto-detect)")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        from .gui import main as gui_main
+
+        gui_main()
+        return 0
+    return args.func(args)
@@ -1,5 +1,7 @@
 ﻿from pathlib import Path
 
+DEFAULT_NAMESPACE = "blf"
+
 EXPECTED_PACKS = [
     {
         "name": "BLF_CustomArmor",
@@ -0,0 +1,579 @@
+﻿import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .archives import (
+    ROLE_ANIMATION,
+    ROLE_CONTROLLER,
+    ROLE_ICON,
+    ROLE_MODEL,
+    ROLE_TEXTURE,
+    ArchiveError,
+    SourceFile,
+    archive_roles,
+    is_archive,
+    open_source,
+)
+from .behavior import (
+    behavior_entity_path,
+    behavior_pack_path,
+    behavior_spawn_item_path,
+    build_behavior_entity,
+    build_behavior_spawn_item,
+    plan_behavior_pack_base,
+)
+from .config import DEFAULT_NAMESPACE
+from .file_plan import FilePlan, PlanError, PlanIssue, execute_plan
+from .geometry import bones_in, optimize_geometry_text
+from .icons import ICON_SIZE, IconJob, IconResult, render_icons
+from .jsonio import JsonParseError, load, loads
+from .lang import entity_lang_entries, plan_lang_entries
+from .snapshots import plan_pack_dirs, take_snapshot
+
+ENTITY_PACK_NAME = "BLF_CustomEntity"
+MAX_NAME_LENGTH = 20
+NAME_PATTERN = re.compile(r"[a-z0-9_]+")
+NAMESPACE_PATTERN = re.compile(r"[a-z]+")
+TEMPLATE_NAME = "default_entity"
+ANIMATION_KEYS = ("setup", "normal", "default", "skill1", "skill2", "skill3", "skill4", "skill5")
+
+
+@dataclass
+class EntitySpec:
+    name: str
+    namespace: str
+    model_source: Path
+    texture_source: Path
+    animation_source: Optional[Path] = None
+    controller_source: Optional[Path] = None
+    icon_source: Optional[Path] = None
+    optimize_geometry: bool = False
+    render_icon: bool = True
+    shared_animations: bool = False
+
+
+@dataclass(frozen=True)
+class EntityLayout:
+    pack_root: Path
+    name: str
+    texture_suffix: str = ".png"
+
+    @property
+    def entity(self) -> Path:
+        return self.pack_root / "entity" / f"{self.name}.entity.json"
+
+    @property
+    def model(self) -> Path:
+        return self.pack_root / "models" / "entity" / f"{self.name}.geo.json"
+
+    @property
+    def animation(self) -> Path:
+        return self.pack_root / "animations" / f"{self.name}.animation.json"
+
+    @property
+    def controller(self) -> Path:
+        return self.pack_root / "animation_controllers" / f"{self.name}.ac.json"
+
+    @property
+    def texture(self) -> Path:
+        return self.pack_root / "textures" / "entity" / f"{self.name}{self.texture_suffix}"
+
+    @property
+    def icon(self) -> Path:
+        return self.pack_root / "textures" / "items" / f"{self.name}.icon.png"
+
+
+def template_layout(pack_root: Path) -> EntityLayout:
+    return EntityLayout(pack_root, TEMPLATE_NAME)
+
+
+def item_texture_path(pack_root: Path) -> Path:
+    return pack_root / "textures" / "item_texture.json"
+
+
+def source_issue(exc: Exception) -> PlanIssue:
+    # Sources fail for different reasons; only a parse error is a JSON problem.
+    if isinstance(exc, ArchiveError):
+        return PlanIssue("invalid_archive", {"error": str(exc)})
+    if isinstance(exc, FileNotFoundError):
+        return PlanIssue("file_not_found", {"path": exc.filename or str(exc)})
+    if isinstance(exc, OSError):
+        return PlanIssue("read_failed", {"error": str(exc)})
+    return PlanIssue("invalid_json", {"error": str(exc)})
+
+
+def expand_archive_spec(spec: EntitySpec) -> Tuple[EntitySpec, List[PlanIssue]]:
+    # An archive given as the model also supplies every other role it contains, unless one was chosen explicitly.
+    if not is_archive(spec.model_source) or not spec.model_source.is_file():
+        return spec, []
+    try:
+        roles = archive_roles(spec.model_source)
+    except (OSError, ArchiveError, JsonParseError) as exc:
+        return spec, [source_issue(exc)]
+    fields = {
+        ROLE_TEXTURE: "texture_source",
+        ROLE_ANIMATION: "animation_source",
+        ROLE_CONTROLLER: "controller_source",
+        ROLE_ICON: "icon_source",
+    }
+    filled = {
+        name: spec.model_source
+        for role, name in fields.items()
+        if role in roles and not str(getattr(spec, name) or "").strip()
+    }
+    return (replace(spec, **filled) if filled else spec), []
+
+
+def validate_entity_spec(spec: EntitySpec) -> List[PlanIssue]:
+    missing = []
+    if not spec.name:
+        missing.append("field_entity_name")
+    if not str(spec.model_source or "").strip():
+        missing.append("field_model")
+    if not str(spec.texture_source or "").strip():
+        missing.append("field_texture")
+    if missing:
+        return [PlanIssue("missing_required", {"fields": missing})]
+
+    if len(spec.name) > MAX_NAME_LENGTH or not NAME_PATTERN.fullmatch(spec.name):
+        return [PlanIssue("invalid_name")]
+    if not NAMESPACE_PATTERN.fullmatch(spec.namespace):
+        return [PlanIssue("invalid_prefix")]
+
+    for source in (
+        spec.model_source,
+        spec.texture_source,
+        spec.animation_source,
+        spec.controller_source,
+        spec.icon_source,
+    ):
+        if source is not None and not source.is_file():
+            return [PlanIssue("file_not_found", {"path": str(source)})]
+    return []
+
+
+def plan_entities(
+    resource_root: Path,
+    specs: Iterable[EntitySpec],
+    behavior: bool = False,
+    fallback_icon: Optional[Path] = None,
+    plan: Optional[FilePlan] = None,
+) -> FilePlan:
+    pack_root = resource_root / ENTITY_PACK_NAME
+    if plan is None:
+        plan = FilePlan(resource_root.parent)
+    if not pack_root.is_dir():
+        plan.issues.append(PlanIssue("missing_pack_warning", {"name": ENTITY_PACK_NAME}))
+        return plan
+
+    seen = set()
+    expanded = []
+    icons: List[Tuple[Path, IconJob, SourceFile]] = []
+    for spec in specs:
+        spec, issues = expand_archive_spec(spec)
+        expanded.append(spec)
+        issues = issues or validate_entity_spec(spec)
+        if spec.name in seen:
+            issues.append(PlanIssue("duplicate_name", {"name": spec.name}))
+        seen.add(spec.name)
+        if issues:
+            plan.issues.extend(issues)
+            continue
+        plan_entity_files(plan, pack_root, spec, icons)
+    # Icons are rendered together so a large batch can use every core.
+    _plan_icons(plan, icons)
+    plan_shared_entity_files(plan, resource_root, expanded, expanded if behavior else [], fallback_icon)
+    return plan
+
+
+def plan_shared_entity_files(
+    plan: FilePlan,
+    resource_root: Path,
+    specs: List[EntitySpec],
+    behavior_specs: List[EntitySpec],
+    fallback_icon: Optional[Path] = None,
+) -> None:
+    # Files every entity adds to rather than owns; they must be planned in the same plan that commits them.
+    pack_root = resource_root / ENTITY_PACK_NAME
+    _plan_item_texture_entries(plan, pack_root, [spec.name for spec in specs])
+    plan_lang_entries(
+        plan,
+        pack_root,
+        lambda language: [
+            entry for spec in specs for entry in entity_lang_entries(spec.namespace, spec.name, language)
+        ],
+    )
+    if behavior_specs:
+        plan_behavior_files(plan, resource_root, behavior_specs, fallback_icon)
+
+
+def plan_entity_files(
+    plan: FilePlan,
+    pack_root: Path,
+    spec: EntitySpec,
+    icons: Optional[List[Tuple[Path, IconJob, SourceFile]]] = None,
+) -> None:
+    template = template_layout(pack_root)
+    name = spec.name
+
+    animation_src = spec.animation_source or template.animation
+    controller_src = spec.controller_source or template.controller
+    icon_src = spec.icon_source or template.icon
+    sources_ok = all(
+        [
+            plan.require_file(animation_src),
+            plan.require_file(controller_src),
+            plan.require_file(template.entity),
+            plan.require_file(icon_src),
+        ]
+    )
+    if not sources_ok:
+        return
+
+    sources: Dict[str, SourceFile] = {}
+    for role, path in (
+        (ROLE_MODEL, spec.model_source),
+        (ROLE_TEXTURE, spec.texture_source),
+        (ROLE_ANIMATION, animation_src),
+        (ROLE_CONTROLLER, controller_src),
+        (ROLE_ICON, icon_src),
+    ):
+        try:
+            source = open_source(path, role)
+        except (OSError, ArchiveError, JsonParseError) as exc:
+            plan.issues.append(source_issue(exc))
+            return
+        if source is None:
+            plan.issues.append(PlanIssue("archive_member_missing", {"path": str(path), "field": role}))
+            return
+        sources[role] = source
+    layout = EntityLayout(pack_root, name, sources[ROLE_TEXTURE].suffix)
+
+    try:
+        replacements = {TEMPLATE_NAME: name}
+        animation_text = _replace_text(sources[ROLE_ANIMATION], replacements)
+        controller_text = _replace_text(sources[ROLE_CONTROLLER], replacements)
+        # Every JSON source is parsed here, archive members included, so a broken one is reported and never copied.
+        animation_data = loads(animation_text, source=sources[ROLE_ANIMATION].label)
+        loads(controller_text, source=sources[ROLE_CONTROLLER].label)
+        # Unchanged template animations are referenced from the template instead of copied under a new name.
+        shared = (
+            spec.shared_animations
+            and is_template_copy(animation_text, template.animation, name)
+            and is_template_copy(controller_text, template.controller, name)
+        )
+        if not shared:
+            plan.write_text(layout.animation, animation_text)
+            plan.write_text(layout.controller, controller_text)
+
+        model_text = _replace_text(sources[ROLE_MODEL], replacements)
+        if spec.optimize_geometry:
+            model_text, changes = optimize_geometry_text(
+                model_text, bones_in(animation_data), source=sources[ROLE_MODEL].label
+            )
+            plan.notes.extend(f"{layout.model.name}: {change}" for change in changes)
+        geo_identifier = geometry_identifier_from_text(model_text, sources[ROLE_MODEL].label) or f"geometry.{name}"
+        plan.write_text(layout.model, model_text)
+        template_data = load(template.entity)
+        render = spec.icon_source is None and spec.render_icon
+        texture_bytes = sources[ROLE_TEXTURE].read_bytes() if render else b""
+    except (OSError, ValueError) as exc:
+        plan.issues.append(source_issue(exc))
+        return
+    _plan_source(plan, sources[ROLE_TEXTURE], layout.texture)
+    if render:
+        job = IconJob(model_text.encode("utf-8"), texture_bytes, sources[ROLE_TEXTURE].suffix, geo_identifier)
+        pending = (layout.icon, job, sources[ROLE_ICON])
+        if icons is None:
+            _plan_icons(plan, [pending])
+        else:
+            icons.append(pending)
+    else:
+        _plan_source(plan, sources[ROLE_ICON], layout.icon)
+    animation_name = TEMPLATE_NAME if shared else name
+    plan.write_json(
+        layout.entity, build_client_entity(template_data, spec.namespace, name, geo_identifier, animation_name)
+    )
+
+
+def _plan_source(plan: FilePlan, source: SourceFile, destination: Path) -> None:
+    if source.path is not None:
+        plan.copy(source.path, destination)
+    else:
+        plan.stream(destination, source.chunks)
+
+
+def _plan_icons(plan: FilePlan, icons: List[Tuple[Path, IconJob, SourceFile]]) -> None:
+    if not icons:
+        return
+    for (destination, _, fallback), result in zip(icons, render_icons([job for _, job, _ in icons])):
+        if result.png is not None:
+            plan.write_bytes(destination, result.png)
+        else:
+            # A model the renderer cannot draw still gets the template icon.
+            _plan_source(plan, fallback, destination)
+
+
+def plan_pack_icons(
+    plan: FilePlan,
+    pack_root: Path,
+    force: bool = False,
+    size: int = ICON_SIZE,
+    workers: Optional[int] = None,
+) -> List[Tuple[Path, IconResult]]:
+    template = template_layout(pack_root)
+    try:
+        template_icon = template.icon.read_bytes()
+    except OSError:
+        template_icon = None
+    pending: List[Tuple[Path, Optional[bytes], IconJob]] = []
+    broken: List[Tuple[Path, IconResult]] = []
+    for entity_path in sorted((pack_root / "entity").glob("*.entity.json")):
+        name = entity_path.name[: -len(".entity.json")]
+        if name == TEMPLATE_NAME:
+            continue
+        layout = EntityLayout(pack_root, name)
+        texture = layout.texture if layout.texture.is_file() else EntityLayout(pack_root, name, ".tga").texture
+        if not layout.model.is_file() or not texture.is_file():
+            continue
+        current = layout.icon.read_bytes() if layout.icon.is_file() else None
+        # Without force only missing icons and untouched copies of the template icon are replaced.
+        if not force and current is not None and current != template_icon:
+            continue
+        model = layout.model.read_bytes()
+        try:
+            identifier = geometry_identifier_from_text(model.decode("utf-8", "replace"), str(layout.model))
+        except JsonParseError as exc:
+            broken.append((layout.icon, IconResult(None, str(exc))))
+            continue
+        pending.append((layout.icon, current, IconJob(model, texture.read_bytes(), texture.suffix, identifier)))
+
+    results = render_icons([job for _, _, job in pending], size, workers=workers)
+    for (destination, current, _), result in zip(pending, results):
+        if result.png is not None and result.png != current:
+            plan.write_bytes(destination, result.png, overwrite=True)
+    return [(destination, result) for (destination, _, _), result in zip(pending, results)] + broken
+
+
+def is_template_copy(text: str, template_path: Path, name: str) -> bool:
+    # Compared as parsed JSON so reformatted copies still count.
+    try:
+        expected = template_path.read_text(encoding="utf-8-sig").replace(TEMPLATE_NAME, name)
+        return loads(text) == loads(expected)
+    except (OSError, UnicodeDecodeError, JsonParseError):
+        return False
+
+
+def _template_identifiers(template: EntityLayout, name: str) -> Dict[str, str]:
+    # Slots the template does not define are renamed too, matching what build_client_entity writes.
+    identifiers = {f"animation.{name}.{key}": f"animation.{TEMPLATE_NAME}.{key}" for key in ANIMATION_KEYS}
+    for path, section in ((template.animation, "animations"), (template.controller, "animation_controllers")):
+        data = load(path, cached=True)
+        keys = data.get(section) if isinstance(data, dict) else None
+        if isinstance(keys, dict):
+            identifiers.update((key.replace(TEMPLATE_NAME, name), key) for key in keys if TEMPLATE_NAME in key)
+    return identifiers
+
+
+def _remap_strings(value, mapping: Dict[str, str]):
+    if isinstance(value, str):
+        return mapping.get(value, value)
+    if isinstance(value, list):
+        return [_remap_strings(item, mapping) for item in value]
+    if isinstance(value, dict):
+        return {mapping.get(key, key): _remap_strings(item, mapping) for key, item in value.items()}
+    return value
+
+
+def _strings_in(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings_in(item)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _strings_in(item)
+
+
+def plan_shared_animations(plan: FilePlan, pack_root: Path) -> List[Tuple[str, int]]:
+    template = template_layout(pack_root)
+    if not template.animation.is_file() or not template.controller.is_file():
+        return []
+    candidates = []
+    referrers: Dict[str, set] = {}
+    for entity_path in sorted((pack_root / "entity").glob("*.entity.json")):
+        name = entity_path.name[: -len(".entity.json")]
+        try:
+            data = load(entity_path)
+        except (OSError, JsonParseError) as exc:
+            plan.issues.append(source_issue(exc))
+            continue
+        client_entity = data.get("minecraft:client_entity") if isinstance(data, dict) else None
+        description = client_entity.get("description") if isinstance(client_entity, dict) else None
+        if not isinstance(description, dict):
+            continue
+        used = set(_strings_in([description.get("animations"), description.get("scripts")]))
+        for identifier in used:
+            referrers.setdefault(identifier, set()).add(name)
+        layout = EntityLayout(pack_root, name)
+        if name == TEMPLATE_NAME or not layout.animation.is_file() or not layout.controller.is_file():
+            continue
+        try:
+            copies = is_template_copy(
+                layout.animation.read_text(encoding="utf-8-sig"), template.animation, name
+            ) and is_template_copy(layout.controller.read_text(encoding="utf-8-sig"), template.controller, name)
+            mapping = _template_identifiers(template, name)
+        except (OSError, UnicodeDecodeError, JsonParseError) as exc:
+            plan.issues.append(source_issue(exc))
+            continue
+        if copies and used & set(mapping):
+            candidates.append((name, entity_path, data, description, layout, mapping))
+
+    collapsed = []
+    for name, entity_path, data, description, layout, mapping in candidates:
+        # Another entity pointing at these copies keeps them alive.
+        if any(referrers.get(identifier, set()) - {name} for identifier in mapping):
+            continue
+        for key in ("animations", "scripts"):
+            if key in description:
+                description[key] = _remap_strings(description[key], mapping)
+        plan.write_json(entity_path, data, overwrite=True)
+        removed = 0
+        for path in (layout.animation, layout.controller):
+            removed += path.stat().st_size
+            plan.delete(path)
+        collapsed.append((name, removed))
+    return collapsed
+
+
+def build_client_entity(
+    entity_data: dict, namespace: str, name: str, geo_identifier: str, animation_name: Optional[str] = None
+) -> dict:
+    if not isinstance(entity_data, dict):
+        entity_data = {}
+    client_entity = entity_data.setdefault("minecraft:client_entity", {})
+    if not isinstance(client_entity, dict):
+        client_entity = {}
+        entity_data["minecraft:client_entity"] = client_entity
+    description = client_entity.setdefault("description", {})
+    if not isinstance(description, dict):
+        description = {}
+        client_entity["description"] = description
+
+    description["identifier"] = f"{namespace}:{name}"
+    description["textures"] = {"default": f"textures/entity/{name}"}
+    description["geometry"] = {"default": geo_identifier}
+    animation_name = animation_name or name
+    description["animations"] = {key: f"animation.{animation_name}.{key}" for key in ANIMATION_KEYS}
+    description["scripts"] = {
+        "animate": ["setup", "normal", f"controller.animation.{animation_name}"]
+    }
+    description["spawn_egg"] = {"texture": name}
+    return entity_data
+
+
+def _plan_item_texture_entries(plan: FilePlan, pack_root: Path, names: List[str]) -> None:
+    if not names:
+        return
+    path = item_texture_path(pack_root)
+    try:
+        data = load(path) if path.is_file() else {}
+    except (OSError, JsonParseError) as exc:
+        # Never overwrite an unreadable item_texture.json with a fresh one.
+        plan.issues.append(source_issue(exc))
+        return
+    if not isinstance(data, dict):
+        data = {}
+    texture_data = data.get("texture_data")
+    if not isinstance(texture_data, dict):
+        texture_data = {}
+        data["texture_data"] = texture_data
+    for name in names:
+        texture_data[name] = {"textures": f"textures/items/{name}.icon"}
+    data.setdefault("texture_name", "atlas.items")
+    data.setdefault("resource_pack_name", "vanilla")
+    plan.write_json(path, data, overwrite=True)
+
+
+def plan_behavior_files(
+    plan: FilePlan,
+    resource_root: Path,
+    specs: Iterable[EntitySpec],
+    fallback_icon: Optional[Path] = None,
+) -> None:
+    pack_dir = behavior_pack_path(resource_root)
+    namespace = DEFAULT_NAMESPACE
+    for spec in specs:
+        namespace = spec.namespace
+        plan.write_json(behavior_entity_path(pack_dir, spec.name), build_behavior_entity(spec.namespace, spec.name))
+        plan.write_json(
+            behavior_spawn_item_path(pack_dir, spec.name), build_behavior_spawn_item(spec.namespace, spec.name)
+        )
+    plan_behavior_pack_base(plan, resource_root, namespace, fallback_icon)
+
+
+def create_entities(
+    resource_root: Path,
+    specs: Iterable[EntitySpec],
+    behavior: bool = False,
+    fallback_icon: Optional[Path] = None,
+) -> List[Path]:
+    return execute_entity_plan(resource_root, plan_entities(resource_root, specs, behavior, fallback_icon))
+
+
+def execute_entity_plan(resource_root: Path, plan: FilePlan) -> List[Path]:
+    issues = plan.validate()
+    if issues:
+        raise PlanError(issues)
+    take_snapshot(resource_root, plan_pack_dirs(plan), "create_entities")
+    return execute_plan(plan)
+
+
+@dataclass
+class BatchResult:
+    spec: EntitySpec
+    issues: List[PlanIssue] = field(default_factory=list)
+    created: List[Path] = field(default_factory=list)
+
+
+def commit_entity_batch(
+    resource_root: Path, specs: List[EntitySpec], plan_batch: Callable[[List[EntitySpec]], FilePlan]
+) -> List[BatchResult]:
+    try:
+        created = execute_entity_plan(resource_root, plan_batch(specs))
+    except PlanError as exc:
+        if len(specs) == 1:
+            return [BatchResult(specs[0], list(exc.issues))]
+        # Plan issues are not tied to one entity, so retry one by one to find the failing job.
+        return [result for spec in specs for result in commit_entity_batch(resource_root, [spec], plan_batch)]
+    except OSError as exc:
+        issue = PlanIssue("create_failed", {"error": str(exc)})
+        return [BatchResult(spec, [issue]) for spec in specs]
+    results = []
+    for spec in specs:
+        owned = (spec.name, f"{spec.name}_spawn")
+        results.append(BatchResult(spec, created=[path for path in created if path.name.split(".")[0] in owned]))
+    return results
+
+
+def geometry_identifier_from_text(text: str, source: str = "<string>") -> Optional[str]:
+    data = loads(text, source)
+    geos = data.get("minecraft:geometry") if isinstance(data, dict) else None
+    if isinstance(geos, list) and geos and isinstance(geos[0], dict):
+        desc = geos[0].get("description")
+        if isinstance(desc, dict):
+            ident = desc.get("identifier")
+            if isinstance(ident, str):
+                return ident
+    return None
+
+
+def _replace_text(source: SourceFile, replacements: Dict[str, str]) -> str:
+    text = source.read_text()
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    return text
+
@@ -0,0 +1,206 @@
+﻿import os
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .jsonio import dumps
+
+STAGING_DIR_NAME = ".goldstar_staging"
+
+OP_WRITE = "write"
+OP_COPY = "copy"
+OP_DELETE = "delete"
+OP_STREAM = "stream"
+
+
+@dataclass(frozen=True)
+class PlanIssue:
+    key: str
+    params: Dict[str, object] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        details = ", ".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.key}: {details}" if details else self.key
+
+
+class PlanError(Exception):
+    def __init__(self, issues: List[PlanIssue]) -> None:
+        super().__init__("; ".join(str(issue) for issue in issues))
+        self.issues = issues
+
+
+@dataclass
+class FileOperation:
+    kind: str
+    destination: Path
+    data: Optional[bytes] = None
+    source: Optional[Path] = None
+    overwrite: bool = False
+    chunks: Optional[Callable[[], Iterable[bytes]]] = None
+
+
+class FilePlan:
+    def __init__(self, staging_parent: Path) -> None:
+        self.staging_parent = staging_parent
+        self.operations: List[FileOperation] = []
+        self.issues: List[PlanIssue] = []
+        self.notes: List[str] = []
+        self._destinations: Dict[Path, FileOperation] = {}
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def _add(self, operation: FileOperation) -> None:
+        if operation.destination in self._destinations:
+            self.issues.append(PlanIssue("duplicate_destination", {"path": str(operation.destination)}))
+            return
+        self._destinations[operation.destination] = operation
+        self.operations.append(operation)
+
+    def write_bytes(self, destination: Path, data: bytes, overwrite: bool = False) -> None:
+        self._add(FileOperation(OP_WRITE, destination, data=data, overwrite=overwrite))
+
+    def write_text(self, destination: Path, text: str, overwrite: bool = False) -> None:
+        self.write_bytes(destination, text.encode("utf-8"), overwrite)
+
+    def write_json(self, destination: Path, data, overwrite: bool = False) -> None:
+        self.write_text(destination, dumps(data) + "\n", overwrite)
+
+    def copy(self, source: Path, destination: Path, overwrite: bool = False) -> None:
+        self._add(FileOperation(OP_COPY, destination, source=source, overwrite=overwrite))
+
+    def stream(self, destination: Path, chunks: Callable[[], Iterable[bytes]], overwrite: bool = False) -> None:
+        # The producer runs only while staging, so archive members are never unpacked anywhere else.
+        self._add(FileOperation(OP_STREAM, destination, overwrite=overwrite, chunks=chunks))
+
+    def extend(self, other: "FilePlan") -> None:
+        for operation in other.operations:
+            self._add(operation)
+        self.issues.extend(other.issues)
+        self.notes.extend(other.notes)
+
+    def delete(self, path: Path) -> None:
+        self._add(FileOperation(OP_DELETE, path))
+
+    def planned(self, destination: Path) -> Optional[FileOperation]:
+        return self._destinations.get(destination)
+
+    def require_file(self, path: Path) -> bool:
+        if path.is_file():
+            return True
+        self.issues.append(PlanIssue("file_not_found", {"path": str(path)}))
+        return False
+
+    def validate(self) -> List[PlanIssue]:
+        issues = list(self.issues)
+        for operation in self.operations:
+            if operation.kind == OP_COPY and not operation.source.is_file():
+                issues.append(PlanIssue("file_not_found", {"path": str(operation.source)}))
+            elif operation.kind == OP_DELETE and not operation.destination.is_file():
+                issues.append(PlanIssue("file_not_found", {"path": str(operation.destination)}))
+            elif operation.kind != OP_DELETE and not operation.overwrite and operation.destination.exists():
+                issues.append(PlanIssue("duplicate_name", {"path": str(operation.destination)}))
+        return issues
+
+    def directories(self) -> List[Path]:
+        needed: Set[Path] = set()
+        for operation in self.operations:
+            if operation.kind != OP_DELETE:
+                needed.add(operation.destination.parent)
+        return sorted(needed, key=lambda path: len(path.parts))
+
+
+def execute_plan(plan: FilePlan) -> List[Path]:
+    issues = plan.validate()
+    if issues:
+        raise PlanError(issues)
+    if not plan.operations:
+        return []
+
+    staging = plan.staging_parent / STAGING_DIR_NAME / uuid.uuid4().hex
+    staged_dir = staging / "new"
+    backup_dir = staging / "backup"
+    staged_dir.mkdir(parents=True)
+    backup_dir.mkdir()
+
+    created_dirs: List[Path] = []
+    committed: List[Tuple[FileOperation, Optional[Path]]] = []
+    try:
+        staged: List[Optional[Path]] = []
+        for index, operation in enumerate(plan.operations):
+            if operation.kind == OP_DELETE:
+                staged.append(None)
+                continue
+            staged_path = staged_dir / str(index)
+            if operation.kind == OP_COPY:
+                shutil.copy2(operation.source, staged_path)
+            elif operation.kind == OP_STREAM:
+                with staged_path.open("wb") as handle:
+                    for chunk in operation.chunks():
+                        handle.write(chunk)
+            else:
+                staged_path.write_bytes(operation.data)
+            staged.append(staged_path)
+
+        for directory in plan.directories():
+            created_dirs.extend(_make_dirs(directory))
+
+        for index, (operation, staged_path) in enumerate(zip(plan.operations, staged)):
+            backup = None
+            if operation.destination.exists():
+                backup = backup_dir / str(index)
+                _move(operation.destination, backup)
+            committed.append((operation, backup))
+            if staged_path is not None:
+                _move(staged_path, operation.destination)
+    except BaseException:
+        _rollback(committed, created_dirs)
+        shutil.rmtree(staging, ignore_errors=True)
+        _remove_empty(staging.parent)
+        raise
+
+    shutil.rmtree(staging, ignore_errors=True)
+    _remove_empty(staging.parent)
+    return [operation.destination for operation in plan.operations]
+
+
+def _make_dirs(directory: Path) -> List[Path]:
+    missing = []
+    current = directory
+    while not current.exists():
+        missing.append(current)
+        if current.parent == current:
+            break
+        current = current.parent
+    for path in reversed(missing):
+        path.mkdir()
+    return missing[::-1]
+
+
+def _move(source: Path, destination: Path) -> None:
+    try:
+        os.replace(source, destination)
+    except OSError:
+        shutil.move(str(source), str(destination))
+
+
+def _rollback(committed: List[Tuple[FileOperation, Optional[Path]]], created_dirs: List[Path]) -> None:
+    for operation, backup in reversed(committed):
+        try:
+            if operation.kind != OP_DELETE and operation.destination.exists():
+                operation.destination.unlink()
+            if backup is not None:
+                _move(backup, operation.destination)
+        except OSError:
+            continue
+    for directory in reversed(created_dirs):
+        _remove_empty(directory)
+
+
+def _remove_empty(directory: Path) -> None:
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
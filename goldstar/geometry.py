@@ -0,0 +1,346 @@
+﻿import fnmatch
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .jsonio import JsonParseError, dumps, load, loads
+
+DEFAULT_PRECISION = 4
+# Bones the game looks up by name (held items, armor, look-at) even when they hold no cubes.
+PROTECTED_BONES = {
+    "root",
+    "body",
+    "waist",
+    "head",
+    "helmet",
+    "rightarm",
+    "leftarm",
+    "rightitem",
+    "leftitem",
+    "rightleg",
+    "leftleg",
+    "chestplate",
+    "leggings",
+    "boots",
+    "rightsleeve",
+    "leftsleeve",
+    "cape",
+}
+EMPTY_BONE_KEYS = {"name", "parent", "pivot", "rotation", "mirror", "inflate", "cubes"}
+FLATTEN_KEYS = {"name", "parent", "pivot", "rotation", "mirror", "inflate", "cubes"}
+
+
+@dataclass(frozen=True)
+class GeometryChange:
+    kind: str
+    geometry: str
+    bone: str = ""
+    detail: str = ""
+
+    def __str__(self) -> str:
+        where = f"{self.geometry}/{self.bone}" if self.bone else self.geometry
+        return f"{self.kind}: {where}" + (f" ({self.detail})" if self.detail else "")
+
+
+@dataclass
+class GeometryReport:
+    path: Path
+    changes: List[GeometryChange] = field(default_factory=list)
+    size_before: int = 0
+    size_after: int = 0
+    error: Optional[str] = None
+
+    def count(self, kind: str) -> int:
+        return sum(1 for change in self.changes if change.kind == kind)
+
+
+def iter_geometries(data) -> Iterator[Tuple[str, dict]]:
+    if not isinstance(data, dict):
+        return
+    geometries = data.get("minecraft:geometry")
+    if isinstance(geometries, list):
+        for index, geometry in enumerate(geometries):
+            if isinstance(geometry, dict):
+                description = geometry.get("description")
+                identifier = description.get("identifier") if isinstance(description, dict) else None
+                yield identifier if isinstance(identifier, str) else f"#{index}", geometry
+    for key, value in data.items():
+        if key.startswith("geometry.") and isinstance(value, dict):
+            yield key, value
+
+
+def optimize_geometry(
+    data, keep_bones: Iterable[str] = (), precision: Optional[int] = DEFAULT_PRECISION
+) -> List[GeometryChange]:
+    keep = {name.lower() for name in keep_bones} | PROTECTED_BONES
+    # Legacy "geometry.child:geometry.parent" files override parent bones by name, so their bones stay put.
+    structural = isinstance(data, dict) and not any(key.startswith("geometry.") and ":" in key for key in data)
+    changes: List[GeometryChange] = []
+    for identifier, geometry in iter_geometries(data):
+        # Quantize first so values that round to zero count as zero below.
+        if precision is not None:
+            count = _quantize(geometry, precision)
+            if count:
+                changes.append(GeometryChange("quantize", identifier, "", f"{count} values, {precision} digits"))
+        bones = geometry.get("bones")
+        if isinstance(bones, list) and all(isinstance(bone, dict) for bone in bones):
+            _drop_redundant_transforms(identifier, bones, changes)
+            if structural:
+                _remove_degenerate_cubes(identifier, bones, changes)
+                _flatten_bones(identifier, bones, keep, changes)
+                geometry["bones"] = _remove_empty_bones(identifier, bones, keep, changes)
+    return changes
+
+
+def optimize_geometry_text(
+    text: str,
+    keep_bones: Iterable[str] = (),
+    precision: Optional[int] = DEFAULT_PRECISION,
+    source: str = "<string>",
+) -> Tuple[str, List[GeometryChange]]:
+    data = loads(text, source)
+    changes = optimize_geometry(data, keep_bones, precision)
+    if not changes:
+        return text, changes
+    # Minified exports stay minified; indented ones keep the repo's two-space layout.
+    if "\n" not in text.strip():
+        return dumps(data, indent=None), changes
+    return dumps(data) + "\n", changes
+
+
+def referenced_bones(paths: Iterable[Path]) -> Set[str]:
+    # Bones named by animations or render controller part_visibility must keep their own transform.
+    names: Set[str] = set()
+    for path in paths:
+        try:
+            data = load(path, cached=True)
+        except (OSError, JsonParseError):
+            continue
+        names.update(bones_in(data))
+    return names
+
+
+def bones_in(data) -> Set[str]:
+    names: Set[str] = set()
+    if isinstance(data, dict):
+        animations = data.get("animations")
+        if isinstance(animations, dict):
+            for animation in animations.values():
+                bones = animation.get("bones") if isinstance(animation, dict) else None
+                if isinstance(bones, dict):
+                    names.update(name.lower() for name in bones)
+        controllers = data.get("render_controllers")
+        if isinstance(controllers, dict):
+            for controller in controllers.values():
+                visibility = controller.get("part_visibility") if isinstance(controller, dict) else None
+                for entry in visibility if isinstance(visibility, list) else []:
+                    if isinstance(entry, dict):
+                        names.update(name.lower() for name in entry)
+    return names
+
+
+def pack_reference_files(pack_dirs: Iterable[Path]) -> List[Path]:
+    paths = []
+    for pack_dir in pack_dirs:
+        for folder in ("animations", "render_controllers"):
+            paths.extend(_iter_json_files(pack_dir / folder))
+    return paths
+
+
+def pack_geometry_files(pack_dir: Path) -> List[Path]:
+    return sorted(_iter_json_files(pack_dir / "models"))
+
+
+def optimize_geometry_files(
+    paths: Iterable[Path],
+    keep_bones: Iterable[str] = (),
+    precision: Optional[int] = DEFAULT_PRECISION,
+) -> List[Tuple[GeometryReport, Optional[str]]]:
+    keep = set(keep_bones)
+    results = []
+    for path in paths:
+        report = GeometryReport(path)
+        try:
+            raw = path.read_bytes()
+            report.size_before = report.size_after = len(raw)
+            text, report.changes = optimize_geometry_text(raw.decode("utf-8-sig"), keep, precision, str(path))
+        except (OSError, UnicodeDecodeError, JsonParseError) as exc:
+            report.error = str(exc)
+            results.append((report, None))
+            continue
+        if not report.changes:
+            results.append((report, None))
+            continue
+        report.size_after = len(text.encode("utf-8"))
+        results.append((report, text))
+    return results
+
+
+def _is_kept(name: str, keep: Set[str]) -> bool:
+    lowered = name.lower()
+    if lowered in keep:
+        return True
+    return any(("*" in pattern or "?" in pattern) and fnmatch.fnmatchcase(lowered, pattern) for pattern in keep)
+
+
+def _is_zero(vector) -> bool:
+    return isinstance(vector, list) and all(isinstance(value, (int, float)) and value == 0 for value in vector)
+
+
+def _drop_redundant_transforms(identifier: str, bones: List[dict], changes: List[GeometryChange]) -> None:
+    for bone in bones:
+        name = str(bone.get("name", ""))
+        if "rotation" in bone and _is_zero(bone["rotation"]):
+            del bone["rotation"]
+            changes.append(GeometryChange("zero_rotation", identifier, name))
+        cubes = bone.get("cubes")
+        for index, cube in enumerate(cubes if isinstance(cubes, list) else []):
+            if not isinstance(cube, dict):
+                continue
+            if "rotation" in cube and _is_zero(cube["rotation"]):
+                del cube["rotation"]
+                changes.append(GeometryChange("zero_rotation", identifier, name, f"cube {index}"))
+            if "pivot" in cube and "rotation" not in cube:
+                # A cube pivot only anchors the cube's own rotation.
+                del cube["pivot"]
+                changes.append(GeometryChange("redundant_pivot", identifier, name, f"cube {index}"))
+
+
+def _remove_degenerate_cubes(identifier: str, bones: List[dict], changes: List[GeometryChange]) -> None:
+    for bone in bones:
+        cubes = bone.get("cubes")
+        if not isinstance(cubes, list):
+            continue
+        kept = []
+        for index, cube in enumerate(cubes):
+            if isinstance(cube, dict) and _is_degenerate(cube, bone):
+                changes.append(GeometryChange("degenerate_cube", identifier, str(bone.get("name", "")), f"cube {index}"))
+                continue
+            kept.append(cube)
+        bone["cubes"] = kept
+
+
+def _is_degenerate(cube: dict, bone: dict) -> bool:
+    size = cube.get("size")
+    if not isinstance(size, list) or len(size) != 3 or not all(isinstance(value, (int, float)) for value in size):
+        return False
+    inflate = cube.get("inflate", bone.get("inflate", 0))
+    if isinstance(inflate, (int, float)) and inflate > 0:
+        return False
+    # One zero axis is a flat plane that still renders; two or more leave no visible face.
+    return sum(1 for value in size if value == 0) >= 2
+
+
+def _flatten_bones(identifier: str, bones: List[dict], keep: Set[str], changes: List[GeometryChange]) -> None:
+    by_name: Dict[str, dict] = {}
+    for bone in bones:
+        if isinstance(bone.get("name"), str):
+            by_name.setdefault(bone["name"].lower(), bone)
+    # Deepest bones first, so a chain of plain bones collapses in one pass.
+    for bone in sorted(bones, key=lambda item: -_depth(item, by_name)):
+        name = bone.get("name")
+        parent_name = bone.get("parent")
+        if not isinstance(name, str) or not isinstance(parent_name, str) or _is_kept(name, keep):
+            continue
+        if not set(bone) <= FLATTEN_KEYS or "rotation" in bone:
+            continue
+        parent = by_name.get(parent_name.lower())
+        cubes = bone.get("cubes")
+        if parent is None or parent is bone or not isinstance(cubes, list) or not cubes:
+            continue
+        parent_cubes = parent.get("cubes")
+        if parent_cubes is None:
+            parent_cubes = parent["cubes"] = []
+        if not isinstance(parent_cubes, list):
+            continue
+        # Cube coordinates are in model space, so an unrotated, unanimated bone adds nothing but a level.
+        for cube in cubes:
+            if isinstance(cube, dict):
+                for key in ("mirror", "inflate"):
+                    if key not in cube and bone.get(key) != parent.get(key):
+                        cube[key] = bone.get(key, False if key == "mirror" else 0)
+            parent_cubes.append(cube)
+        bone["cubes"] = []
+        changes.append(GeometryChange("flatten_bone", identifier, name, f"{len(cubes)} cubes into {parent_name}"))
+
+
+def _depth(bone: dict, by_name: Dict[str, dict]) -> int:
+    depth = 0
+    seen = set()
+    parent = bone.get("parent")
+    while isinstance(parent, str) and parent.lower() in by_name and parent.lower() not in seen:
+        seen.add(parent.lower())
+        depth += 1
+        parent = by_name[parent.lower()].get("parent")
+    return depth
+
+
+def _remove_empty_bones(identifier: str, bones: List[dict], keep: Set[str], changes: List[GeometryChange]) -> List[dict]:
+    while True:
+        by_name = {bone["name"].lower(): bone for bone in bones if isinstance(bone.get("name"), str)}
+        parents: Dict[str, str] = {}
+        for bone in bones:
+            name = bone.get("name")
+            if isinstance(name, str) and isinstance(bone.get("parent"), str):
+                parents[name.lower()] = bone["parent"]
+        removed = set()
+        for bone in bones:
+            name = bone.get("name")
+            if not isinstance(name, str) or _is_kept(name, keep) or not set(bone) <= EMPTY_BONE_KEYS or bone.get("cubes"):
+                continue
+            if bone.get("rotation") and any(parent.lower() == name.lower() for parent in parents.values()):
+                continue
+            removed.add(name.lower())
+        if not removed:
+            return bones
+        # Children of a removed, unrotated bone move up to its parent; rotated bones keep their children.
+        for bone in bones:
+            parent = bone.get("parent")
+            if not isinstance(parent, str):
+                continue
+            lowered = parent.lower()
+            seen = set()
+            while lowered in removed and lowered not in seen:
+                seen.add(lowered)
+                parent = by_name[lowered].get("parent")
+                lowered = parent.lower() if isinstance(parent, str) else ""
+            if parent is None:
+                bone.pop("parent", None)
+            else:
+                bone["parent"] = parent
+        for name in sorted(removed):
+            changes.append(GeometryChange("empty_bone", identifier, by_name[name]["name"]))
+        bones = [bone for bone in bones if not (isinstance(bone.get("name"), str) and bone["name"].lower() in removed)]
+
+
+def _quantize(value, precision: int) -> int:
+    count = 0
+    items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, item in items:
+        if isinstance(item, float) and math.isfinite(item):
+            rounded = round(item, precision)
+            if rounded == int(rounded):
+                rounded = int(rounded)
+            if rounded != item:
+                count += 1
+            value[key] = rounded
+        elif isinstance(item, (dict, list)):
+            count += _quantize(item, precision)
+    return count
+
+
+def _iter_json_files(directory: Path) -> Iterator[Path]:
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for item in it:
+                    if item.is_dir():
+                        stack.append(Path(item.path))
+                    elif item.name.endswith(".json"):
+                        yield Path(item.path)
+        except OSError:
+            continue
@@ -1,119 +1,33 @@
 ﻿from __future__ import annotations
 
-import json
-import re
-import shutil
-import uuid
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except Exception:
-    PIL_AVAILABLE = False
-
-from .config import EXPECTED_PACKS
+from .behavior import sync_behavior_pack
+from .config import DEFAULT_NAMESPACE, EXPECTED_PACKS
+from .entity import EntitySpec, execute_entity_plan, expand_archive_spec, plan_entities, validate_entity_spec
+from .file_plan import FilePlan, PlanError, PlanIssue
+from .i18n import LANGUAGE_LABELS, translate
+from .images import load_scaled_photo
+from .models import PackIndex
 from .pack_ops import check_missing_packs, create_missing_packs, expected_pack_names
-from .paths import default_root, normalize_root
-
-DEFAULT_NAMESPACE = "blf"
-BEHAVIOR_PACK_NAME = "BLF_CustomTest"
-ARMOR_SAMPLES = [
-    ("test_armor_helmet", "slot.armor.head", "default_helmet"),
-    ("test_armor_chestplate", "slot.armor.chest", "default_chest"),
-    ("test_armor_leggings", "slot.armor.legs", "default_leggings"),
-    ("test_armor_boots", "slot.armor.feet", "default_boots"),
-]
-
-LANGUAGE_LABELS = {
-    "ko": "한국어",
-    "en": "English",
-}
-
-TEXT = {
-    "ko": {
-        "app_title": "GoldStar",
-        "select_pack_title": "작업할 리소스팩을 선택하세요",
-        "root_path_label": "리소스팩 경로",
-        "browse_button": "찾기",
-        "language_label": "언어",
-        "missing_packs": "누락된 팩: {names}",
-        "all_packs_present": "모든 BLF_ 팩이 확인되었습니다.",
-        "missing_all_title": "리소스팩 생성",
-        "missing_all_message": "BLF_ 리소스팩이 하나도 없습니다. 메타데이터 기반 최소 리소스팩을 생성할까요?",
-        "create_failed": "생성 실패: {error}",
-        "missing_pack_warning": "이 팩이 없습니다: {name}",
-        "not_supported": "아직 지원하지 않습니다.",
-        "hint_double_click": "더블클릭으로 선택",
-        "custom_entity_title": "CustomEntity - 새 엔티티 생성",
-        "field_entity_name": "엔티티 이름",
-        "field_namespace": "아이덴티파이어 prefix",
-        "namespace_hint": "비우면 blf",
-        "field_model": "모델링 파일",
-        "field_texture": "텍스처 파일",
-        "field_anim_controller": "애니메이션 컨트롤러(선택)",
-        "field_animation": "애니메이션(선택)",
-        "field_icon": "아이콘 텍스처(선택)",
-        "behavior_pack_checkbox": "테스트용 행동팩도 생성하겠습니까?",
-        "back_button": "뒤로",
-        "create_button": "생성",
-        "select_button": "선택",
-        "required_hint": "필수: 이름/모델링/텍스처",
-        "invalid_name": "엔티티 이름은 영문 소문자/숫자/언더바만, 최대 20자입니다.",
-        "invalid_prefix": "prefix는 영문 소문자만 가능합니다.",
-        "missing_required": "필수 항목이 비었습니다: {fields}",
-        "duplicate_name": "이미 쓰고 있는 이름입니다.",
-        "file_not_found": "파일을 찾을 수 없습니다: {path}",
-        "create_success": "생성 완료: {name}",
-        "error_title": "오류",
-        "warning_title": "경고",
-        "info_title": "안내",
-        "invalid_root": "리소스팩 경로가 없습니다: {path}",
-    },
-    "en": {
-        "app_title": "GoldStar",
-        "select_pack_title": "Select a resource pack to work on",
-        "root_path_label": "Resource pack path",
-        "browse_button": "Browse",
-        "language_label": "Language",
-        "missing_packs": "Missing packs: {names}",
-        "all_packs_present": "All BLF_ packs detected.",
-        "missing_all_title": "Create packs",
-        "missing_all_message": "No BLF_ resource packs found. Create minimal metadata-based packs?",
-        "create_failed": "Create failed: {error}",
-        "missing_pack_warning": "Pack not found: {name}",
-        "not_supported": "Not supported yet.",
-        "hint_double_click": "Double-click to select",
-        "custom_entity_title": "CustomEntity - New Entity",
-        "field_entity_name": "Entity name",
-        "field_namespace": "Identifier prefix",
-        "namespace_hint": "Default is blf",
-        "field_model": "Model file",
-        "field_texture": "Texture file",
-        "field_anim_controller": "Animation controller (optional)",
-        "field_animation": "Animation (optional)",
-        "field_icon": "Icon texture (optional)",
-        "behavior_pack_checkbox": "Also create test behavior pack?",
-        "back_button": "Back",
-        "create_button": "Create",
-        "select_button": "Select",
-        "required_hint": "Required: name/model/texture",
-        "invalid_name": "Entity name must be lowercase letters/numbers/underscore, max 20 chars.",
-        "invalid_prefix": "Prefix must be lowercase letters only.",
-        "missing_required": "Required fields missing: {fields}",
-        "duplicate_name": "Name already in use.",
-        "file_not_found": "File not found: {path}",
-        "create_success": "Created: {name}",
-        "error_title": "Error",
-        "warning_title": "Warning",
-        "info_title": "Info",
-        "invalid_root": "Resource pack path not found: {path}",
-    },
-}
+from .paths import default_root, normalize_root, user_cache_dir
+from .roots import FileIndexCache, RootStatus, collect_status, discover_roots, format_size, split_patterns
+from .search import AssetSearchIndex, build_index
+from .thumbnails import ThumbnailCache, ThumbnailLoader
+from .watch import DropFolderWatcher, JobResult
+
+BROWSER_PAGE_SIZE = 200
+BROWSER_WINDOW_PAGES = 3
+WATCH_POLL_MS = 300
+GEOMETRY_NOTE_LIMIT = 12
+PREVIEW_SIZES = {"texture": 128, "icon": 48, "pack": 128}
 
 PACK_DESCS: Dict[str, Dict[str, str]] = {}
 for pack in EXPECTED_PACKS:
@@ -189,13 +103,51 @@ class GoldStarApp:
         self.animation_path_var = tk.StringVar()
         self.icon_path_var = tk.StringVar()
         self.behavior_pack_var = tk.BooleanVar(value=False)
+        self.optimize_geometry_var = tk.BooleanVar(value=False)
+        self.render_icon_var = tk.BooleanVar(value=True)
+        self.shared_animations_var = tk.BooleanVar(value=False)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self._on_search_change)
+        self.texture_path_var.trace_add("write", lambda *args: self._schedule_preview("texture"))
+        self.icon_path_var.trace_add("write", lambda *args: self._schedule_preview("icon"))
 
         self.base_dir = Path(__file__).resolve().parents[1]
         self.logo_path = self.base_dir / "logo.png"
         self.logo_image: Optional[tk.PhotoImage] = None
         self.logo_icon: Optional[tk.PhotoImage] = None
+        self.asset_cache = ThumbnailCache(user_cache_dir() / "assets", sizes=None)
 
         self._asked_missing_for = set()
+        self._text_bindings: List[Tuple[str, Callable[[str], None], dict]] = []
+        self._pack_status: Optional[Tuple[str, dict]] = None
+        self.search_index: Optional[AssetSearchIndex] = None
+        self._search_root: Optional[Path] = None
+        self._search_thread: Optional[threading.Thread] = None
+        self._search_after_id: Optional[str] = None
+        self._search_results = []
+        self.browser_pack: Optional[str] = None
+        self.browser_metadata: Optional[PackIndex] = None
+        self._browser_thread: Optional[threading.Thread] = None
+        self._browser_pending: Dict[str, tuple] = {}
+        self._browser_windows: Dict[str, dict] = {}
+        self.file_index_cache = FileIndexCache()
+        self.roots_pattern_var = tk.StringVar()
+        self.root_statuses: Optional[List[RootStatus]] = None
+        self._roots_thread: Optional[threading.Thread] = None
+        self._create_thread: Optional[threading.Thread] = None
+        self._create_result: Optional[Tuple[EntitySpec, Optional[FilePlan], Optional[Exception]]] = None
+        self.watch_dir_var = tk.StringVar()
+        self.watcher: Optional[DropFolderWatcher] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_results: "queue.Queue[JobResult]" = queue.Queue()
+        self.watch_log: List[JobResult] = []
+        self.thumbnail_loader = ThumbnailLoader()
+        self.preview_labels: Dict[str, tk.Label] = {}
+        self._preview_images: Dict[str, tk.PhotoImage] = {}
+        self._preview_after_ids: Dict[str, str] = {}
+        self._preview_polling = False
+        self._preview_text_keys: Dict[str, str] = {}
+        self._pack_texture_paths = []
         self.current_frame: Optional[tk.Widget] = None
         self.current_view = "splash"
 
@@ -207,17 +159,45 @@ class GoldStarApp:
         self._show_splash()
 
     def _t(self, key: str, **kwargs) -> str:
-        lang = self.language_var.get()
-        text = TEXT.get(lang, {}).get(key, TEXT.get("en", {}).get(key, key))
-        if kwargs:
-            return text.format(**kwargs)
-        return text
+        return translate(self.language_var.get(), key, **kwargs)
 
     def _clear_frame(self) -> None:
+        self._text_bindings = []
         if self.current_frame is not None:
             self.current_frame.destroy()
             self.current_frame = None
 
+    def _register_text(self, key: str, setter: Callable[[str], None], **kwargs) -> None:
+        self._text_bindings.append((key, setter, kwargs))
+        setter(self._t(key, **kwargs))
+
+    def _bind_text(self, widget, key: str, **kwargs):
+        self._register_text(key, lambda text: widget.configure(text=text), **kwargs)
+        return widget
+
+    def _relabel(self) -> None:
+        for key, setter, kwargs in self._text_bindings:
+            try:
+                setter(self._t(key, **kwargs))
+            except tk.TclError:
+                continue
+        if self.current_view == "selector":
+            self._render_pack_status()
+            self._update_search_status()
+            self._run_search()
+        elif self.current_view == "browser":
+            self._render_browser_summary()
+            self._relabel_browser_rows()
+        elif self.current_view == "roots":
+            self._render_roots_table()
+        elif self.current_view == "watch":
+            self._render_watch_log()
+        elif self.current_view == "entity":
+            for slot, key in self._preview_text_keys.items():
+                label = self.preview_labels.get(slot)
+                if label is not None and label.winfo_exists():
+                    label.configure(text=self._t(key))
+
     def _load_logos(self) -> None:
         self.logo_image = self._load_logo_image(260)
         self.logo_icon = self._load_logo_image(32)
@@ -225,75 +205,11 @@ class GoldStarApp:
     def _load_logo_image(self, max_size: int) -> Optional[tk.PhotoImage]:
         if not self.logo_path.is_file():
             return None
-        if PIL_AVAILABLE:
-            image = Image.open(self.logo_path).convert("RGBA")
-            image.thumbnail((max_size, max_size), Image.LANCZOS)
-            return ImageTk.PhotoImage(image)
-        base = tk.PhotoImage(file=str(self.logo_path))
-        return self._downscale_photoimage(base, max_size)
-
-    def _downscale_photoimage(self, image: tk.PhotoImage, max_size: int) -> tk.PhotoImage:
-        width = image.width()
-        height = image.height()
-        scale = max(width / max_size, height / max_size, 1)
-        new_width = max(1, int(round(width / scale)))
-        new_height = max(1, int(round(height / scale)))
-        if new_width == width and new_height == height:
-            return image
-        result = tk.PhotoImage(width=new_width, height=new_height)
-        step_x = width / new_width
-        step_y = height / new_height
-        for y in range(new_height):
-            y0 = int(y * step_y)
-            y1 = max(y0 + 1, int((y + 1) * step_y))
-            for x in range(new_width):
-                x0 = int(x * step_x)
-                x1 = max(x0 + 1, int((x + 1) * step_x))
-                color = self._sample_box_color(image, x0, y0, x1, y1)
-                result.put(color, (x, y))
-        return result
-
-    def _sample_box_color(self, image: tk.PhotoImage, x0: int, y0: int, x1: int, y1: int) -> str:
-        max_x = image.width() - 1
-        max_y = image.height() - 1
-        sample_points = [
-            (x0, y0),
-            (x1 - 1, y0),
-            (x0, y1 - 1),
-            (x1 - 1, y1 - 1),
-            ((x0 + x1) // 2, (y0 + y1) // 2),
-        ]
-        r_total = 0
-        g_total = 0
-        b_total = 0
-        count = 0
-        for sx, sy in sample_points:
-            sx = min(max(sx, 0), max_x)
-            sy = min(max(sy, 0), max_y)
-            color = image.get(sx, sy)
-            r, g, b = self._color_to_rgb(color)
-            r_total += r
-            g_total += g
-            b_total += b
-            count += 1
-        r = max(0, min(255, r_total // count))
-        g = max(0, min(255, g_total // count))
-        b = max(0, min(255, b_total // count))
-        return f"#{r:02x}{g:02x}{b:02x}"
-
-    def _color_to_rgb(self, color) -> tuple:
-        if isinstance(color, tuple) and len(color) >= 3:
-            return color[0], color[1], color[2]
-        if isinstance(color, str):
-            if color.startswith("#") and len(color) == 7:
-                return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-            if color.startswith("#") and len(color) == 13:
-                return (
-                    int(color[1:5], 16) // 257,
-                    int(color[5:9], 16) // 257,
-                    int(color[9:13], 16) // 257,
-                )
-        return 0, 0, 0
+        try:
+            cached = self.asset_cache.get(self.logo_path, max_size)
+            return tk.PhotoImage(file=str(cached))
+        except (OSError, ValueError, tk.TclError):
+            return load_scaled_photo(self.logo_path, max_size)
 
     def _show_splash(self) -> None:
         self._clear_frame()
@@ -331,11 +247,12 @@ class GoldStarApp:
         self.current_frame = frame
         frame.columnconfigure(1, weight=1)
         frame.rowconfigure(2, weight=1)
+        frame.rowconfigure(6, weight=1)
 
-        title = ttk.Label(frame, text=self._t("select_pack_title"), font=("TkDefaultFont", 14, "bold"))
+        title = self._bind_text(ttk.Label(frame, font=("TkDefaultFont", 14, "bold")), "select_pack_title")
         title.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
 
-        lang_label = ttk.Label(frame, text=self._t("language_label"))
+        lang_label = self._bind_text(ttk.Label(frame), "language_label")
         lang_label.grid(row=0, column=2, sticky="e", padx=(12, 4))
         lang_combo = ttk.Combobox(
             frame,
@@ -347,11 +264,11 @@ class GoldStarApp:
         lang_combo.grid(row=0, column=3, sticky="e")
         lang_combo.bind("<<ComboboxSelected>>", self._on_language_change)
 
-        path_label = ttk.Label(frame, text=self._t("root_path_label"))
+        path_label = self._bind_text(ttk.Label(frame), "root_path_label")
         path_label.grid(row=1, column=0, sticky="w")
         path_entry = ttk.Entry(frame, textvariable=self.root_path_var)
         path_entry.grid(row=1, column=1, columnspan=2, sticky="ew", padx=(8, 8))
-        browse_button = ttk.Button(frame, text=self._t("browse_button"), command=self._browse_root)
+        browse_button = self._bind_text(ttk.Button(frame, command=self._browse_root), "browse_button")
         browse_button.grid(row=1, column=3, sticky="e")
 
         list_frame = ttk.Frame(frame)
@@ -377,10 +294,43 @@ class GoldStarApp:
         self.missing_label = ttk.Label(frame, text="", wraplength=580, foreground="#b00020")
         self.missing_label.grid(row=3, column=0, columnspan=4, sticky="w")
 
-        hint = ttk.Label(frame, text=self._t("hint_double_click"))
-        hint.grid(row=4, column=0, columnspan=4, sticky="w")
+        hint = self._bind_text(ttk.Label(frame), "hint_double_click")
+        hint.grid(row=4, column=0, columnspan=2, sticky="w")
+        action_frame = ttk.Frame(frame)
+        action_frame.grid(row=4, column=2, columnspan=2, sticky="e")
+        sync_button = self._bind_text(ttk.Button(action_frame, command=self._sync_behavior_pack), "sync_behavior_button")
+        sync_button.pack(side="left", padx=(0, 8))
+        browse_pack_button = self._bind_text(
+            ttk.Button(action_frame, command=self._browse_selected_pack), "browse_pack_button"
+        )
+        browse_pack_button.pack(side="left")
+        roots_button = self._bind_text(ttk.Button(action_frame, command=self._show_roots_status), "roots_button")
+        roots_button.pack(side="left", padx=(8, 0))
+        watch_button = self._bind_text(ttk.Button(action_frame, command=self._show_watch), "watch_button")
+        watch_button.pack(side="left", padx=(8, 0))
+
+        search_label = self._bind_text(ttk.Label(frame), "search_label")
+        search_label.grid(row=5, column=0, sticky="w", pady=(12, 0))
+        search_entry = ttk.Entry(frame, textvariable=self.search_var)
+        search_entry.grid(row=5, column=1, columnspan=2, sticky="ew", padx=(8, 8), pady=(12, 0))
+        self.search_status_label = ttk.Label(frame, text="")
+        self.search_status_label.grid(row=5, column=3, sticky="e", pady=(12, 0))
+
+        results_frame = ttk.Frame(frame)
+        results_frame.grid(row=6, column=0, columnspan=4, sticky="nsew", pady=(6, 0))
+        results_frame.columnconfigure(0, weight=1)
+        results_frame.rowconfigure(0, weight=1)
+        self.search_listbox = tk.Listbox(results_frame, height=8)
+        self.search_listbox.grid(row=0, column=0, sticky="nsew")
+        results_scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.search_listbox.yview)
+        results_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.search_listbox.configure(yscrollcommand=results_scrollbar.set)
+        self.search_listbox.bind("<Double-Button-1>", self._open_search_result)
+        self.search_listbox.bind("<Return>", self._open_search_result)
 
         self._refresh_pack_status(ask_create=True)
+        self._start_search_index()
+        self._run_search()
 
     def _on_language_change(self, event=None) -> None:
         selected = self.language_label_var.get()
@@ -389,10 +339,7 @@ class GoldStarApp:
                 self.language_var.set(code)
                 break
         self.root.title(self._t("app_title"))
-        if self.current_view == "selector":
-            self._show_selector()
-        elif self.current_view == "entity":
-            self._show_entity_creator()
+        self._relabel()
 
     def _browse_root(self) -> None:
         path = filedialog.askdirectory()
@@ -400,17 +347,20 @@ class GoldStarApp:
             return
         self.root_path_var.set(path)
         self._refresh_pack_status(ask_create=True)
+        self._start_search_index()
 
     def _refresh_pack_status(self, ask_create: bool = True) -> None:
         root_path = normalize_root(self.root_path_var.get())
         if not root_path.is_dir():
-            self.missing_label.config(text=self._t("invalid_root", path=str(root_path)))
+            self._pack_status = ("invalid_root", {"path": str(root_path)})
+            self._render_pack_status()
             return
         missing = check_missing_packs(root_path)
         if missing:
-            self.missing_label.config(text=self._t("missing_packs", names=", ".join(missing)))
+            self._pack_status = ("missing_packs", {"names": ", ".join(missing)})
         else:
-            self.missing_label.config(text=self._t("all_packs_present"))
+            self._pack_status = ("all_packs_present", {})
+        self._render_pack_status()
         if ask_create and len(missing) == len(expected_pack_names()):
             key = str(root_path)
             if key not in self._asked_missing_for:
@@ -422,25 +372,612 @@ class GoldStarApp:
                     except Exception as exc:
                         messagebox.showerror(self._t("error_title"), self._t("create_failed", error=str(exc)))
 
+    def _render_pack_status(self) -> None:
+        if self._pack_status is None or self.current_view != "selector":
+            return
+        key, kwargs = self._pack_status
+        self.missing_label.config(text=self._t(key, **kwargs))
+
+    def _start_search_index(self) -> None:
+        root_path = normalize_root(self.root_path_var.get())
+        if not root_path.is_dir():
+            return
+        if self._search_thread is not None and self._search_thread.is_alive():
+            return
+        if self._search_root != root_path:
+            self.search_index = None
+        self._search_root = root_path
+        self._search_thread = threading.Thread(
+            target=self._build_search_index, args=(root_path, self.search_index), daemon=True
+        )
+        self._search_thread.start()
+        self._update_search_status()
+        self.root.after(100, self._poll_search_index)
+
+    def _build_search_index(self, root_path: Path, index: Optional[AssetSearchIndex]) -> None:
+        try:
+            built = build_index(root_path, index)
+        except OSError:
+            return
+        if self._search_root == root_path:
+            self.search_index = built
+
+    def _poll_search_index(self) -> None:
+        if self._search_thread is not None and self._search_thread.is_alive():
+            self.root.after(100, self._poll_search_index)
+            return
+        if normalize_root(self.root_path_var.get()) != self._search_root:
+            self._start_search_index()
+            return
+        if self.current_view != "selector":
+            return
+        self._update_search_status()
+        self._run_search()
+
+    def _update_search_status(self) -> None:
+        if self.current_view != "selector":
+            return
+        if self._search_thread is not None and self._search_thread.is_alive():
+            text = self._t("search_indexing")
+        elif self.search_index is not None:
+            text = self._t("search_ready", count=len(self.search_index))
+        else:
+            text = ""
+        self.search_status_label.config(text=text)
+
+    def _on_search_change(self, *args) -> None:
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(120, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_after_id = None
+        if self.current_view != "selector":
+            return
+        query = self.search_var.get()
+        results = self.search_index.search(query) if self.search_index is not None and query.strip() else []
+        self._search_results = results
+        self.search_listbox.delete(0, tk.END)
+        for result in results:
+            self.search_listbox.insert(tk.END, f"{result.term}  [{result.pack}/{result.rel_path}]")
+        if query.strip() and not results and self.search_index is not None:
+            self.search_listbox.insert(tk.END, self._t("search_no_results"))
+
+    def _open_search_result(self, event=None) -> None:
+        selection = self.search_listbox.curselection()
+        if not selection or selection[0] >= len(self._search_results):
+            return
+        result = self._search_results[selection[0]]
+        path = normalize_root(self.root_path_var.get()) / result.pack / result.rel_path
+        self.root.clipboard_clear()
+        self.root.clipboard_append(str(path))
+        self.search_status_label.config(text=self._t("search_copied", path=result.rel_path))
+
+    def _sync_behavior_pack(self) -> None:
+        root_path = normalize_root(self.root_path_var.get())
+        if not root_path.is_dir():
+            messagebox.showerror(self._t("error_title"), self._t("invalid_root", path=str(root_path)))
+            return
+        namespace = self.namespace_var.get().strip() or DEFAULT_NAMESPACE
+        try:
+            plan = sync_behavior_pack(root_path, dry_run=True, namespace=namespace)
+            if not plan.actions:
+                messagebox.showinfo(self._t("info_title"), self._t("sync_up_to_date", entities=plan.entity_count))
+                return
+            confirm = self._t(
+                "sync_confirm", entities=plan.entity_count, create=plan.count("create"), update=plan.count("update")
+            )
+            if plan.errors:
+                confirm += "\n\n" + self._t("sync_errors", errors="\n".join(plan.errors[:10]))
+            if not messagebox.askyesno(self._t("sync_behavior_button"), confirm):
+                return
+            report = sync_behavior_pack(root_path, namespace=namespace, fallback_icon=self.logo_path)
+        except Exception as exc:
+            messagebox.showerror(self._t("error_title"), str(exc))
+            return
+        messagebox.showinfo(
+            self._t("info_title"), self._t("sync_done", create=report.count("create"), update=report.count("update"))
+        )
+
     def _pack_description(self, name: str) -> str:
         desc = PACK_DESCS.get(name, {})
         lang = self.language_var.get()
         return desc.get(lang) or desc.get("en") or ""
 
-    def _open_selected_pack(self, event=None) -> None:
+    def _selected_pack_name(self) -> Optional[str]:
         selection = self.pack_listbox.curselection()
         if not selection:
-            return
+            return None
         name = self.pack_listbox.get(selection[0])
         root_path = normalize_root(self.root_path_var.get())
-        pack_path = root_path / name
-        if not pack_path.is_dir():
+        if not (root_path / name).is_dir():
             messagebox.showwarning(self._t("warning_title"), self._t("missing_pack_warning", name=name))
+            return None
+        return name
+
+    def _open_selected_pack(self, event=None) -> None:
+        name = self._selected_pack_name()
+        if name is None:
             return
         if name == "BLF_CustomEntity":
             self._show_entity_creator()
         else:
-            messagebox.showinfo(self._t("info_title"), self._t("not_supported"))
+            self._show_pack_browser(name)
+
+    def _browse_selected_pack(self) -> None:
+        name = self._selected_pack_name()
+        if name is not None:
+            self._show_pack_browser(name)
+
+    def _show_pack_browser(self, name: str) -> None:
+        self._clear_frame()
+        self.current_view = "browser"
+        frame = ttk.Frame(self.root, padding=12)
+        frame.pack(fill="both", expand=True)
+        self.current_frame = frame
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(2, weight=1)
+
+        pack_path = normalize_root(self.root_path_var.get()) / name
+        if self.browser_pack != name or self.browser_metadata is None or self.browser_metadata.path != pack_path:
+            self.browser_metadata = None
+        self.browser_pack = name
+
+        title = self._bind_text(ttk.Label(frame, font=("TkDefaultFont", 14, "bold")), "browser_title", name=name)
+        title.grid(row=0, column=0, sticky="w", pady=(0, 8))
+
+        lang_label = self._bind_text(ttk.Label(frame), "language_label")
+        lang_label.grid(row=0, column=1, sticky="e", padx=(12, 4))
+        lang_combo = ttk.Combobox(
+            frame,
+            textvariable=self.language_label_var,
+            values=list(LANGUAGE_LABELS.values()),
+            state="readonly",
+            width=10,
+        )
+        lang_combo.grid(row=0, column=2, sticky="e")
+        lang_combo.bind("<<ComboboxSelected>>", self._on_language_change)
+
+        self.browser_summary_label = ttk.Label(frame, text=self._t("browser_loading"))
+        self.browser_summary_label.grid(row=1, column=0, columnspan=3, sticky="w")
+
+        tree_frame = ttk.Frame(frame)
+        tree_frame.grid(row=2, column=0, columnspan=3, sticky="nsew", pady=(8, 0))
+        tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(0, weight=1)
+
+        self.browser_tree = ttk.Treeview(tree_frame, columns=("size", "modified"))
+        for column, key in (("#0", "column_name"), ("size", "column_size"), ("modified", "column_modified")):
+            self._register_text(key, lambda text, column=column: self.browser_tree.heading(column, text=text))
+        self.browser_tree.column("#0", width=360, stretch=True)
+        self.browser_tree.column("size", width=90, anchor="e", stretch=False)
+        self.browser_tree.column("modified", width=140, stretch=False)
+        self.browser_tree.grid(row=0, column=0, sticky="nsew")
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.browser_tree.yview)
+        tree_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.browser_tree.configure(yscrollcommand=lambda first, last: self._on_browser_scroll(tree_scrollbar, first, last))
+        self.browser_tree.bind("<<TreeviewOpen>>", self._on_browser_open)
+        self.browser_tree.bind("<Double-Button-1>", self._on_browser_activate)
+        self.browser_tree.bind("<Return>", self._on_browser_activate)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=3, column=0, columnspan=3, sticky="e", pady=(12, 0))
+        self._bind_text(ttk.Button(button_frame, command=self._show_selector), "back_button").pack(side="left", padx=(0, 8))
+        if name == "BLF_CustomEntity":
+            self._bind_text(ttk.Button(button_frame, command=self._show_entity_creator), "new_entity_button").pack(side="left")
+
+        if self.browser_metadata is not None:
+            self._populate_browser()
+            return
+        if self._browser_thread is None or not self._browser_thread.is_alive():
+            self._browser_thread = threading.Thread(target=self._load_browser_metadata, args=(pack_path,), daemon=True)
+            self._browser_thread.start()
+        self.root.after(50, self._poll_browser_metadata)
+
+    def _load_browser_metadata(self, pack_path: Path) -> None:
+        metadata = self.file_index_cache.get(pack_path)
+        if self.browser_pack == pack_path.name:
+            self.browser_metadata = metadata
+
+    def _poll_browser_metadata(self) -> None:
+        if self._browser_thread is not None and self._browser_thread.is_alive():
+            self.root.after(50, self._poll_browser_metadata)
+            return
+        if self.current_view != "browser" or self.browser_pack is None:
+            return
+        if self.browser_metadata is None or self.browser_metadata.name != self.browser_pack:
+            self._show_pack_browser(self.browser_pack)
+            return
+        self._populate_browser()
+
+    def _populate_browser(self) -> None:
+        if self.browser_metadata is None:
+            return
+        self._render_browser_summary()
+        self._browser_pending = {}
+        self._browser_windows = {}
+        self.browser_tree.delete(*self.browser_tree.get_children(""))
+        self._insert_browser_children("", "")
+
+    def _render_browser_summary(self) -> None:
+        metadata = self.browser_metadata
+        if metadata is None:
+            self.browser_summary_label.config(text=self._t("browser_loading"))
+            return
+        self.browser_summary_label.config(
+            text=f"{metadata.summary_line()} | "
+            + self._t("browser_summary", count=len(metadata), size=self._format_size(metadata.total_size()))
+        )
+
+    def _relabel_browser_rows(self) -> None:
+        for item, (kind, payload) in self._browser_pending.items():
+            if kind == "more":
+                self.browser_tree.item(item, text=self._browser_marker_text(*payload))
+            else:
+                for child in self.browser_tree.get_children(item):
+                    self.browser_tree.item(child, text=self._t("browser_loading"))
+
+    def _insert_browser_children(self, parent_item: str, rel_dir: str) -> None:
+        subdirs, files = self.browser_metadata.children(rel_dir)
+        for subdir in subdirs:
+            child_rel = f"{rel_dir}/{subdir}" if rel_dir else subdir
+            item = self.browser_tree.insert(parent_item, tk.END, text=subdir, values=("", ""), tags=("dir",))
+            self._browser_pending[item] = ("dir", child_rel)
+            self.browser_tree.insert(item, tk.END, text=self._t("browser_loading"), tags=("placeholder",))
+        self._browser_windows[parent_item] = {"files": files, "offset": len(subdirs), "pages": [], "markers": []}
+        self._show_browser_page(parent_item, 0)
+
+    def _show_browser_page(self, parent_item: str, start: int) -> None:
+        # A directory keeps at most BROWSER_WINDOW_PAGES pages of rows; paging one way drops the far end.
+        window = self._browser_windows[parent_item]
+        files, pages = window["files"], window["pages"]
+        for marker in window["markers"]:
+            self._browser_pending.pop(marker, None)
+            self.browser_tree.delete(marker)
+        forward = not pages or start >= pages[-1][0]
+        items = []
+        for offset, entry in enumerate(files[start : start + BROWSER_PAGE_SIZE]):
+            modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.mtime_ns / 1e9))
+            items.append(
+                self.browser_tree.insert(
+                    parent_item,
+                    tk.END if forward else window["offset"] + offset,
+                    text=entry.name,
+                    values=(self._format_size(entry.size), modified),
+                    tags=("file",),
+                )
+            )
+        if forward:
+            pages.append((start, items))
+        else:
+            pages.insert(0, (start, items))
+        if len(pages) > BROWSER_WINDOW_PAGES:
+            self.browser_tree.delete(*pages.pop(0 if forward else -1)[1])
+
+        window["markers"] = []
+        for direction, position in (("previous", window["offset"]), ("more", tk.END)):
+            if self._browser_marker_count(parent_item, direction):
+                marker = self.browser_tree.insert(
+                    parent_item, position, text=self._browser_marker_text(parent_item, direction), tags=("more",)
+                )
+                self._browser_pending[marker] = ("more", (parent_item, direction))
+                window["markers"].append(marker)
+        if items and len(pages) > 1:
+            self.browser_tree.see(items[0] if forward else items[-1])
+
+    def _browser_marker_count(self, parent_item: str, direction: str) -> int:
+        window = self._browser_windows[parent_item]
+        pages = window["pages"]
+        if direction == "previous":
+            return pages[0][0]
+        return len(window["files"]) - pages[-1][0] - len(pages[-1][1])
+
+    def _browser_marker_text(self, parent_item: str, direction: str) -> str:
+        return self._t(f"browser_{direction}", count=self._browser_marker_count(parent_item, direction))
+
+    def _expand_browser_item(self, item: str) -> None:
+        pending = self._browser_pending.pop(item, None)
+        if pending is None:
+            return
+        kind, payload = pending
+        if kind == "dir":
+            self.browser_tree.delete(*self.browser_tree.get_children(item))
+            self._insert_browser_children(item, payload)
+        else:
+            parent_item, direction = payload
+            pages = self._browser_windows[parent_item]["pages"]
+            if direction == "previous":
+                self._show_browser_page(parent_item, max(0, pages[0][0] - BROWSER_PAGE_SIZE))
+            else:
+                self._show_browser_page(parent_item, pages[-1][0] + len(pages[-1][1]))
+
+    def _on_browser_open(self, event=None) -> None:
+        item = self.browser_tree.focus()
+        if item:
+            self._expand_browser_item(item)
+
+    def _on_browser_activate(self, event=None) -> None:
+        item = self.browser_tree.focus()
+        if item and "more" in self.browser_tree.item(item, "tags"):
+            self._expand_browser_item(item)
+
+    def _on_browser_scroll(self, scrollbar: ttk.Scrollbar, first, last) -> None:
+        scrollbar.set(first, last)
+        if float(last) < 0.98:
+            return
+        # Page in the next chunk only once its "more" row scrolls into view.
+        for item, (kind, payload) in list(self._browser_pending.items()):
+            if kind == "more" and payload[1] == "more" and self.browser_tree.bbox(item):
+                self.root.after_idle(self._expand_browser_item, item)
+
+    def _format_size(self, size: int) -> str:
+        return format_size(size)
+
+    def _show_roots_status(self) -> None:
+        self._clear_frame()
+        self.current_view = "roots"
+        frame = ttk.Frame(self.root, padding=12)
+        frame.pack(fill="both", expand=True)
+        self.current_frame = frame
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(3, weight=1)
+        if not self.roots_pattern_var.get().strip():
+            self.roots_pattern_var.set(self.root_path_var.get())
+
+        title = self._bind_text(ttk.Label(frame, font=("TkDefaultFont", 14, "bold")), "roots_title")
+        title.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        lang_label = self._bind_text(ttk.Label(frame), "language_label")
+        lang_label.grid(row=0, column=2, sticky="e", padx=(12, 4))
+        lang_combo = ttk.Combobox(
+            frame,
+            textvariable=self.language_label_var,
+            values=list(LANGUAGE_LABELS.values()),
+            state="readonly",
+            width=10,
+        )
+        lang_combo.grid(row=0, column=3, sticky="e")
+        lang_combo.bind("<<ComboboxSelected>>", self._on_language_change)
+
+        pattern_label = self._bind_text(ttk.Label(frame), "roots_pattern_label")
+        pattern_label.grid(row=1, column=0, sticky="w")
+        pattern_entry = ttk.Entry(frame, textvariable=self.roots_pattern_var)
+        pattern_entry.grid(row=1, column=1, columnspan=2, sticky="ew", padx=(8, 8))
+        pattern_entry.bind("<Return>", lambda event: self._start_roots_scan())
+        scan_button = self._bind_text(ttk.Button(frame, command=self._start_roots_scan), "roots_scan_button")
+        scan_button.grid(row=1, column=3, sticky="e")
+
+        self.roots_summary_label = ttk.Label(frame, text="")
+        self.roots_summary_label.grid(row=2, column=0, columnspan=4, sticky="w", pady=(8, 0))
+
+        tree_frame = ttk.Frame(frame)
+        tree_frame.grid(row=3, column=0, columnspan=4, sticky="nsew", pady=(8, 0))
+        tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(0, weight=1)
+
+        self.roots_tree = ttk.Treeview(tree_frame, columns=("packs", "files", "size", "missing"))
+        for column, key in (
+            ("#0", "column_root"),
+            ("packs", "column_packs"),
+            ("files", "column_files"),
+            ("size", "column_size"),
+            ("missing", "column_missing"),
+        ):
+            self._register_text(key, lambda text, column=column: self.roots_tree.heading(column, text=text))
+        self.roots_tree.column("#0", width=320, stretch=True)
+        self.roots_tree.column("packs", width=60, anchor="e", stretch=False)
+        self.roots_tree.column("files", width=70, anchor="e", stretch=False)
+        self.roots_tree.column("size", width=80, anchor="e", stretch=False)
+        self.roots_tree.column("missing", width=240, stretch=True)
+        self.roots_tree.grid(row=0, column=0, sticky="nsew")
+        tree_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.roots_tree.yview)
+        tree_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.roots_tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.roots_tree.bind("<Double-Button-1>", self._use_selected_root)
+        self.roots_tree.bind("<Return>", self._use_selected_root)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=4, column=0, columnspan=4, sticky="e", pady=(12, 0))
+        self._bind_text(ttk.Button(button_frame, command=self._show_selector), "back_button").pack(side="left", padx=(0, 8))
+        self._bind_text(ttk.Button(button_frame, command=self._use_selected_root), "use_root_button").pack(side="left")
+
+        if self.root_statuses is None:
+            self._start_roots_scan()
+        else:
+            self._render_roots_table()
+
+    def _start_roots_scan(self) -> None:
+        if self._roots_thread is not None and self._roots_thread.is_alive():
+            return
+        patterns = split_patterns(self.roots_pattern_var.get())
+        self.root_statuses = None
+        self._roots_thread = threading.Thread(target=self._scan_roots, args=(patterns,), daemon=True)
+        self._roots_thread.start()
+        self._render_roots_table()
+        self.root.after(100, self._poll_roots_scan)
+
+    def _scan_roots(self, patterns: List[str]) -> None:
+        self.root_statuses = collect_status(discover_roots(patterns), cache=self.file_index_cache)
+
+    def _poll_roots_scan(self) -> None:
+        if self._roots_thread is not None and self._roots_thread.is_alive():
+            self.root.after(100, self._poll_roots_scan)
+            return
+        if self.current_view == "roots":
+            self._render_roots_table()
+
+    def _render_roots_table(self) -> None:
+        if self.current_view != "roots":
+            return
+        self.roots_tree.delete(*self.roots_tree.get_children(""))
+        statuses = self.root_statuses
+        if statuses is None:
+            self.roots_summary_label.config(text=self._t("roots_scanning"))
+            return
+        if not statuses:
+            self.roots_summary_label.config(text=self._t("roots_none"))
+            return
+        total = len(expected_pack_names())
+        for status in statuses:
+            if not status.found:
+                missing = self._t("roots_not_found")
+            else:
+                missing = ", ".join(status.missing + status.errors) or "-"
+            self.roots_tree.insert(
+                "",
+                tk.END,
+                text=str(status.root),
+                values=(f"{len(status.packs)}/{total}", status.files, self._format_size(status.size), missing),
+            )
+        self.roots_summary_label.config(
+            text=self._t(
+                "roots_summary",
+                roots=len(statuses),
+                problems=sum(1 for status in statuses if not status.ok),
+                files=sum(status.files for status in statuses),
+                size=self._format_size(sum(status.size for status in statuses)),
+            )
+        )
+
+    def _use_selected_root(self, event=None) -> None:
+        item = self.roots_tree.focus()
+        if not item:
+            return
+        self.root_path_var.set(self.roots_tree.item(item, "text"))
+        self._show_selector()
+
+    def _show_watch(self) -> None:
+        self._clear_frame()
+        self.current_view = "watch"
+        frame = ttk.Frame(self.root, padding=12)
+        frame.pack(fill="both", expand=True)
+        self.current_frame = frame
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(4, weight=1)
+
+        title = self._bind_text(ttk.Label(frame, font=("TkDefaultFont", 14, "bold")), "watch_title")
+        title.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        lang_label = self._bind_text(ttk.Label(frame), "language_label")
+        lang_label.grid(row=0, column=2, sticky="e", padx=(12, 4))
+        lang_combo = ttk.Combobox(
+            frame,
+            textvariable=self.language_label_var,
+            values=list(LANGUAGE_LABELS.values()),
+            state="readonly",
+            width=10,
+        )
+        lang_combo.grid(row=0, column=3, sticky="e")
+        lang_combo.bind("<<ComboboxSelected>>", self._on_language_change)
+
+        self._bind_text(ttk.Label(frame), "watch_folder_label").grid(row=1, column=0, sticky="w")
+        ttk.Entry(frame, textvariable=self.watch_dir_var).grid(row=1, column=1, columnspan=2, sticky="ew", padx=(8, 8))
+        self._bind_text(ttk.Button(frame, command=self._browse_watch_dir), "browse_button").grid(row=1, column=3, sticky="e")
+
+        options = ttk.Frame(frame)
+        options.grid(row=2, column=0, columnspan=4, sticky="w", pady=(6, 0))
+        behavior_check = ttk.Checkbutton(options, variable=self.behavior_pack_var)
+        self._bind_text(behavior_check, "behavior_pack_checkbox").pack(side="left")
+        optimize_check = ttk.Checkbutton(options, variable=self.optimize_geometry_var)
+        self._bind_text(optimize_check, "optimize_geometry_checkbox").pack(side="left", padx=(12, 0))
+        shared_check = ttk.Checkbutton(options, variable=self.shared_animations_var)
+        self._bind_text(shared_check, "shared_animations_checkbox").pack(side="left", padx=(12, 0))
+
+        self.watch_status_label = ttk.Label(frame, text="")
+        self.watch_status_label.grid(row=3, column=0, columnspan=4, sticky="w", pady=(8, 0))
+
+        log_frame = ttk.Frame(frame)
+        log_frame.grid(row=4, column=0, columnspan=4, sticky="nsew", pady=(6, 0))
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        self.watch_listbox = tk.Listbox(log_frame, height=12, exportselection=False)
+        self.watch_listbox.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.watch_listbox.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.watch_listbox.configure(yscrollcommand=scrollbar.set)
+
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=5, column=0, columnspan=4, sticky="e", pady=(12, 0))
+        self._bind_text(ttk.Button(button_frame, command=self._show_selector), "back_button").pack(side="left", padx=(0, 8))
+        self.watch_toggle_button = ttk.Button(button_frame, command=self._toggle_watch)
+        self.watch_toggle_button.pack(side="left")
+        self._render_watch_log()
+
+    def _browse_watch_dir(self) -> None:
+        path = filedialog.askdirectory()
+        if path:
+            self.watch_dir_var.set(path)
+
+    def _watching(self) -> bool:
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def _toggle_watch(self) -> None:
+        if self._watching():
+            self.watcher.stop()
+            self._watch_thread.join(timeout=5)
+            self._render_watch_log()
+            return
+        root_path = normalize_root(self.root_path_var.get())
+        if not root_path.is_dir():
+            messagebox.showerror(self._t("error_title"), self._t("invalid_root", path=str(root_path)))
+            return
+        drop_dir = Path(self.watch_dir_var.get().strip()).expanduser()
+        if not self.watch_dir_var.get().strip() or not drop_dir.is_dir():
+            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=self.watch_dir_var.get()))
+            return
+        self.watcher = DropFolderWatcher(
+            drop_dir,
+            root_path,
+            namespace=self.namespace_var.get().strip() or DEFAULT_NAMESPACE,
+            behavior=self.behavior_pack_var.get(),
+            optimize_geometry=self.optimize_geometry_var.get(),
+            shared_animations=self.shared_animations_var.get(),
+            fallback_icon=self.logo_path,
+            on_result=self._watch_results.put,
+        )
+        self._watch_thread = threading.Thread(target=self.watcher.run, daemon=True)
+        self._watch_thread.start()
+        self._render_watch_log()
+        self.root.after(WATCH_POLL_MS, self._poll_watch_results)
+
+    def _poll_watch_results(self) -> None:
+        added = False
+        while True:
+            try:
+                self.watch_log.append(self._watch_results.get_nowait())
+            except queue.Empty:
+                break
+            added = True
+        if added and self.current_view == "watch":
+            self._render_watch_log()
+        if self._watching():
+            self.root.after(WATCH_POLL_MS, self._poll_watch_results)
+
+    def _render_watch_log(self) -> None:
+        if self.current_view != "watch":
+            return
+        self.watch_listbox.delete(0, tk.END)
+        for result in self.watch_log:
+            stamp = time.strftime("%H:%M:%S", time.localtime(result.finished))
+            if result.ok:
+                text = self._t("watch_created", name=result.name, count=len(result.created))
+            else:
+                error = "; ".join(self._plan_issue_text(issue) for issue in result.issues)
+                text = self._t("watch_failed", name=result.name, error=error)
+            self.watch_listbox.insert(tk.END, f"{stamp}  {text}")
+        self.watch_listbox.see(tk.END)
+        key = "watch_running" if self._watching() else "watch_stopped"
+        self.watch_status_label.config(
+            text=self._t(
+                key,
+                path=self.watcher.drop_dir if self.watcher is not None else "",
+                created=sum(1 for result in self.watch_log if result.ok),
+                failed=sum(1 for result in self.watch_log if not result.ok),
+            )
+        )
+        self.watch_toggle_button.configure(
+            text=self._t("watch_stop_button" if self._watching() else "watch_start_button")
+        )
 
     def _show_entity_creator(self) -> None:
         self._clear_frame()
@@ -450,10 +987,10 @@ class GoldStarApp:
         self.current_frame = frame
         frame.columnconfigure(1, weight=1)
 
-        title = ttk.Label(frame, text=self._t("custom_entity_title"), font=("TkDefaultFont", 14, "bold"))
+        title = self._bind_text(ttk.Label(frame, font=("TkDefaultFont", 14, "bold")), "custom_entity_title")
         title.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
 
-        lang_label = ttk.Label(frame, text=self._t("language_label"))
+        lang_label = self._bind_text(ttk.Label(frame), "language_label")
         lang_label.grid(row=0, column=2, sticky="e", padx=(12, 4))
         lang_combo = ttk.Combobox(
             frame,
@@ -466,400 +1003,269 @@ class GoldStarApp:
         lang_combo.bind("<<ComboboxSelected>>", self._on_language_change)
 
         row = 1
-        ttk.Label(frame, text=self._t("field_entity_name")).grid(row=row, column=0, sticky="w")
+        self._bind_text(ttk.Label(frame), "field_entity_name").grid(row=row, column=0, sticky="w")
         ttk.Entry(frame, textvariable=self.entity_name_var).grid(
             row=row, column=1, columnspan=3, sticky="ew", padx=(8, 0)
         )
 
         row += 1
-        ttk.Label(frame, text=self._t("field_namespace")).grid(row=row, column=0, sticky="w")
+        self._bind_text(ttk.Label(frame), "field_namespace").grid(row=row, column=0, sticky="w")
         ttk.Entry(frame, textvariable=self.namespace_var).grid(row=row, column=1, sticky="ew", padx=(8, 0))
-        ttk.Label(frame, text=self._t("namespace_hint")).grid(row=row, column=2, columnspan=2, sticky="w", padx=(8, 0))
+        self._bind_text(ttk.Label(frame), "namespace_hint").grid(row=row, column=2, columnspan=2, sticky="w", padx=(8, 0))
 
         row += 1
-        self._add_file_row(frame, row, self._t("field_model"), self.model_path_var, [("JSON", "*.json"), ("All files", "*.*")])
+        self._add_file_row(
+            frame,
+            row,
+            "field_model",
+            self.model_path_var,
+            [("JSON", "*.json"), ("Archives", "*.zip;*.bbmodel"), ("All files", "*.*")],
+        )
         row += 1
-        self._add_file_row(frame, row, self._t("field_texture"), self.texture_path_var, [("Images", "*.png;*.tga"), ("All files", "*.*")])
+        self._add_file_row(frame, row, "field_texture", self.texture_path_var, [("Images", "*.png;*.tga"), ("All files", "*.*")])
         row += 1
         self._add_file_row(
             frame,
             row,
-            self._t("field_anim_controller"),
+            "field_anim_controller",
             self.anim_controller_path_var,
             [("JSON", "*.json"), ("All files", "*.*")],
         )
         row += 1
-        self._add_file_row(frame, row, self._t("field_animation"), self.animation_path_var, [("JSON", "*.json"), ("All files", "*.*")])
+        self._add_file_row(frame, row, "field_animation", self.animation_path_var, [("JSON", "*.json"), ("All files", "*.*")])
         row += 1
-        self._add_file_row(frame, row, self._t("field_icon"), self.icon_path_var, [("Images", "*.png"), ("All files", "*.*")])
+        self._add_file_row(frame, row, "field_icon", self.icon_path_var, [("Images", "*.png"), ("All files", "*.*")])
 
         row += 1
-        ttk.Label(frame, text=self._t("required_hint")).grid(row=row, column=0, columnspan=4, sticky="w", pady=(6, 0))
+        self._bind_text(ttk.Label(frame), "required_hint").grid(row=row, column=0, columnspan=4, sticky="w", pady=(6, 0))
         row += 1
-        ttk.Checkbutton(frame, text=self._t("behavior_pack_checkbox"), variable=self.behavior_pack_var).grid(
+        self._bind_text(ttk.Checkbutton(frame, variable=self.behavior_pack_var), "behavior_pack_checkbox").grid(
             row=row, column=0, columnspan=4, sticky="w", pady=(6, 0)
         )
+        row += 1
+        self._bind_text(ttk.Checkbutton(frame, variable=self.optimize_geometry_var), "optimize_geometry_checkbox").grid(
+            row=row, column=0, columnspan=4, sticky="w"
+        )
+        row += 1
+        self._bind_text(ttk.Checkbutton(frame, variable=self.render_icon_var), "render_icon_checkbox").grid(
+            row=row, column=0, columnspan=4, sticky="w"
+        )
+        row += 1
+        self._bind_text(ttk.Checkbutton(frame, variable=self.shared_animations_var), "shared_animations_checkbox").grid(
+            row=row, column=0, columnspan=4, sticky="w"
+        )
 
         row += 1
         button_frame = ttk.Frame(frame)
         button_frame.grid(row=row, column=0, columnspan=4, sticky="e", pady=(12, 0))
-        ttk.Button(button_frame, text=self._t("back_button"), command=self._show_selector).pack(side="left", padx=(0, 8))
-        ttk.Button(button_frame, text=self._t("create_button"), command=self._create_entity).pack(side="left")
+        self._bind_text(ttk.Button(button_frame, command=self._show_selector), "back_button").pack(side="left", padx=(0, 8))
+        self.create_button = self._bind_text(ttk.Button(button_frame, command=self._create_entity), "create_button")
+        self.create_button.pack(side="left")
+        if self._create_thread is not None and self._create_thread.is_alive():
+            self.create_button.configure(state="disabled")
+
+        self._build_preview_pane(frame, row)
+
+    def _build_preview_pane(self, frame, rowspan: int) -> None:
+        preview_frame = self._bind_text(ttk.LabelFrame(frame, padding=8), "preview_title")
+        preview_frame.grid(row=1, column=4, rowspan=rowspan, sticky="nsew", padx=(12, 0))
+        preview_frame.rowconfigure(5, weight=1)
+
+        self.preview_labels = {}
+        self._preview_images = {}
+        self._preview_text_keys = {}
+        for index, (slot, key) in enumerate(
+            (("texture", "field_texture"), ("icon", "field_icon"), ("pack", "preview_pack_textures"))
+        ):
+            self._bind_text(ttk.Label(preview_frame), key).grid(row=index * 2, column=0, sticky="w")
+            label = tk.Label(preview_frame, relief="groove", borderwidth=1)
+            label.grid(row=index * 2 + 1, column=0, sticky="w", pady=(2, 8))
+            self.preview_labels[slot] = label
+            self._set_preview_text(slot, "preview_empty")
+
+        list_frame = ttk.Frame(preview_frame)
+        list_frame.grid(row=6, column=0, sticky="nsew")
+        self.pack_texture_listbox = tk.Listbox(list_frame, height=6, width=28, exportselection=False)
+        self.pack_texture_listbox.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.pack_texture_listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.pack_texture_listbox.configure(yscrollcommand=scrollbar.set)
+        self.pack_texture_listbox.bind("<<ListboxSelect>>", self._on_pack_texture_select)
+
+        textures_dir = normalize_root(self.root_path_var.get()) / "BLF_CustomEntity" / "textures" / "entity"
+        try:
+            self._pack_texture_paths = sorted(
+                p for p in textures_dir.iterdir() if p.is_file() and p.suffix.lower() in (".png", ".tga")
+            )
+        except OSError:
+            self._pack_texture_paths = []
+        for path in self._pack_texture_paths:
+            self.pack_texture_listbox.insert(tk.END, path.name)
 
-    def _add_file_row(self, parent, row: int, label_text: str, var: tk.StringVar, filetypes) -> None:
-        ttk.Label(parent, text=label_text).grid(row=row, column=0, sticky="w")
-        ttk.Entry(parent, textvariable=var).grid(row=row, column=1, columnspan=2, sticky="ew", padx=(8, 0))
-        ttk.Button(parent, text=self._t("select_button"), command=lambda: self._choose_file(var, filetypes)).grid(
-            row=row, column=3, sticky="e"
-        )
+        for slot in ("texture", "icon"):
+            self._schedule_preview(slot, delay=0)
 
-    def _choose_file(self, var: tk.StringVar, filetypes) -> None:
-        path = filedialog.askopenfilename(filetypes=filetypes)
-        if path:
-            var.set(path)
+    def _schedule_preview(self, slot: str, delay: int = 150) -> None:
+        if self.current_view != "entity":
+            return
+        after_id = self._preview_after_ids.pop(slot, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        var = self.texture_path_var if slot == "texture" else self.icon_path_var
+        self._preview_after_ids[slot] = self.root.after(
+            delay, lambda: self._request_preview(slot, var.get().strip())
+        )
 
-    def _create_entity(self) -> None:
-        name = self.entity_name_var.get().strip()
-        namespace = self.namespace_var.get().strip() or DEFAULT_NAMESPACE
+    def _on_pack_texture_select(self, event=None) -> None:
+        selection = self.pack_texture_listbox.curselection()
+        if selection:
+            self._request_preview("pack", str(self._pack_texture_paths[selection[0]]))
 
-        missing_fields = []
-        if not name:
-            missing_fields.append(self._t("field_entity_name"))
-        if not self.model_path_var.get().strip():
-            missing_fields.append(self._t("field_model"))
-        if not self.texture_path_var.get().strip():
-            missing_fields.append(self._t("field_texture"))
-        if missing_fields:
-            messagebox.showwarning(
-                self._t("warning_title"),
-                self._t("missing_required", fields=", ".join(missing_fields)),
-            )
+    def _request_preview(self, slot: str, path_text: str) -> None:
+        self._preview_after_ids.pop(slot, None)
+        label = self.preview_labels.get(slot)
+        if self.current_view != "entity" or label is None or not label.winfo_exists():
             return
-
-        if len(name) > 20 or not re.fullmatch(r"[a-z0-9_]+", name):
-            messagebox.showwarning(self._t("warning_title"), self._t("invalid_name"))
+        source = Path(path_text) if path_text else None
+        if source is None or not source.is_file():
+            self.thumbnail_loader.cancel(slot)
+            self._preview_images.pop(slot, None)
+            self._set_preview_text(slot, "preview_empty")
             return
+        self._set_preview_text(slot, "preview_loading")
+        self.thumbnail_loader.request(
+            slot, source, PREVIEW_SIZES[slot], lambda path, error: self._show_preview(slot, path, error)
+        )
+        if not self._preview_polling:
+            self._preview_polling = True
+            self.root.after(30, self._poll_previews)
+
+    def _poll_previews(self) -> None:
+        self.thumbnail_loader.deliver()
+        if self.thumbnail_loader.pending():
+            self.root.after(30, self._poll_previews)
+        else:
+            self._preview_polling = False
 
-        if not re.fullmatch(r"[a-z]+", namespace):
-            messagebox.showwarning(self._t("warning_title"), self._t("invalid_prefix"))
+    def _show_preview(self, slot: str, path: Optional[Path], error: Optional[Exception]) -> None:
+        label = self.preview_labels.get(slot)
+        if self.current_view != "entity" or label is None or not label.winfo_exists():
             return
-
-        model_source = Path(self.model_path_var.get().strip())
-        if not model_source.is_file():
-            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=str(model_source)))
+        if error is not None or path is None:
+            self._set_preview_text(slot, "preview_failed")
             return
-
-        texture_source = Path(self.texture_path_var.get().strip())
-        if not texture_source.is_file():
-            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=str(texture_source)))
+        try:
+            photo = tk.PhotoImage(file=str(path))
+        except tk.TclError:
+            self._set_preview_text(slot, "preview_failed")
             return
+        self._preview_images[slot] = photo
+        self._preview_text_keys.pop(slot, None)
+        label.configure(image=photo, text="")
 
-        animation_source = Path(self.animation_path_var.get().strip()) if self.animation_path_var.get().strip() else None
-        if animation_source and not animation_source.is_file():
-            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=str(animation_source)))
-            return
+    def _set_preview_text(self, slot: str, key: str) -> None:
+        self._preview_text_keys[slot] = key
+        self.preview_labels[slot].configure(image="", text=self._t(key))
 
-        controller_source = (
-            Path(self.anim_controller_path_var.get().strip())
-            if self.anim_controller_path_var.get().strip()
-            else None
+    def _add_file_row(self, parent, row: int, label_key: str, var: tk.StringVar, filetypes) -> None:
+        self._bind_text(ttk.Label(parent), label_key).grid(row=row, column=0, sticky="w")
+        ttk.Entry(parent, textvariable=var).grid(row=row, column=1, columnspan=2, sticky="ew", padx=(8, 0))
+        self._bind_text(ttk.Button(parent, command=lambda: self._choose_file(var, filetypes)), "select_button").grid(
+            row=row, column=3, sticky="e"
         )
-        if controller_source and not controller_source.is_file():
-            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=str(controller_source)))
-            return
 
-        icon_source = Path(self.icon_path_var.get().strip()) if self.icon_path_var.get().strip() else None
-        if icon_source and not icon_source.is_file():
-            messagebox.showerror(self._t("error_title"), self._t("file_not_found", path=str(icon_source)))
-            return
+    def _choose_file(self, var: tk.StringVar, filetypes) -> None:
+        path = filedialog.askopenfilename(filetypes=filetypes)
+        if path:
+            var.set(path)
 
+    def _create_entity(self) -> None:
+        if self._create_thread is not None and self._create_thread.is_alive():
+            return
         root_path = normalize_root(self.root_path_var.get())
         if not root_path.is_dir():
             messagebox.showerror(self._t("error_title"), self._t("invalid_root", path=str(root_path)))
             return
 
-        pack_root = root_path / "BLF_CustomEntity"
-        if not pack_root.is_dir():
-            messagebox.showerror(self._t("error_title"), self._t("missing_pack_warning", name="BLF_CustomEntity"))
-            return
-
-        entity_path = pack_root / "entity" / f"{name}.entity.json"
-        if entity_path.exists():
-            messagebox.showwarning(self._t("warning_title"), self._t("duplicate_name"))
-            return
+        spec = EntitySpec(
+            name=self.entity_name_var.get().strip(),
+            namespace=self.namespace_var.get().strip() or DEFAULT_NAMESPACE,
+            model_source=self._optional_path(self.model_path_var),
+            texture_source=self._optional_path(self.texture_path_var),
+            animation_source=self._optional_path(self.animation_path_var),
+            controller_source=self._optional_path(self.anim_controller_path_var),
+            icon_source=self._optional_path(self.icon_path_var),
+            optimize_geometry=self.optimize_geometry_var.get(),
+            render_icon=self.render_icon_var.get(),
+            shared_animations=self.shared_animations_var.get(),
+        )
+        # Planning reads every source and may render the icon, which takes seconds for large textures.
+        # Not a daemon thread: closing the window must not cut a commit short.
+        self.create_button.configure(state="disabled")
+        self._create_result = None
+        self._create_thread = threading.Thread(
+            target=self._run_create_entity, args=(root_path, spec, self.behavior_pack_var.get())
+        )
+        self._create_thread.start()
+        self.root.after(100, self._poll_create_entity)
 
+    def _run_create_entity(self, root_path: Path, spec: EntitySpec, behavior: bool) -> None:
         try:
-            self._generate_entity_files(
-                pack_root,
-                name,
-                namespace,
-                model_source,
-                texture_source,
-                animation_source,
-                controller_source,
-                icon_source,
-            )
-            if self.behavior_pack_var.get():
-                behavior_pack = self._ensure_behavior_pack()
-                self._create_behavior_entity(behavior_pack, name, namespace)
-                self._create_behavior_spawn_item(behavior_pack, name, namespace)
-                self._ensure_armor_samples(behavior_pack, namespace)
+            spec, issues = expand_archive_spec(spec)
+            issues = issues or validate_entity_spec(spec)
+            if issues:
+                raise PlanError(issues)
+            plan = plan_entities(root_path, [spec], behavior=behavior, fallback_icon=self.logo_path)
+            execute_entity_plan(root_path, plan)
         except Exception as exc:
-            messagebox.showerror(self._t("error_title"), str(exc))
+            self._create_result = (spec, None, exc)
             return
+        self._create_result = (spec, plan, None)
 
-        messagebox.showinfo(self._t("info_title"), self._t("create_success", name=name))
-        self._show_selector()
+    def _poll_create_entity(self) -> None:
+        if self._create_thread is not None and self._create_thread.is_alive():
+            self.root.after(100, self._poll_create_entity)
+            return
+        spec, plan, error = self._create_result
+        if self.current_view == "entity" and self.create_button.winfo_exists():
+            self.create_button.configure(state="normal")
+        if isinstance(error, PlanError):
+            self._show_plan_issue(error.issues[0])
+            return
+        if error is not None:
+            messagebox.showerror(self._t("error_title"), str(error))
+            return
 
-    def _generate_entity_files(
-        self,
-        pack_root: Path,
-        name: str,
-        namespace: str,
-        model_source: Path,
-        texture_source: Path,
-        animation_source: Optional[Path],
-        controller_source: Optional[Path],
-        icon_source: Optional[Path],
-    ) -> None:
-        animations_dir = pack_root / "animations"
-        controllers_dir = pack_root / "animation_controllers"
-        entity_dir = pack_root / "entity"
-        models_dir = pack_root / "models" / "entity"
-        textures_entity_dir = pack_root / "textures" / "entity"
-        textures_items_dir = pack_root / "textures" / "items"
-
-        for path in [animations_dir, controllers_dir, entity_dir, models_dir, textures_entity_dir, textures_items_dir]:
-            path.mkdir(parents=True, exist_ok=True)
-
-        template_animation = animations_dir / "default_entity.animation.json"
-        template_controller = controllers_dir / "default_entity.ac.json"
-        template_entity = entity_dir / "default_entity.entity.json"
-        template_icon = textures_items_dir / "default_entity.icon.png"
-
-        animation_src = animation_source or template_animation
-        controller_src = controller_source or template_controller
-        if not animation_src.is_file():
-            raise FileNotFoundError(self._t("file_not_found", path=str(animation_src)))
-        if not controller_src.is_file():
-            raise FileNotFoundError(self._t("file_not_found", path=str(controller_src)))
-        if not template_entity.is_file():
-            raise FileNotFoundError(self._t("file_not_found", path=str(template_entity)))
-
-        anim_dest = animations_dir / f"{name}.animation.json"
-        controller_dest = controllers_dir / f"{name}.ac.json"
-        model_dest = models_dir / f"{name}.geo.json"
-        texture_dest = textures_entity_dir / f"{name}{texture_source.suffix}"
-        icon_dest = textures_items_dir / f"{name}.icon.png"
-
-        self._copy_text_with_replace(animation_src, anim_dest, {"default_entity": name})
-        self._copy_text_with_replace(controller_src, controller_dest, {"default_entity": name})
-
-        model_text = model_source.read_text(encoding="utf-8")
-        if "default_entity" in model_text:
-            model_text = model_text.replace("default_entity", name)
-        model_dest.write_text(model_text, encoding="utf-8")
-        geo_identifier = self._get_geometry_identifier(model_dest) or f"geometry.{name}"
-
-        shutil.copy2(texture_source, texture_dest)
-
-        if icon_source and icon_source.is_file():
-            shutil.copy2(icon_source, icon_dest)
-        elif template_icon.is_file():
-            shutil.copy2(template_icon, icon_dest)
-        else:
-            raise FileNotFoundError(self._t("file_not_found", path=str(template_icon)))
-
-        entity_data = self._load_json(template_entity)
-        client_entity = entity_data.setdefault("minecraft:client_entity", {})
-        if not isinstance(client_entity, dict):
-            client_entity = {}
-            entity_data["minecraft:client_entity"] = client_entity
-        description = client_entity.setdefault("description", {})
-        if not isinstance(description, dict):
-            description = {}
-            client_entity["description"] = description
-
-        description["identifier"] = f"{namespace}:{name}"
-        description["textures"] = {"default": f"textures/entity/{name}"}
-        description["geometry"] = {"default": geo_identifier}
-        description["animations"] = {
-            "setup": f"animation.{name}.setup",
-            "normal": f"animation.{name}.normal",
-            "default": f"animation.{name}.default",
-            "skill1": f"animation.{name}.skill1",
-            "skill2": f"animation.{name}.skill2",
-            "skill3": f"animation.{name}.skill3",
-            "skill4": f"animation.{name}.skill4",
-            "skill5": f"animation.{name}.skill5",
-        }
-        description["scripts"] = {
-            "animate": ["setup", "normal", f"controller.animation.{name}"]
-        }
-        description["spawn_egg"] = {"texture": name}
-
-        self._write_json(entity_dir / f"{name}.entity.json", entity_data)
-        self._ensure_item_texture_entry(pack_root, name)
-
-    def _copy_text_with_replace(self, source: Path, destination: Path, replacements: Dict[str, str]) -> None:
-        text = source.read_text(encoding="utf-8")
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        destination.write_text(text, encoding="utf-8")
-
-    def _load_json(self, path: Path) -> dict:
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            return {}
-
-    def _write_json(self, path: Path, data: dict) -> None:
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-    def _get_geometry_identifier(self, path: Path) -> Optional[str]:
-        data = self._load_json(path)
-        geos = data.get("minecraft:geometry")
-        if isinstance(geos, list) and geos:
-            desc = geos[0].get("description")
-            if isinstance(desc, dict):
-                ident = desc.get("identifier")
-                if isinstance(ident, str):
-                    return ident
-        return None
-
-    def _ensure_item_texture_entry(self, pack_root: Path, name: str) -> None:
-        item_texture_path = pack_root / "textures" / "item_texture.json"
-        data = self._load_json(item_texture_path)
-        if not isinstance(data, dict):
-            data = {}
-        texture_data = data.get("texture_data")
-        if not isinstance(texture_data, dict):
-            texture_data = {}
-            data["texture_data"] = texture_data
-        texture_data[name] = {"textures": f"textures/items/{name}.icon"}
-        data.setdefault("texture_name", "atlas.items")
-        data.setdefault("resource_pack_name", "vanilla")
-        self._write_json(item_texture_path, data)
-
-    def _ensure_behavior_pack(self) -> Path:
-        root_path = normalize_root(self.root_path_var.get())
-        behavior_root = root_path.parent / "development_behavior_packs"
-        behavior_root.mkdir(parents=True, exist_ok=True)
-        pack_dir = behavior_root / BEHAVIOR_PACK_NAME
-        pack_dir.mkdir(parents=True, exist_ok=True)
-        (pack_dir / "entities").mkdir(parents=True, exist_ok=True)
-        (pack_dir / "items").mkdir(parents=True, exist_ok=True)
-
-        manifest_path = pack_dir / "manifest.json"
-        if not manifest_path.is_file():
-            manifest = {
-                "format_version": 2,
-                "header": {
-                    "name": BEHAVIOR_PACK_NAME,
-                    "description": f"{BEHAVIOR_PACK_NAME} (generated by goldstar)",
-                    "uuid": str(uuid.uuid4()),
-                    "version": [1, 0, 0],
-                    "min_engine_version": [1, 20, 0],
-                },
-                "modules": [
-                    {
-                        "type": "data",
-                        "uuid": str(uuid.uuid4()),
-                        "version": [1, 0, 0],
-                    }
-                ],
-            }
-            self._write_json(manifest_path, manifest)
-
-        icon_path = pack_dir / "pack_icon.png"
-        if not icon_path.is_file():
-            icon_source = self._find_pack_icon_source()
-            if icon_source:
-                shutil.copy2(icon_source, icon_path)
-
-        return pack_dir
-
-    def _find_pack_icon_source(self) -> Optional[Path]:
-        root_path = normalize_root(self.root_path_var.get())
-        for name in expected_pack_names():
-            icon_path = root_path / name / "pack_icon.png"
-            if icon_path.is_file():
-                return icon_path
-        if self.logo_path.is_file():
-            return self.logo_path
-        return None
-
-    def _build_behavior_entity(self, namespace: str, name: str) -> dict:
-        return {
-            "format_version": "1.20.0",
-            "minecraft:entity": {
-                "description": {
-                    "identifier": f"{namespace}:{name}",
-                    "is_spawnable": True,
-                    "is_summonable": True,
-                    "is_experimental": False,
-                },
-                "components": {
-                    "minecraft:health": {"value": 1, "max": 1},
-                    "minecraft:movement": {"value": 0},
-                    "minecraft:collision_box": {"width": 0.6, "height": 1.8},
-                    "minecraft:pushable": {
-                        "is_pushable": False,
-                        "is_pushable_by_piston": False,
-                    },
-                },
-            },
-        }
-
-    def _build_behavior_spawn_item(self, namespace: str, name: str) -> dict:
-        return {
-            "format_version": "1.20.0",
-            "minecraft:item": {
-                "description": {"identifier": f"{namespace}:{name}_spawn"},
-                "components": {
-                    "minecraft:display_name": {"value": f"{name} spawn"},
-                    "minecraft:icon": {"texture": name},
-                    "minecraft:entity_placer": {"entity": f"{namespace}:{name}"},
-                },
-            },
-        }
-
-    def _build_behavior_armor_item(self, namespace: str, identifier: str, slot: str, icon: str) -> dict:
-        return {
-            "format_version": "1.20.0",
-            "minecraft:item": {
-                "description": {"identifier": f"{namespace}:{identifier}"},
-                "components": {
-                    "minecraft:display_name": {"value": identifier},
-                    "minecraft:icon": {"texture": icon},
-                    "minecraft:wearable": {"slot": slot},
-                    "minecraft:armor": {"protection": 1},
-                    "minecraft:durability": {"max_durability": 1},
-                },
-            },
-        }
-
-    def _create_behavior_entity(self, pack_dir: Path, name: str, namespace: str) -> None:
-        entity_path = pack_dir / "entities" / f"{name}.json"
-        if entity_path.exists():
-            raise FileExistsError(self._t("duplicate_name"))
-        self._write_json(entity_path, self._build_behavior_entity(namespace, name))
-
-    def _create_behavior_spawn_item(self, pack_dir: Path, name: str, namespace: str) -> None:
-        item_path = pack_dir / "items" / f"{name}_spawn.json"
-        if item_path.exists():
-            raise FileExistsError(self._t("duplicate_name"))
-        self._write_json(item_path, self._build_behavior_spawn_item(namespace, name))
-
-    def _ensure_armor_samples(self, pack_dir: Path, namespace: str) -> None:
-        items_dir = pack_dir / "items"
-        for identifier, slot, icon in ARMOR_SAMPLES:
-            item_path = items_dir / f"{identifier}.json"
-            if item_path.is_file():
-                continue
-            item_data = self._build_behavior_armor_item(namespace, identifier, slot, icon)
-            self._write_json(item_path, item_data)
+        message = self._t("create_success", name=spec.name)
+        if plan.notes:
+            details = "\n".join(plan.notes[:GEOMETRY_NOTE_LIMIT])
+            message += "\n\n" + self._t("geometry_optimized", count=len(plan.notes)) + "\n" + details
+        messagebox.showinfo(self._t("info_title"), message)
+        if self.current_view == "entity":
+            self._show_selector()
 
+    def _optional_path(self, var: tk.StringVar) -> Optional[Path]:
+        text = var.get().strip()
+        return Path(text) if text else None
+
+    def _plan_issue_text(self, issue: PlanIssue) -> str:
+        params = dict(issue.params)
+        if issue.key == "missing_required":
+            params["fields"] = ", ".join(self._t(field) for field in params.get("fields", []))
+        return self._t(issue.key, **params)
+
+    def _show_plan_issue(self, issue: PlanIssue) -> None:
+        if issue.key in (
+            "file_not_found",
+            "invalid_json",
+            "invalid_archive",
+            "read_failed",
+            "missing_pack_warning",
+            "archive_member_missing",
+        ):
+            messagebox.showerror(self._t("error_title"), self._plan_issue_text(issue))
+        else:
+            messagebox.showwarning(self._t("warning_title"), self._plan_issue_text(issue))
 
 def main() -> None:
     root = tk.Tk()
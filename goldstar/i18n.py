@@ -0,0 +1,206 @@
+﻿from typing import Dict
+
+LANGUAGE_LABELS = {
+    "ko": "한국어",
+    "en": "English",
+}
+
+TEXT: Dict[str, Dict[str, str]] = {
+    "ko": {
+        "app_title": "GoldStar",
+        "select_pack_title": "작업할 리소스팩을 선택하세요",
+        "root_path_label": "리소스팩 경로",
+        "browse_button": "찾기",
+        "language_label": "언어",
+        "missing_packs": "누락된 팩: {names}",
+        "all_packs_present": "모든 BLF_ 팩이 확인되었습니다.",
+        "missing_all_title": "리소스팩 생성",
+        "missing_all_message": "BLF_ 리소스팩이 하나도 없습니다. 메타데이터 기반 최소 리소스팩을 생성할까요?",
+        "create_failed": "생성 실패: {error}",
+        "missing_pack_warning": "이 팩이 없습니다: {name}",
+        "not_supported": "아직 지원하지 않습니다.",
+        "hint_double_click": "더블클릭으로 선택",
+        "custom_entity_title": "CustomEntity - 새 엔티티 생성",
+        "field_entity_name": "엔티티 이름",
+        "field_namespace": "아이덴티파이어 prefix",
+        "namespace_hint": "비우면 blf",
+        "field_model": "모델링 파일",
+        "field_texture": "텍스처 파일",
+        "field_anim_controller": "애니메이션 컨트롤러(선택)",
+        "field_animation": "애니메이션(선택)",
+        "field_icon": "아이콘 텍스처(선택)",
+        "behavior_pack_checkbox": "테스트용 행동팩도 생성하겠습니까?",
+        "optimize_geometry_checkbox": "모델 최적화 (빈 큐브/본 제거, 소수점 정리)",
+        "render_icon_checkbox": "아이콘이 없으면 모델과 텍스처로 스폰알 아이콘 그리기",
+        "shared_animations_checkbox": "애니메이션이 템플릿과 같으면 복사하지 않고 템플릿 애니메이션 공유",
+        "geometry_optimized": "모델 최적화 변경 {count}건:",
+        "back_button": "뒤로",
+        "create_button": "생성",
+        "select_button": "선택",
+        "required_hint": "필수: 이름/모델링/텍스처 (모델링에 .zip/.bbmodel을 고르면 나머지는 압축 파일에서 채움)",
+        "invalid_name": "엔티티 이름은 영문 소문자/숫자/언더바만, 최대 20자입니다.",
+        "invalid_prefix": "prefix는 영문 소문자만 가능합니다.",
+        "missing_required": "필수 항목이 비었습니다: {fields}",
+        "duplicate_name": "이미 쓰고 있는 이름입니다.",
+        "duplicate_destination": "같은 파일을 두 번 쓰려고 했습니다: {path}",
+        "file_not_found": "파일을 찾을 수 없습니다: {path}",
+        "invalid_json": "JSON 형식 오류: {error}",
+        "archive_member_missing": "압축 파일에 {field} 항목이 없습니다: {path}",
+        "invalid_archive": "압축 파일을 읽을 수 없습니다: {error}",
+        "read_failed": "파일을 읽을 수 없습니다: {error}",
+        "create_success": "생성 완료: {name}",
+        "error_title": "오류",
+        "warning_title": "경고",
+        "info_title": "안내",
+        "invalid_root": "리소스팩 경로가 없습니다: {path}",
+        "search_label": "에셋 검색",
+        "search_indexing": "색인 중...",
+        "search_ready": "색인 항목 {count}개",
+        "search_no_results": "검색 결과가 없습니다.",
+        "search_copied": "경로를 복사했습니다: {path}",
+        "browse_pack_button": "팩 탐색",
+        "browser_title": "{name} - 팩 내용",
+        "browser_loading": "불러오는 중...",
+        "browser_summary": "파일 {count}개 | {size}",
+        "browser_more": "더 보기 ({count}개 남음)",
+        "browser_previous": "이전 항목 보기 ({count}개)",
+        "column_name": "이름",
+        "column_size": "크기",
+        "column_modified": "수정일",
+        "new_entity_button": "새 엔티티",
+        "preview_title": "미리보기",
+        "preview_pack_textures": "팩 텍스처",
+        "preview_empty": "-",
+        "preview_loading": "불러오는 중...",
+        "preview_failed": "미리보기 불가",
+        "sync_behavior_button": "행동팩 동기화",
+        "sync_confirm": "엔티티 {entities}개 검사: 새로 만들 파일 {create}개, 갱신할 파일 {update}개. 진행할까요?",
+        "sync_up_to_date": "엔티티 {entities}개 검사: 행동팩이 최신 상태입니다.",
+        "sync_done": "행동팩 동기화 완료: 생성 {create}개, 갱신 {update}개",
+        "sync_errors": "건너뛴 항목:\n{errors}",
+        "roots_button": "여러 루트 상태",
+        "roots_title": "리소스팩 루트 상태",
+        "roots_pattern_label": "루트/패턴 (;로 구분)",
+        "roots_scan_button": "검사",
+        "roots_scanning": "검사 중...",
+        "roots_none": "일치하는 루트가 없습니다.",
+        "roots_not_found": "경로 없음",
+        "roots_summary": "루트 {roots}개 | 문제 있는 루트 {problems}개 | 파일 {files}개 | {size}",
+        "use_root_button": "이 루트 사용",
+        "column_root": "루트",
+        "column_packs": "팩",
+        "column_files": "파일",
+        "column_missing": "누락/오류",
+        "watch_button": "폴더 감시",
+        "watch_title": "폴더 감시 - 자동 엔티티 생성",
+        "watch_folder_label": "감시 폴더",
+        "watch_start_button": "감시 시작",
+        "watch_stop_button": "감시 중지",
+        "watch_running": "감시 중: {path} | 생성 {created}개 | 실패 {failed}개",
+        "watch_stopped": "중지됨 | 생성 {created}개 | 실패 {failed}개",
+        "watch_created": "{name}: 생성 완료 (파일 {count}개)",
+        "watch_failed": "{name}: 실패 - {error}",
+    },
+    "en": {
+        "app_title": "GoldStar",
+        "select_pack_title": "Select a resource pack to work on",
+        "root_path_label": "Resource pack path",
+        "browse_button": "Browse",
+        "language_label": "Language",
+        "missing_packs": "Missing packs: {names}",
+        "all_packs_present": "All BLF_ packs detected.",
+        "missing_all_title": "Create packs",
+        "missing_all_message": "No BLF_ resource packs found. Create minimal metadata-based packs?",
+        "create_failed": "Create failed: {error}",
+        "missing_pack_warning": "Pack not found: {name}",
+        "not_supported": "Not supported yet.",
+        "hint_double_click": "Double-click to select",
+        "custom_entity_title": "CustomEntity - New Entity",
+        "field_entity_name": "Entity name",
+        "field_namespace": "Identifier prefix",
+        "namespace_hint": "Default is blf",
+        "field_model": "Model file",
+        "field_texture": "Texture file",
+        "field_anim_controller": "Animation controller (optional)",
+        "field_animation": "Animation (optional)",
+        "field_icon": "Icon texture (optional)",
+        "behavior_pack_checkbox": "Also create test behavior pack?",
+        "optimize_geometry_checkbox": "Optimize model (drop empty cubes/bones, round floats)",
+        "render_icon_checkbox": "Without an icon, draw the spawn egg icon from the model and texture",
+        "shared_animations_checkbox": "Share the template animations instead of copying them when unchanged",
+        "geometry_optimized": "{count} model optimizations:",
+        "back_button": "Back",
+        "create_button": "Create",
+        "select_button": "Select",
+        "required_hint": "Required: name/model/texture (a .zip/.bbmodel model fills the rest from the archive)",
+        "invalid_name": "Entity name must be lowercase letters/numbers/underscore, max 20 chars.",
+        "invalid_prefix": "Prefix must be lowercase letters only.",
+        "missing_required": "Required fields missing: {fields}",
+        "duplicate_name": "Name already in use.",
+        "duplicate_destination": "The same file would be written twice: {path}",
+        "file_not_found": "File not found: {path}",
+        "invalid_json": "Invalid JSON: {error}",
+        "archive_member_missing": "Archive has no {field} entry: {path}",
+        "invalid_archive": "Cannot read archive: {error}",
+        "read_failed": "Cannot read file: {error}",
+        "create_success": "Created: {name}",
+        "error_title": "Error",
+        "warning_title": "Warning",
+        "info_title": "Info",
+        "invalid_root": "Resource pack path not found: {path}",
+        "search_label": "Asset search",
+        "search_indexing": "Indexing...",
+        "search_ready": "{count} indexed entries",
+        "search_no_results": "No results.",
+        "search_copied": "Path copied: {path}",
+        "browse_pack_button": "Browse pack",
+        "browser_title": "{name} - Pack contents",
+        "browser_loading": "Loading...",
+        "browser_summary": "{count} files | {size}",
+        "browser_more": "Show more ({count} remaining)",
+        "browser_previous": "Show previous ({count} earlier)",
+        "column_name": "Name",
+        "column_size": "Size",
+        "column_modified": "Modified",
+        "new_entity_button": "New entity",
+        "preview_title": "Preview",
+        "preview_pack_textures": "Pack textures",
+        "preview_empty": "-",
+        "preview_loading": "Loading...",
+        "preview_failed": "No preview",
+        "sync_behavior_button": "Sync behavior pack",
+        "sync_confirm": "Checked {entities} entities: {create} files to create, {update} to update. Continue?",
+        "sync_up_to_date": "Checked {entities} entities: behavior pack is up to date.",
+        "sync_done": "Behavior pack synced: {create} created, {update} updated",
+        "sync_errors": "Skipped:\n{errors}",
+        "roots_button": "All roots",
+        "roots_title": "Resource pack roots",
+        "roots_pattern_label": "Roots/patterns (separate with ;)",
+        "roots_scan_button": "Scan",
+        "roots_scanning": "Scanning...",
+        "roots_none": "No roots matched.",
+        "roots_not_found": "Path not found",
+        "roots_summary": "{roots} roots | {problems} with problems | {files} files | {size}",
+        "use_root_button": "Use this root",
+        "column_root": "Root",
+        "column_packs": "Packs",
+        "column_files": "Files",
+        "column_missing": "Missing/errors",
+        "watch_button": "Watch folder",
+        "watch_title": "Watch folder - automatic entity import",
+        "watch_folder_label": "Drop folder",
+        "watch_start_button": "Start watching",
+        "watch_stop_button": "Stop watching",
+        "watch_running": "Watching {path} | {created} created | {failed} failed",
+        "watch_stopped": "Stopped | {created} created | {failed} failed",
+        "watch_created": "{name}: created ({count} files)",
+        "watch_failed": "{name}: failed - {error}",
+    },
+}
+
+
+def translate(lang: str, key: str, **kwargs) -> str:
+    text = TEXT.get(lang, {}).get(key, TEXT.get("en", {}).get(key, key))
+    if kwargs:
+        return text.format(**kwargs)
+    return text
@@ -0,0 +1,421 @@
+﻿import hashlib
+import math
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .geometry import iter_geometries
+from .jsonio import loads
+from .paths import user_cache_dir
+from .pixels import RGBAImage, decode_image, encode_png
+
+ICON_SIZE = 32
+ICON_RENDER_VERSION = 1
+ICON_YAW = 45.0
+ICON_PITCH = -30.0
+ICON_MARGIN = 1
+ALPHA_CUTOFF = 128
+# Starting worker processes costs more than rendering a handful of icons in-process.
+MIN_POOL_JOBS = 8
+FACE_NAMES = ("north", "east", "south", "west", "up", "down")
+RENDER_ERRORS = (ValueError, IndexError, struct.error, zlib.error)
+
+Vector = Tuple[float, float, float]
+Matrix = Tuple[Vector, Vector, Vector]
+Transform = Tuple[Matrix, Vector]
+IDENTITY: Transform = (((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)), (0.0, 0.0, 0.0))
+
+
+class IconRenderError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class IconJob:
+    model: bytes
+    texture: bytes
+    texture_suffix: str = ".png"
+    identifier: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class IconResult:
+    png: Optional[bytes]
+    error: Optional[str] = None
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class _Face:
+    corner: Vector
+    edge_s: Vector
+    edge_t: Vector
+    normal: Vector
+    rect: Tuple[float, float, float, float]
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _triple(values) -> Vector:
+    values = values if isinstance(values, list) else []
+    return tuple(_number(values[i]) if i < len(values) else 0.0 for i in range(3))
+
+
+def _pair(values) -> Tuple[float, float]:
+    values = values if isinstance(values, list) else []
+    return tuple(_number(values[i]) if i < len(values) else 0.0 for i in range(2))
+
+
+def _matmul(a: Matrix, b: Matrix) -> Matrix:
+    return tuple(tuple(sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)) for i in range(3))
+
+
+def _apply(m: Matrix, v: Vector) -> Vector:
+    return tuple(m[i][0] * v[0] + m[i][1] * v[1] + m[i][2] * v[2] for i in range(3))
+
+
+def _rotation(x: float, y: float, z: float) -> Matrix:
+    # Blockbench's ZYX euler order: X is applied first, then Y, then Z.
+    cx, sx = math.cos(math.radians(x)), math.sin(math.radians(x))
+    cy, sy = math.cos(math.radians(y)), math.sin(math.radians(y))
+    cz, sz = math.cos(math.radians(z)), math.sin(math.radians(z))
+    rx = ((1.0, 0.0, 0.0), (0.0, cx, -sx), (0.0, sx, cx))
+    ry = ((cy, 0.0, sy), (0.0, 1.0, 0.0), (-sy, 0.0, cy))
+    rz = ((cz, -sz, 0.0), (sz, cz, 0.0), (0.0, 0.0, 1.0))
+    return _matmul(rz, _matmul(ry, rx))
+
+
+def _about(pivot: Vector, rotation: Vector) -> Transform:
+    m = _rotation(*rotation)
+    rotated = _apply(m, pivot)
+    return m, tuple(pivot[i] - rotated[i] for i in range(3))
+
+
+def _compose(outer: Transform, inner: Transform) -> Transform:
+    moved = _apply(outer[0], inner[1])
+    return _matmul(outer[0], inner[0]), tuple(moved[i] + outer[1][i] for i in range(3))
+
+
+def _local(node: dict) -> Optional[Transform]:
+    # Bedrock stores X mirrored relative to model space, so pivots flip on X and rotations on X and Y.
+    rotation = _triple(node.get("rotation"))
+    if not any(rotation):
+        return None
+    pivot = _triple(node.get("pivot"))
+    return _about((-pivot[0], pivot[1], pivot[2]), (-rotation[0], -rotation[1], rotation[2]))
+
+
+def _select_geometry(data, identifier: Optional[str]) -> dict:
+    geometries = list(iter_geometries(data))
+    if not geometries:
+        raise IconRenderError("no geometry in model")
+    for name, geometry in geometries:
+        if identifier and name.split(":")[0] == identifier:
+            return geometry
+    return geometries[0][1]
+
+
+def _texture_size(geometry: dict, texture: RGBAImage) -> Tuple[float, float]:
+    description = geometry.get("description") if isinstance(geometry.get("description"), dict) else {}
+    width = _number(description.get("texture_width", geometry.get("texturewidth", texture.width)))
+    height = _number(description.get("texture_height", geometry.get("textureheight", texture.height)))
+    return width or texture.width, height or texture.height
+
+
+def _uv_rects(uv, size: Vector, mirror: bool) -> Dict[str, Tuple[float, float, float, float]]:
+    if isinstance(uv, dict):
+        rects = {}
+        for name in FACE_NAMES:
+            face = uv.get(name)
+            if isinstance(face, dict) and isinstance(face.get("uv"), list):
+                rects[name] = _pair(face["uv"]) + _pair(face.get("uv_size"))
+        return rects
+    u, v = _pair(uv)
+    w, h, d = (abs(value) for value in size)
+    rects = {
+        "east": (u, v + d, d, h),
+        "north": (u + d, v + d, w, h),
+        "west": (u + d + w, v + d, d, h),
+        "south": (u + 2 * d + w, v + d, w, h),
+        "up": (u + d, v, w, d),
+        "down": (u + d + w, v + d, w, -d),
+    }
+    if mirror:
+        rects = {name: (u0 + du, v0, -du, dv) for name, (u0, v0, du, dv) in rects.items()}
+        rects["east"], rects["west"] = rects["west"], rects["east"]
+    return rects
+
+
+def _box_faces(x0: float, x1: float, y0: float, y1: float, z0: float, z1: float) -> Dict[str, tuple]:
+    # Corner, texture-right edge, texture-down edge and outward normal, as seen from outside each face.
+    down = (0.0, y0 - y1, 0.0)
+    return {
+        "north": ((x1, y1, z0), (x0 - x1, 0.0, 0.0), down, (0.0, 0.0, -1.0)),
+        "south": ((x0, y1, z1), (x1 - x0, 0.0, 0.0), down, (0.0, 0.0, 1.0)),
+        "east": ((x1, y1, z1), (0.0, 0.0, z0 - z1), down, (1.0, 0.0, 0.0)),
+        "west": ((x0, y1, z0), (0.0, 0.0, z1 - z0), down, (-1.0, 0.0, 0.0)),
+        "up": ((x1, y1, z1), (x0 - x1, 0.0, 0.0), (0.0, 0.0, z0 - z1), (0.0, 1.0, 0.0)),
+        "down": ((x1, y0, z1), (x0 - x1, 0.0, 0.0), (0.0, 0.0, z0 - z1), (0.0, -1.0, 0.0)),
+    }
+
+
+def _geometry_faces(geometry: dict) -> List[_Face]:
+    bones = [bone for bone in geometry.get("bones", []) if isinstance(bone, dict)]
+    by_name = {str(bone.get("name", "")).lower(): bone for bone in bones}
+    transforms: Dict[str, Transform] = {}
+
+    def world(bone: dict, depth: int) -> Transform:
+        name = str(bone.get("name", "")).lower()
+        if name in transforms:
+            return transforms[name]
+        parent = by_name.get(str(bone.get("parent", "")).lower())
+        # A parent cycle is cut off instead of recursing forever.
+        base = world(parent, depth + 1) if parent is not None and parent is not bone and depth < len(bones) else IDENTITY
+        local = _local(bone)
+        transforms[name] = _compose(base, local) if local else base
+        return transforms[name]
+
+    faces = []
+    for bone in bones:
+        if bone.get("neverRender"):
+            continue
+        bone_transform = world(bone, 0)
+        for cube in bone.get("cubes", []) if isinstance(bone.get("cubes"), list) else []:
+            if not isinstance(cube, dict):
+                continue
+            origin = _triple(cube.get("origin"))
+            size = _triple(cube.get("size"))
+            inflate = _number(cube.get("inflate", bone.get("inflate", 0)))
+            x0, x1 = -(origin[0] + size[0]) - inflate, -origin[0] + inflate
+            y0, y1 = origin[1] - inflate, origin[1] + size[1] + inflate
+            z0, z1 = origin[2] - inflate, origin[2] + size[2] + inflate
+            local = _local(cube)
+            matrix, offset = _compose(bone_transform, local) if local else bone_transform
+            rects = _uv_rects(cube.get("uv"), size, bool(cube.get("mirror", bone.get("mirror", False))))
+            for name, (corner, edge_s, edge_t, normal) in _box_faces(x0, x1, y0, y1, z0, z1).items():
+                if name not in rects:
+                    continue
+                moved = _apply(matrix, corner)
+                faces.append(
+                    _Face(
+                        tuple(moved[i] + offset[i] for i in range(3)),
+                        _apply(matrix, edge_s),
+                        _apply(matrix, edge_t),
+                        _apply(matrix, normal),
+                        rects[name],
+                    )
+                )
+    return faces
+
+
+def render_icon(data, texture: RGBAImage, size: int = ICON_SIZE, identifier: Optional[str] = None) -> RGBAImage:
+    geometry = _select_geometry(data, identifier)
+    texture_width, texture_height = _texture_size(geometry, texture)
+    scale_u = texture.width / texture_width
+    scale_v = texture.height / texture_height
+    view = _matmul(_rotation(ICON_PITCH, 0.0, 0.0), _rotation(0.0, ICON_YAW, 0.0))
+
+    visible = []
+    for face in _geometry_faces(geometry):
+        if _apply(view, face.normal)[2] >= 0:
+            continue
+        corner = _apply(view, face.corner)
+        edge_s = _apply(view, face.edge_s)
+        edge_t = _apply(view, face.edge_t)
+        # The camera looks down +Z, so model +X is screen left; screen Y grows downward.
+        corner = (-corner[0], -corner[1], corner[2])
+        edge_s = (-edge_s[0], -edge_s[1], edge_s[2])
+        edge_t = (-edge_t[0], -edge_t[1], edge_t[2])
+        nx, ny = face.normal[0], face.normal[1]
+        shade = 0.8 + 0.2 * ny - 0.2 * abs(nx)
+        visible.append((corner, edge_s, edge_t, face.rect, shade))
+    if not visible:
+        raise IconRenderError("model has no visible cubes")
+
+    xs = [c[0] + a * s[0] + b * t[0] for c, s, t, _, _ in visible for a in (0, 1) for b in (0, 1)]
+    ys = [c[1] + a * s[1] + b * t[1] for c, s, t, _, _ in visible for a in (0, 1) for b in (0, 1)]
+    extent = max(max(xs) - min(xs), max(ys) - min(ys), 1e-6)
+    scale = (size - 2 * ICON_MARGIN) / extent
+    shift_x = size / 2 - (max(xs) + min(xs)) / 2 * scale
+    shift_y = size / 2 - (max(ys) + min(ys)) / 2 * scale
+
+    pixels = bytearray(size * size * 4)
+    depths = [math.inf] * (size * size)
+    texels = texture.data
+    for corner, edge_s, edge_t, rect, shade in visible:
+        _raster_face(
+            pixels,
+            depths,
+            size,
+            (corner[0] * scale + shift_x, corner[1] * scale + shift_y, corner[2]),
+            (edge_s[0] * scale, edge_s[1] * scale, edge_s[2]),
+            (edge_t[0] * scale, edge_t[1] * scale, edge_t[2]),
+            rect,
+            shade,
+            texels,
+            texture.width,
+            texture.height,
+            scale_u,
+            scale_v,
+        )
+    return RGBAImage(size, size, pixels)
+
+
+def _raster_face(
+    pixels: bytearray,
+    depths: List[float],
+    size: int,
+    corner: Vector,
+    edge_s: Vector,
+    edge_t: Vector,
+    rect: Tuple[float, float, float, float],
+    shade: float,
+    texels: bytearray,
+    texture_width: int,
+    texture_height: int,
+    scale_u: float,
+    scale_v: float,
+) -> None:
+    det = edge_s[0] * edge_t[1] - edge_t[0] * edge_s[1]
+    if abs(det) < 1e-9:
+        return
+    ax, ay, az = corner
+    xs = [ax, ax + edge_s[0], ax + edge_t[0], ax + edge_s[0] + edge_t[0]]
+    ys = [ay, ay + edge_s[1], ay + edge_t[1], ay + edge_s[1] + edge_t[1]]
+    left, right = max(0, int(math.floor(min(xs)))), min(size, int(math.ceil(max(xs))))
+    top, bottom = max(0, int(math.floor(min(ys)))), min(size, int(math.ceil(max(ys))))
+    # s and t are affine in screen space, so each row steps them by a constant per pixel.
+    ds, dt = edge_t[1] / det, -edge_s[1] / det
+    u0, v0, du, dv = rect
+    u0, du = u0 * scale_u, du * scale_u
+    v0, dv = v0 * scale_v, dv * scale_v
+    max_u, max_v = texture_width - 1, texture_height - 1
+    for py in range(top, bottom):
+        qy = py + 0.5 - ay
+        qx = left + 0.5 - ax
+        s = (qx * edge_t[1] - qy * edge_t[0]) / det
+        t = (qy * edge_s[0] - qx * edge_s[1]) / det
+        start, end = _span(s, ds, left, right)
+        start, end = _span(t + dt * (start - left), dt, start, end)
+        row = py * size
+        for px in range(start, end):
+            fs = s + ds * (px - left)
+            ft = t + dt * (px - left)
+            if fs < 0 or fs >= 1 or ft < 0 or ft >= 1:
+                continue
+            depth = az + fs * edge_s[2] + ft * edge_t[2]
+            index = row + px
+            if depth >= depths[index]:
+                continue
+            tu = min(max_u, max(0, int(u0 + fs * du)))
+            tv = min(max_v, max(0, int(v0 + ft * dv)))
+            offset = (tv * texture_width + tu) * 4
+            if texels[offset + 3] < ALPHA_CUTOFF:
+                continue
+            depths[index] = depth
+            out = index * 4
+            pixels[out] = int(texels[offset] * shade)
+            pixels[out + 1] = int(texels[offset + 1] * shade)
+            pixels[out + 2] = int(texels[offset + 2] * shade)
+            pixels[out + 3] = 255
+
+
+def _span(value: float, step: float, start: int, end: int) -> Tuple[int, int]:
+    # Pixels [start, end) where value + step * (x - start) may lie in [0, 1); one pixel of slack each side.
+    if start >= end:
+        return start, start
+    if abs(step) < 1e-12:
+        return (start, end) if 0 <= value < 1 else (start, start)
+    first = (0 - value) / step
+    last = (1 - value) / step
+    low, high = min(first, last), max(first, last)
+    return max(start, start + int(math.floor(low)) - 1), min(end, start + int(math.ceil(high)) + 1)
+
+
+def render_icon_png(job: IconJob, size: int = ICON_SIZE) -> bytes:
+    data = loads(job.model, "<model>")
+    texture = decode_image(job.texture, job.texture_suffix, "<texture>")
+    return encode_png(render_icon(data, texture, size, job.identifier))
+
+
+def icon_cache_key(job: IconJob, size: int = ICON_SIZE) -> str:
+    digest = hashlib.sha1(f"{ICON_RENDER_VERSION}:{size}:{job.identifier or ''}:{job.texture_suffix}".encode("utf-8"))
+    digest.update(hashlib.sha1(job.model).digest())
+    digest.update(hashlib.sha1(job.texture).digest())
+    return digest.hexdigest()
+
+
+class IconCache:
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir or user_cache_dir() / "icons"
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.path(key).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, png: bytes) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(png)
+        tmp_path.replace(path)
+
+
+def _render_job(job: IconJob, size: int) -> IconResult:
+    try:
+        return IconResult(render_icon_png(job, size))
+    except RENDER_ERRORS as exc:
+        return IconResult(None, str(exc))
+
+
+def _render_many(jobs: List[IconJob], size: int, workers: Optional[int]) -> List[IconResult]:
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < MIN_POOL_JOBS:
+        return [_render_job(job, size) for job in jobs]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            chunk = max(1, len(jobs) // (workers * 4))
+            return list(pool.map(_render_job, jobs, [size] * len(jobs), chunksize=chunk))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # Some sandboxes forbid child processes; rendering in-process is only slower.
+        return [_render_job(job, size) for job in jobs]
+
+
+def render_icons(
+    jobs: Sequence[IconJob],
+    size: int = ICON_SIZE,
+    cache: Optional[IconCache] = None,
+    workers: Optional[int] = None,
+) -> List[IconResult]:
+    cache = cache if cache is not None else IconCache()
+    keys = [icon_cache_key(job, size) for job in jobs]
+    results: List[Optional[IconResult]] = []
+    todo: Dict[str, IconJob] = {}
+    for job, key in zip(jobs, keys):
+        png = cache.get(key)
+        results.append(IconResult(png, cached=True) if png is not None else None)
+        if png is None:
+            todo.setdefault(key, job)
+    rendered = dict(zip(todo, _render_many(list(todo.values()), size, workers)))
+    for key, result in rendered.items():
+        if result.png is not None:
+            try:
+                cache.put(key, result.png)
+            except OSError:
+                pass
+    return [result if result is not None else rendered[key] for result, key in zip(results, keys)]
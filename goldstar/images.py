@@ -0,0 +1,140 @@
+﻿from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import tkinter as tk
+
+try:
+    from PIL import Image, ImageTk
+    PIL_AVAILABLE = True
+except Exception:
+    PIL_AVAILABLE = False
+
+from .pixels import RGBAImage, read_image, write_png
+
+
+def fit_size(width: int, height: int, max_size: int) -> Tuple[int, int]:
+    scale = max(width / max_size, height / max_size, 1)
+    return max(1, int(round(width / scale))), max(1, int(round(height / scale)))
+
+
+def box_sample_points(x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]]:
+    return [
+        (x0, y0),
+        (x1 - 1, y0),
+        (x0, y1 - 1),
+        (x1 - 1, y1 - 1),
+        ((x0 + x1) // 2, (y0 + y1) // 2),
+    ]
+
+
+def _downscale_boxes(width: int, height: int, new_width: int, new_height: int, sample: Callable) -> None:
+    step_x = width / new_width
+    step_y = height / new_height
+    for y in range(new_height):
+        y0 = int(y * step_y)
+        y1 = max(y0 + 1, int((y + 1) * step_y))
+        for x in range(new_width):
+            x0 = int(x * step_x)
+            x1 = max(x0 + 1, int((x + 1) * step_x))
+            sample(x, y, x0, y0, x1, y1)
+
+
+def load_scaled_photo(path: Path, max_size: int) -> Optional[tk.PhotoImage]:
+    if not path.is_file():
+        return None
+    if PIL_AVAILABLE:
+        image = Image.open(path).convert("RGBA")
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        return ImageTk.PhotoImage(image)
+    base = tk.PhotoImage(file=str(path))
+    return downscale_photoimage(base, max_size)
+
+
+def downscale_photoimage(image: tk.PhotoImage, max_size: int) -> tk.PhotoImage:
+    width = image.width()
+    height = image.height()
+    new_width, new_height = fit_size(width, height, max_size)
+    if new_width == width and new_height == height:
+        return image
+    result = tk.PhotoImage(width=new_width, height=new_height)
+
+    def sample(x: int, y: int, x0: int, y0: int, x1: int, y1: int) -> None:
+        result.put(_sample_box_color(image, x0, y0, x1, y1), (x, y))
+
+    _downscale_boxes(width, height, new_width, new_height, sample)
+    return result
+
+
+def _sample_box_color(image: tk.PhotoImage, x0: int, y0: int, x1: int, y1: int) -> str:
+    max_x = image.width() - 1
+    max_y = image.height() - 1
+    r_total = 0
+    g_total = 0
+    b_total = 0
+    count = 0
+    for sx, sy in box_sample_points(x0, y0, x1, y1):
+        sx = min(max(sx, 0), max_x)
+        sy = min(max(sy, 0), max_y)
+        color = image.get(sx, sy)
+        r, g, b = _color_to_rgb(color)
+        r_total += r
+        g_total += g
+        b_total += b
+        count += 1
+    r = max(0, min(255, r_total // count))
+    g = max(0, min(255, g_total // count))
+    b = max(0, min(255, b_total // count))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _color_to_rgb(color) -> tuple:
+    if isinstance(color, tuple) and len(color) >= 3:
+        return color[0], color[1], color[2]
+    if isinstance(color, str):
+        if color.startswith("#") and len(color) == 7:
+            return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+        if color.startswith("#") and len(color) == 13:
+            return (
+                int(color[1:5], 16) // 257,
+                int(color[5:9], 16) // 257,
+                int(color[9:13], 16) // 257,
+            )
+    return 0, 0, 0
+
+
+def downscale_rgba(image: RGBAImage, max_size: int) -> RGBAImage:
+    new_width, new_height = fit_size(image.width, image.height, max_size)
+    if new_width == image.width and new_height == image.height:
+        return image
+    data = image.data
+    width = image.width
+    max_x = image.width - 1
+    max_y = image.height - 1
+    result = bytearray(new_width * new_height * 4)
+
+    def sample(x: int, y: int, x0: int, y0: int, x1: int, y1: int) -> None:
+        totals = [0, 0, 0, 0]
+        points = box_sample_points(x0, y0, x1, y1)
+        for sx, sy in points:
+            offset = (min(max(sy, 0), max_y) * width + min(max(sx, 0), max_x)) * 4
+            for channel in range(4):
+                totals[channel] += data[offset + channel]
+        offset = (y * new_width + x) * 4
+        result[offset : offset + 4] = bytes(total // len(points) for total in totals)
+
+    _downscale_boxes(image.width, image.height, new_width, new_height, sample)
+    return RGBAImage(new_width, new_height, result)
+
+
+def write_scaled_png(source: Path, destination: Path, max_size: int) -> None:
+    # Thread-safe: never touches Tk, so it can run on a worker thread.
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(destination.name + ".tmp")
+    if PIL_AVAILABLE:
+        with Image.open(source) as opened:
+            image = opened.convert("RGBA")
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        image.save(tmp_path, format="PNG")
+    else:
+        write_png(tmp_path, downscale_rgba(read_image(source), max_size))
+    tmp_path.replace(destination)
@@ -0,0 +1,192 @@
+﻿import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+PARSE_CACHE_SIZE = 4096
+UTF8_BOM = b"\xef\xbb\xbf"
+
+_COMMENT_START = re.compile(r"//|/\*")
+_LINE_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|//.*|/\*.*?\*/|/\*.*')
+_NOT_NEWLINE = re.compile(r"[^\n]")
+
+
+class JsonParseError(ValueError):
+    def __init__(self, source: str, line: int, column: int, message: str) -> None:
+        super().__init__(f"{source}:{line}:{column}: {message}")
+        self.source = source
+        self.line = line
+        self.column = column
+        self.message = message
+
+
+def backend_name() -> str:
+    return "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def strip_comments(text: str) -> str:
+    # Comments become spaces (newlines kept) so error lines and columns still match the file.
+    # JSON strings cannot span lines, so only lines holding a "//" or "/*" are tokenized.
+    pieces = []
+    position = 0
+    while True:
+        match = _COMMENT_START.search(text, position)
+        if match is None:
+            break
+        line_start = max(text.rfind("\n", 0, match.start()) + 1, position)
+        line_end = text.find("\n", match.start())
+        if line_end < 0:
+            line_end = len(text)
+        stripped, in_block = _strip_line(text[line_start:line_end])
+        pieces.append(text[position:line_start])
+        pieces.append(stripped)
+        position = line_end
+        if in_block:
+            end = text.find("*/", line_end)
+            stop = len(text) if end < 0 else end + 2
+            pieces.append(_NOT_NEWLINE.sub(" ", text[line_end:stop]))
+            position = stop
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def _strip_line(line: str) -> Tuple[str, bool]:
+    unterminated = False
+
+    def replace(match: "re.Match[str]") -> str:
+        nonlocal unterminated
+        token = match.group(0)
+        if token.startswith('"'):
+            return token
+        if token.startswith("/*") and (len(token) < 4 or not token.endswith("*/")):
+            unterminated = True
+        return " " * len(token)
+
+    return _LINE_TOKEN.sub(replace, line), unterminated
+
+
+def loads(data: Union[str, bytes], source: str = "<string>") -> Any:
+    if isinstance(data, bytes) and data.startswith(UTF8_BOM):
+        data = data[len(UTF8_BOM):]
+    elif isinstance(data, str) and data.startswith("\ufeff"):
+        data = data[1:]
+    try:
+        return _parse(data)
+    except json.JSONDecodeError as exc:
+        first_error = exc
+    except UnicodeDecodeError as exc:
+        raise JsonParseError(source, 1, 1, f"invalid UTF-8 ({exc.reason})") from None
+
+    text = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+    if "/" in text:
+        try:
+            return _parse(strip_comments(text))
+        except json.JSONDecodeError as exc:
+            first_error = exc
+    raise _parse_error(source, first_error) from None
+
+
+def load(path: Path, cached: bool = False) -> Any:
+    # Cached results are shared between callers and must be treated as read-only.
+    if not cached:
+        return loads(path.read_bytes(), str(path))
+    return _parse_cache.get(path)
+
+
+def load_or_default(path: Path, default: Optional[dict] = None) -> Any:
+    try:
+        return load(path)
+    except (OSError, JsonParseError):
+        return {} if default is None else default
+
+
+def dumps(data: Any, indent: Optional[int] = 2, sort_keys: bool = False) -> str:
+    if ORJSON_AVAILABLE and indent in (None, 2):
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    separators = None if indent is not None else (",", ":")
+    return json.dumps(data, indent=indent, ensure_ascii=False, sort_keys=sort_keys, separators=separators)
+
+
+def dump(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    text = dumps(data, indent)
+    path.write_text(text + "\n" if indent is not None else text, encoding="utf-8")
+
+
+def dump_atomic(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    dump(tmp_path, data, indent)
+    os.replace(tmp_path, path)
+
+
+def clear_cache() -> None:
+    _parse_cache.clear()
+
+
+def cache_info() -> Dict[str, int]:
+    return {"entries": len(_parse_cache), "hits": _parse_cache.hits, "misses": _parse_cache.misses}
+
+
+def _parse(data: Union[str, bytes]) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _parse_error(source: str, error: json.JSONDecodeError) -> JsonParseError:
+    line = getattr(error, "lineno", None) or 1
+    column = getattr(error, "colno", None) or 1
+    return JsonParseError(source, line, column, getattr(error, "msg", None) or str(error))
+
+
+class _ParseCache:
+    def __init__(self, max_entries: int = PARSE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path) -> Any:
+        key = str(path)
+        stat = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+        data = loads(path.read_bytes(), key)
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.misses += 1
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_parse_cache = _ParseCache()
@@ -0,0 +1,218 @@
+﻿import heapq
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .file_plan import FilePlan, PlanIssue
+from .i18n import LANGUAGE_LABELS
+from .jsonio import JsonParseError, dump, load
+
+TEXTS_DIR_NAME = "texts"
+LANG_SUFFIX = ".lang"
+LANG_FILE_CODES = {"ko": "ko_KR", "en": "en_US"}
+SPAWN_SUFFIXES = {"ko_KR": "스폰", "en_US": "Spawn"}
+DEFAULT_CHUNK_LINES = 20_000
+COPY_CHUNK_SIZE = 1024 * 1024
+
+LangEntry = Tuple[str, str]
+
+
+def default_languages() -> List[str]:
+    return [LANG_FILE_CODES.get(code, code) for code in LANGUAGE_LABELS]
+
+
+def lang_path(pack_dir: Path, language: str) -> Path:
+    return pack_dir / TEXTS_DIR_NAME / f"{language}{LANG_SUFFIX}"
+
+
+def pack_languages(pack_dirs: Iterable[Path]) -> List[str]:
+    languages = default_languages()
+    for pack_dir in pack_dirs:
+        try:
+            with os.scandir(pack_dir / TEXTS_DIR_NAME) as it:
+                found = [item.name[: -len(LANG_SUFFIX)] for item in it if item.name.endswith(LANG_SUFFIX)]
+        except OSError:
+            continue
+        for language in sorted(found):
+            if language not in languages:
+                languages.append(language)
+    return languages
+
+
+def display_name(name: str) -> str:
+    return " ".join(part.capitalize() for part in name.split("_") if part) or name
+
+
+def entity_lang_entries(namespace: str, name: str, language: str) -> List[LangEntry]:
+    title = display_name(name)
+    suffix = SPAWN_SUFFIXES.get(language, SPAWN_SUFFIXES["en_US"])
+    return [
+        (f"entity.{namespace}:{name}.name", title),
+        (f"item.{namespace}:{name}_spawn.name", f"{title} {suffix}"),
+    ]
+
+
+def parse_lang_line(line: str) -> Optional[LangEntry]:
+    key, separator, value = line.partition("=")
+    if not separator:
+        return None
+    key = key.strip()
+    if not key or key.startswith("#"):
+        return None
+    return key, value.rstrip("\r\n")
+
+
+def iter_lang_entries(path: Path) -> Iterator[LangEntry]:
+    with path.open("r", encoding="utf-8-sig", errors="replace") as handle:
+        for line in handle:
+            entry = parse_lang_line(line)
+            if entry is not None:
+                yield entry
+
+
+def _sorted_runs(
+    entries: Iterable[LangEntry], rank: int, chunk_lines: int, spill_dir: Optional[str]
+) -> List[Iterator[Tuple[str, int, int, str]]]:
+    runs = []
+    chunk: List[Tuple[str, int, int, str]] = []
+    for order, (key, value) in enumerate(entries):
+        # Later lines of the same file override earlier ones in game, so they sort first.
+        chunk.append((key, rank, -order, value))
+        if len(chunk) >= chunk_lines:
+            runs.append(_spill(sorted(chunk), spill_dir))
+            chunk = []
+    if chunk:
+        runs.append(iter(sorted(chunk)))
+    return runs
+
+
+def _spill(chunk: List[Tuple[str, int, int, str]], spill_dir: Optional[str]) -> Iterator[Tuple[str, int, int, str]]:
+    handle = tempfile.TemporaryFile("w+", encoding="utf-8", newline="\n", dir=spill_dir)
+    handle.writelines(f"{key}={rank}\t{order}\t{value}\n" for key, rank, order, value in chunk)
+    handle.seek(0)
+    return _read_spill(handle)
+
+
+def _read_spill(handle) -> Iterator[Tuple[str, int, int, str]]:
+    with handle:
+        for line in handle:
+            key, _, rest = line.partition("=")
+            rank, order, value = rest[:-1].split("\t", 2)
+            yield key, int(rank), int(order), value
+
+
+def merge_lang_entries(
+    sources: Sequence[Iterable[LangEntry]],
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    spill_dir: Optional[str] = None,
+) -> Iterator[LangEntry]:
+    # External merge sort: each source becomes sorted runs (spilled to disk past chunk_lines),
+    # then one heapq.merge streams them. For duplicate keys the earliest source wins.
+    streams = []
+    for rank, source in enumerate(sources):
+        streams.extend(_sorted_runs(source, rank, chunk_lines, spill_dir))
+    previous = None
+    for key, _, _, value in heapq.merge(*streams):
+        if key == previous:
+            continue
+        previous = key
+        yield key, value
+
+
+def format_lang_lines(entries: Iterable[LangEntry]) -> Iterator[str]:
+    for key, value in entries:
+        yield f"{key}={value}\n"
+
+
+def merge_lang_files(
+    sources: Sequence[Path],
+    destination: Path,
+    extra: Optional[Iterable[LangEntry]] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> int:
+    streams: List[Iterable[LangEntry]] = [iter_lang_entries(path) for path in sources if path.is_file()]
+    if extra is not None:
+        streams.append(extra)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+    count = 0
+    with tmp_path.open("w", encoding="utf-8", newline="\n") as handle:
+        for line in format_lang_lines(merge_lang_entries(streams, chunk_lines, str(destination.parent))):
+            handle.write(line)
+            count += 1
+    os.replace(tmp_path, destination)
+    return count
+
+
+def _missing_lang_entries(path: Path, entries: Iterable[LangEntry]) -> List[LangEntry]:
+    wanted = {}
+    for key, value in entries:
+        wanted.setdefault(key, value)
+    if path.is_file():
+        for key, _ in iter_lang_entries(path):
+            wanted.pop(key, None)
+    return list(wanted.items())
+
+
+def _appended_chunks(path: Path, entries: List[LangEntry]) -> Callable[[], Iterator[bytes]]:
+    def chunks() -> Iterator[bytes]:
+        last = b"\n"
+        if path.is_file():
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(COPY_CHUNK_SIZE), b""):
+                    last = chunk[-1:]
+                    yield chunk
+        if last != b"\n":
+            yield b"\n"
+        yield "".join(format_lang_lines(entries)).encode("utf-8")
+
+    return chunks
+
+
+def plan_lang_entries(plan: FilePlan, pack_dir: Path, entries_for: Callable[[str], List[LangEntry]]) -> None:
+    # Only keys the file lacks are appended; existing lines, comments and order stay as they are.
+    languages = pack_languages([pack_dir])
+    for language in languages:
+        path = lang_path(pack_dir, language)
+        missing = _missing_lang_entries(path, entries_for(language))
+        if missing:
+            plan.stream(path, _appended_chunks(path, missing), overwrite=True)
+
+    try:
+        listed = _listed_languages(pack_dir, languages)
+    except JsonParseError as exc:
+        plan.issues.append(PlanIssue("invalid_json", {"error": str(exc)}))
+        return
+    if listed is not None:
+        plan.write_json(languages_json_path(pack_dir), listed, overwrite=True)
+
+
+def update_languages_json(pack_dir: Path, languages: Iterable[str]) -> bool:
+    listed = _listed_languages(pack_dir, languages)
+    if listed is None:
+        return False
+    dump(languages_json_path(pack_dir), listed)
+    return True
+
+
+def languages_json_path(pack_dir: Path) -> Path:
+    return pack_dir / TEXTS_DIR_NAME / "languages.json"
+
+
+def _listed_languages(pack_dir: Path, languages: Iterable[str]) -> Optional[List[str]]:
+    path = languages_json_path(pack_dir)
+    listed = load(path) if path.is_file() else []
+    if not isinstance(listed, list):
+        listed = []
+    missing = [language for language in languages if language not in listed]
+    return listed + missing if missing else None
+
+
+def normalize_pack_lang(pack_dir: Path, chunk_lines: int = DEFAULT_CHUNK_LINES) -> List[Tuple[Path, int]]:
+    results = []
+    for language in pack_languages([pack_dir]):
+        path = lang_path(pack_dir, language)
+        if path.is_file():
+            results.append((path, merge_lang_files([path], path, chunk_lines=chunk_lines)))
+    return results
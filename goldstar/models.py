@@ -1,19 +1,252 @@
-﻿from dataclasses import dataclass, field
+﻿import bisect
+from array import array
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
-@dataclass
-class PackMetadata:
-    name: str
-    path: Path
-    default_files: List[Path] = field(default_factory=list)
-    item_texture: Optional[Path] = None
-    default_icons: List[Path] = field(default_factory=list)
+def _is_default_icon(rel_path: str) -> bool:
+    return (
+        rel_path.startswith("textures/items/default_")
+        and rel_path.count("/") == 2
+        and rel_path.endswith(".png")
+    )
+
+
+class StringTable:
+    __slots__ = ("_strings", "_ids")
+
+    def __init__(self) -> None:
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def intern(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._ids[value] = string_id
+        return string_id
+
+
+class PackFile:
+    __slots__ = ("rel_path", "size", "mtime_ns")
+
+    def __init__(self, rel_path: str, size: int, mtime_ns: int) -> None:
+        self.rel_path = rel_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def name(self) -> str:
+        return self.rel_path.rsplit("/", 1)[-1]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackFile):
+            return NotImplemented
+        return (self.rel_path, self.size, self.mtime_ns) == (other.rel_path, other.size, other.mtime_ns)
+
+    def __repr__(self) -> str:
+        return f"PackFile(rel_path={self.rel_path!r}, size={self.size}, mtime_ns={self.mtime_ns})"
+
+
+class _PackFileView:
+    __slots__ = ("_index",)
+
+    def __init__(self, index: "PackIndex") -> None:
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index._sizes)
+
+    def __getitem__(self, row: int) -> PackFile:
+        index = self._index
+        if row < 0:
+            row += len(index._sizes)
+        if not 0 <= row < len(index._sizes):
+            raise IndexError(row)
+        return PackFile(index.rel_path(row), index._sizes[row], index._mtimes[row])
+
+    def __iter__(self) -> Iterator[PackFile]:
+        index = self._index
+        dirs = index._dirs
+        names = index._names
+        offsets = index._name_offsets
+        for row, (dir_id, size, mtime_ns) in enumerate(zip(index._row_dirs, index._sizes, index._mtimes)):
+            rel_dir = dirs[dir_id]
+            file_name = names[offsets[row] : offsets[row + 1]]
+            yield PackFile(f"{rel_dir}/{file_name}" if rel_dir else file_name, size, mtime_ns)
+
+
+class _PackRowsView:
+    # The files of one directory; PackFile objects are built only for the rows that are read.
+    __slots__ = ("_index", "_rows")
+
+    def __init__(self, index: "PackIndex", rows: array) -> None:
+        self._index = index
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, key):
+        files = self._index.files
+        if isinstance(key, slice):
+            return [files[row] for row in self._rows[key]]
+        return files[self._rows[key]]
+
+    def __iter__(self) -> Iterator[PackFile]:
+        files = self._index.files
+        for row in self._rows:
+            yield files[row]
+
+
+class PackIndex:
+    # Directory paths share a StringTable, file names are packed into one string
+    # with an offset column, and sizes/mtimes live in typed arrays. Rows are kept
+    # sorted by relative path so lookups can bisect.
+    __slots__ = (
+        "name",
+        "path",
+        "item_texture",
+        "_dirs",
+        "_row_dirs",
+        "_names",
+        "_name_offsets",
+        "_sizes",
+        "_mtimes",
+        "_default_rows",
+        "_icon_rows",
+        "_directories",
+    )
+
+    def __init__(self, name: str, path: Path, item_texture: Optional[Path] = None) -> None:
+        self.name = name
+        self.path = path
+        self.item_texture = item_texture
+        self._dirs = StringTable()
+        self._row_dirs = array("I")
+        self._names = ""
+        self._name_offsets = array("I", [0])
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._default_rows = array("I")
+        self._icon_rows = array("I")
+        self._directories: Optional[Dict[str, Tuple[List[str], array]]] = None
+
+    @classmethod
+    def build(
+        cls,
+        name: str,
+        path: Path,
+        rows: Iterable[Tuple[str, int, int]],
+        item_texture: Optional[Path] = None,
+    ) -> "PackIndex":
+        index = cls(name, path, item_texture)
+        ordered = sorted(rows, key=lambda row: row[0])
+        names = []
+        offset = 0
+        for row, (rel_path, size, mtime_ns) in enumerate(ordered):
+            rel_dir, _, file_name = rel_path.rpartition("/")
+            index._row_dirs.append(index._dirs.intern(rel_dir))
+            names.append(file_name)
+            offset += len(file_name)
+            index._name_offsets.append(offset)
+            index._sizes.append(size)
+            index._mtimes.append(mtime_ns)
+            if file_name.startswith("default_"):
+                index._default_rows.append(row)
+                if _is_default_icon(rel_path):
+                    index._icon_rows.append(row)
+        index._names = "".join(names)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def rel_path(self, row: int) -> str:
+        rel_dir = self._dirs[self._row_dirs[row]]
+        file_name = self._names[self._name_offsets[row] : self._name_offsets[row + 1]]
+        return f"{rel_dir}/{file_name}" if rel_dir else file_name
+
+    @property
+    def files(self) -> _PackFileView:
+        return _PackFileView(self)
+
+    @property
+    def default_files(self) -> List[Path]:
+        return [self.path / self.rel_path(row) for row in self._default_rows]
+
+    @property
+    def default_icons(self) -> List[Path]:
+        return [self.path / self.rel_path(row) for row in self._icon_rows]
+
+    def find(self, rel_path: str) -> Optional[PackFile]:
+        row = bisect.bisect_left(_RelPathKeys(self), rel_path)
+        if row < len(self._sizes) and self.rel_path(row) == rel_path:
+            return self.files[row]
+        return None
+
+    def __contains__(self, rel_path: str) -> bool:
+        return self.find(rel_path) is not None
+
+    def children(self, rel_dir: str = "") -> Tuple[List[str], _PackRowsView]:
+        if self._directories is None:
+            self._directories = self._build_directories()
+        subdirs, rows = self._directories.get(rel_dir.strip("/"), ([], array("I")))
+        return list(subdirs), _PackRowsView(self, rows)
+
+    def _build_directories(self) -> Dict[str, Tuple[List[str], array]]:
+        subdir_sets: Dict[str, Set[str]] = {"": set()}
+        for dir_id in range(len(self._dirs)):
+            missing = []
+            child = self._dirs[dir_id]
+            while child not in subdir_sets:
+                missing.append(child)
+                child = child.rpartition("/")[0]
+            for child in reversed(missing):
+                ancestor, _, dir_name = child.rpartition("/")
+                subdir_sets[ancestor].add(dir_name)
+                subdir_sets[child] = set()
+        directories = {rel_dir: (sorted(subdirs), array("I")) for rel_dir, subdirs in subdir_sets.items()}
+        for row, dir_id in enumerate(self._row_dirs):
+            directories[self._dirs[dir_id]][1].append(row)
+        return directories
+
+    def files_under(self, rel_dir: str) -> Iterator[PackFile]:
+        prefix = f"{rel_dir.strip('/')}/" if rel_dir.strip("/") else ""
+        files = self.files
+        low = bisect.bisect_left(_RelPathKeys(self), prefix)
+        for row in range(low, len(self._sizes)):
+            rel_path = self.rel_path(row)
+            if not rel_path.startswith(prefix):
+                break
+            yield files[row]
+
+    def total_size(self) -> int:
+        return sum(self._sizes)
 
     def summary_line(self) -> str:
         item_texture_flag = "yes" if self.item_texture else "no"
         return (
-            f"{self.name} | defaults: {len(self.default_files)} | "
-            f"item_texture: {item_texture_flag} | icons: {len(self.default_icons)}"
-        )
\ No newline at end of file
+            f"{self.name} | defaults: {len(self._default_rows)} | "
+            f"item_texture: {item_texture_flag} | icons: {len(self._icon_rows)}"
+        )
+
+
+class _RelPathKeys:
+    __slots__ = ("_index",)
+
+    def __init__(self, index: PackIndex) -> None:
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, row: int) -> str:
+        return self._index.rel_path(row)
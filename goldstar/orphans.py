@@ -0,0 +1,164 @@
+﻿import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_plan import FilePlan, PlanIssue
+from .jsonio import JsonParseError, load
+from .references import Occurrence, ReferenceIndex
+
+QUARANTINE_DIR_NAME = ".goldstar_quarantine"
+ATLAS_PATH = "textures/item_texture.json"
+ASSET_DIRS = (
+    "textures/entity/",
+    "textures/items/",
+    "models/",
+    "animations/",
+    "animation_controllers/",
+    "render_controllers/",
+)
+ASSET_SUFFIXES = (".png", ".tga", ".json")
+TEXTURE_SUFFIXES = (".png", ".tga")
+DEFINITION_SECTIONS = ("animations", "animation_controllers", "render_controllers")
+
+FileKey = Tuple[str, str]
+
+
+@dataclass
+class OrphanReport:
+    files: List[Tuple[str, str, int]] = field(default_factory=list)
+    entries: List[Tuple[str, str]] = field(default_factory=list)
+    roots: int = 0
+    reachable: int = 0
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, _, size in self.files)
+
+    def pack_sizes(self) -> Dict[str, Tuple[int, int]]:
+        sizes: Dict[str, Tuple[int, int]] = {}
+        for pack, _, size in self.files:
+            count, total = sizes.get(pack, (0, 0))
+            sizes[pack] = (count + 1, total + size)
+        return sizes
+
+
+def _asset_path(rel_path: str) -> Optional[str]:
+    # Subpack copies stand in for the main pack file they were made from.
+    if rel_path.startswith("subpacks/"):
+        parts = rel_path.split("/", 2)
+        if len(parts) < 3:
+            return None
+        rel_path = parts[2]
+    if not rel_path.startswith(ASSET_DIRS) or not rel_path.lower().endswith(ASSET_SUFFIXES):
+        return None
+    # Templates are copied from, never referenced.
+    if rel_path.rsplit("/", 1)[-1].startswith("default_"):
+        return None
+    return rel_path
+
+
+def _texture_name(value: str) -> str:
+    return value[:-4] if value.lower().endswith(TEXTURE_SUFFIXES) else value
+
+
+def _defined_names(occurrences: List[Occurrence]) -> Iterable[str]:
+    for string, path, is_key in occurrences:
+        if is_key and len(path) == 2 and path[0] in DEFINITION_SECTIONS:
+            yield string
+        elif is_key and len(path) == 1 and string.startswith("geometry."):
+            # Legacy models name their parent after a colon: "geometry.child:geometry.parent".
+            yield string.split(":", 1)[0]
+        elif not is_key and path[:1] == ("minecraft:geometry",) and path[2:] == ("description", "identifier"):
+            yield string
+
+
+def find_orphans(index: ReferenceIndex) -> OrphanReport:
+    report = OrphanReport()
+    contents: Dict[FileKey, List[Occurrence]] = {}
+    candidates: Dict[FileKey, int] = {}
+    targets: Dict[str, List[FileKey]] = {}
+    atlas: Dict[str, List[Tuple[str, str]]] = {}
+    pending = deque()
+
+    for pack, rel_path, size, occurrences in index.records():
+        key = (pack, rel_path)
+        if rel_path == ATLAS_PATH:
+            # Every atlas entry is a root: packs outside the index (other behavior packs, the game) may use any of them.
+            for string, path, is_key in occurrences:
+                if len(path) >= 2 and path[0] == "texture_data":
+                    entry = (pack, path[1])
+                    if is_key and len(path) == 2:
+                        atlas.setdefault(string, []).append(entry)
+                    elif not is_key:
+                        pending.append(string)
+            continue
+        asset = _asset_path(rel_path)
+        if asset is None:
+            report.roots += 1
+            pending.extend(string for string, _, _ in occurrences)
+            continue
+        candidates[key] = size
+        contents[key] = occurrences
+        if asset.lower().endswith(TEXTURE_SUFFIXES):
+            targets.setdefault(_texture_name(asset), []).append(key)
+        else:
+            for name in set(_defined_names(occurrences)):
+                targets.setdefault(name, []).append(key)
+
+    report.roots += sum(len(entries) for entries in atlas.values())
+    # Breadth-first over strings: a reached file adds the strings it contains.
+    reached: Set[FileKey] = set()
+    reached_entries: Set[Tuple[str, str]] = set()
+    seen: Set[str] = set()
+    while pending:
+        string = pending.popleft()
+        if string in seen:
+            continue
+        seen.add(string)
+        for key in targets.get(_texture_name(string), ()):
+            if key not in reached:
+                reached.add(key)
+                pending.extend(value for value, _, _ in contents[key])
+        # Entries no indexed file names are only reported; the entry itself keeps its texture alive.
+        reached_entries.update(atlas.get(string, ()))
+
+    report.reachable = len(reached)
+    report.files = sorted((*key, size) for key, size in candidates.items() if key not in reached)
+    report.entries = sorted(entry for entries in atlas.values() for entry in entries if entry not in reached_entries)
+    return report
+
+
+def quarantine_dir(base: Path) -> Path:
+    return base / QUARANTINE_DIR_NAME / time.strftime("%Y%m%d-%H%M%S")
+
+
+def plan_quarantine(
+    plan: FilePlan, base: Path, report: OrphanReport, destination: Path, prune_entries: bool = False
+) -> List[Path]:
+    for pack, rel_path, _ in report.files:
+        plan.copy(base / pack / rel_path, destination / pack / rel_path)
+        plan.delete(base / pack / rel_path)
+    packs = {base / pack for pack, _, _ in report.files}
+    if not prune_entries:
+        return sorted(packs)
+
+    by_pack: Dict[str, List[str]] = {}
+    for pack, name in report.entries:
+        by_pack.setdefault(pack, []).append(name)
+    for pack, names in sorted(by_pack.items()):
+        path = base / pack / ATLAS_PATH
+        try:
+            data = load(path)
+        except (OSError, JsonParseError) as exc:
+            plan.issues.append(PlanIssue("invalid_json", {"error": str(exc)}))
+            continue
+        texture_data = data.get("texture_data") if isinstance(data, dict) else None
+        if not isinstance(texture_data, dict):
+            continue
+        # Removed entries are kept next to the quarantined files so they can be pasted back.
+        removed = {name: texture_data.pop(name) for name in names if name in texture_data}
+        plan.write_json(path, data, overwrite=True)
+        plan.write_json(destination / pack / f"{ATLAS_PATH[:-len('.json')]}.removed.json", {"texture_data": removed})
+    return sorted(packs | {base / pack for pack, _ in report.entries})
@@ -1,11 +1,13 @@
 ﻿import base64
-import json
 import shutil
 import uuid
 from pathlib import Path
 from typing import Iterable, List, Optional
 
 from .config import EXPECTED_PACKS
+from .file_plan import FilePlan, PlanIssue
+from .jsonio import JsonParseError, dump, load
+from .snapshots import take_snapshot
 
 PACK_ICON_PNG_BASE64 = (
     "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGNgYAAAAAMA"
@@ -44,6 +46,9 @@ def find_template_pack(root_path: Path) -> Optional[Path]:
 
 
 def create_missing_packs(root_path: Path, missing_names: Iterable[str]) -> List[Path]:
+    missing_names = list(missing_names)
+    if missing_names:
+        take_snapshot(root_path, [root_path / name for name in missing_names], "create_missing_packs")
     template_pack = find_template_pack(root_path)
     created = []
     for name in missing_names:
@@ -53,22 +58,20 @@ def create_missing_packs(root_path: Path, missing_names: Iterable[str]) -> List[
 
 def create_pack(root_path: Path, name: str, template_pack: Optional[Path]) -> Path:
     pack_dir = root_path / name
-    pack_dir.mkdir(parents=True, exist_ok=True)
 
     template_manifest = template_pack / "manifest.json" if template_pack else None
     template_icon = template_pack / "pack_icon.png" if template_pack else None
 
-    manifest_path = pack_dir / "manifest.json"
-    icon_path = pack_dir / "pack_icon.png"
-
     if template_manifest and template_manifest.is_file():
-        shutil.copy2(template_manifest, manifest_path)
-        manifest = _load_manifest(manifest_path)
-        manifest = _normalize_manifest(manifest, name)
-        _write_manifest(manifest_path, manifest)
+        # Parsed before the pack folder exists, so a broken template stops here with its file and line.
+        manifest = _normalize_manifest(load(template_manifest), name)
     else:
         manifest = _create_manifest(name)
-        _write_manifest(manifest_path, manifest)
+
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = pack_dir / "manifest.json"
+    icon_path = pack_dir / "pack_icon.png"
+    _write_manifest(manifest_path, manifest)
 
     if template_icon and template_icon.is_file():
         shutil.copy2(template_icon, icon_path)
@@ -78,18 +81,40 @@ def create_pack(root_path: Path, name: str, template_pack: Optional[Path]) -> Pa
     return pack_dir
 
 
-def _load_manifest(path: Path) -> dict:
+def plan_manifest_subpacks(plan: FilePlan, pack_dir: Path, entries: List[dict], drop: Iterable[str] = ()) -> bool:
+    path = pack_dir / "manifest.json"
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {}
+        manifest = load(path)
+    except (JsonParseError, OSError) as exc:
+        # Never replace an unreadable manifest with one that only lists subpacks.
+        plan.issues.append(PlanIssue("invalid_json", {"error": str(exc)}))
+        return False
+    if not isinstance(manifest, dict):
+        plan.issues.append(PlanIssue("invalid_json", {"error": f"{path}: manifest is not an object"}))
+        return False
+
+    current = manifest.get("subpacks")
+    folders = {entry["folder_name"] for entry in entries} | set(drop)
+    kept = [
+        entry
+        for entry in (current if isinstance(current, list) else [])
+        if isinstance(entry, dict) and entry.get("folder_name") not in folders
+    ]
+    subpacks = sorted(kept + list(entries), key=_memory_tier)
+    if subpacks == current:
+        return False
+    manifest["subpacks"] = subpacks
+    plan.write_json(path, manifest, overwrite=True)
+    return True
+
+
+def _memory_tier(entry: dict) -> int:
+    tier = entry.get("memory_tier", 0)
+    return tier if isinstance(tier, int) else 0
 
 
 def _write_manifest(path: Path, manifest: dict) -> None:
-    path.write_text(
-        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
+    dump(path, manifest)
 
 
 def _normalize_manifest(manifest: dict, name: str) -> dict:
@@ -1,4 +1,6 @@
-﻿from pathlib import Path
+﻿import os
+import sys
+from pathlib import Path
 
 from .config import DEFAULT_ROOT_WINDOWS
 
@@ -24,4 +26,20 @@ def normalize_root(path_str: str) -> Path:
 def default_root() -> Path:
     if DEFAULT_ROOT_WINDOWS.is_dir():
         return DEFAULT_ROOT_WINDOWS.resolve()
-    return detect_root(Path.cwd())
\ No newline at end of file
+    return detect_root(Path.cwd())
+
+
+def user_cache_dir() -> Path:
+    override = os.environ.get("GOLDSTAR_CACHE_DIR")
+    if override:
+        base = Path(override).expanduser()
+    elif sys.platform.startswith("win"):
+        local = os.environ.get("LOCALAPPDATA")
+        base = (Path(local) if local else Path.home() / "AppData" / "Local") / "GoldStar" / "cache"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches" / "GoldStar"
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = (Path(xdg) if xdg else Path.home() / ".cache") / "goldstar"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
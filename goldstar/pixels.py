@@ -0,0 +1,271 @@
+﻿import struct
+import zlib
+from operator import add, mul
+from pathlib import Path
+from typing import Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class ImageDecodeError(ValueError):
+    pass
+
+
+class RGBAImage:
+    __slots__ = ("width", "height", "data")
+
+    def __init__(self, width: int, height: int, data: bytearray) -> None:
+        self.width = width
+        self.height = height
+        self.data = data
+
+    def pixel(self, x: int, y: int) -> Tuple[int, int, int, int]:
+        offset = (y * self.width + x) * 4
+        return tuple(self.data[offset : offset + 4])
+
+
+def read_image(path: Path) -> RGBAImage:
+    return decode_image(Path(path).read_bytes(), Path(path).suffix, str(path))
+
+
+def decode_image(data: bytes, suffix: str = "", source: str = "<bytes>") -> RGBAImage:
+    if data.startswith(PNG_SIGNATURE):
+        return decode_png(data)
+    if suffix.lower() == ".tga":
+        return decode_tga(data)
+    raise ImageDecodeError(f"Unsupported image format: {source}")
+
+
+def decode_png(data: bytes) -> RGBAImage:
+    if not data.startswith(PNG_SIGNATURE):
+        raise ImageDecodeError("Not a PNG file")
+    offset = len(PNG_SIGNATURE)
+    header = None
+    palette = b""
+    transparency = b""
+    idat = []
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset : offset + 8])
+        body = data[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif chunk_type == b"PLTE":
+            palette = body
+        elif chunk_type == b"tRNS":
+            transparency = body
+        elif chunk_type == b"IDAT":
+            idat.append(body)
+        elif chunk_type == b"IEND":
+            break
+    if header is None:
+        raise ImageDecodeError("Missing IHDR chunk")
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if interlace:
+        raise ImageDecodeError("Interlaced PNG files are not supported")
+    if color_type not in _CHANNELS or bit_depth not in (8, 16):
+        raise ImageDecodeError(f"Unsupported PNG format (type {color_type}, depth {bit_depth})")
+
+    channels = _CHANNELS[color_type]
+    bpp = channels * bit_depth // 8
+    stride = width * bpp
+    raw = zlib.decompress(b"".join(idat))
+    if len(raw) < (stride + 1) * height:
+        raise ImageDecodeError("Truncated PNG data")
+    rows = _unfilter(raw, stride, height, bpp)
+
+    if bit_depth == 16:
+        rows = [row[::2] for row in rows]
+    return RGBAImage(width, height, _to_rgba(rows, width, color_type, palette, transparency))
+
+
+def _unfilter(raw: bytes, stride: int, height: int, bpp: int):
+    rows = []
+    previous = bytearray(stride)
+    position = 0
+    for _ in range(height):
+        filter_type = raw[position]
+        row = bytearray(raw[position + 1 : position + 1 + stride])
+        position += stride + 1
+        if filter_type == 1:
+            for i in range(bpp, stride):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            row = bytearray(_add_bytes(row, previous))
+        elif filter_type == 3:
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                if i >= bpp:
+                    a = row[i - bpp]
+                    c = previous[i - bpp]
+                else:
+                    a = c = 0
+                b = previous[i]
+                p = a + b - c
+                pa = abs(p - a)
+                pb = abs(p - b)
+                pc = abs(p - c)
+                if pa <= pb and pa <= pc:
+                    predictor = a
+                elif pb <= pc:
+                    predictor = b
+                else:
+                    predictor = c
+                row[i] = (row[i] + predictor) & 0xFF
+        elif filter_type != 0:
+            raise ImageDecodeError(f"Unknown PNG filter {filter_type}")
+        rows.append(row)
+        previous = row
+    return rows
+
+
+def _add_bytes(left: bytes, right: bytes) -> bytes:
+    # Byte-wise addition modulo 256 on whole rows at once, without carries between lanes.
+    size = len(left)
+    if size == 0:
+        return b""
+    high = int.from_bytes(b"\x80" * size, "big")
+    low = high ^ int.from_bytes(b"\xff" * size, "big")
+    a = int.from_bytes(left, "big")
+    b = int.from_bytes(right, "big")
+    total = ((a & low) + (b & low)) ^ ((a ^ b) & high)
+    return total.to_bytes(size, "big")
+
+
+def _to_rgba(rows, width: int, color_type: int, palette: bytes, transparency: bytes) -> bytearray:
+    pixels = bytearray(width * len(rows) * 4)
+    if color_type == 6:
+        for y, row in enumerate(rows):
+            pixels[y * width * 4 : (y + 1) * width * 4] = row
+        return pixels
+    for y, row in enumerate(rows):
+        base = y * width * 4
+        if color_type == 2:
+            pixels[base : base + width * 4 : 4] = row[0::3]
+            pixels[base + 1 : base + width * 4 : 4] = row[1::3]
+            pixels[base + 2 : base + width * 4 : 4] = row[2::3]
+            pixels[base + 3 : base + width * 4 : 4] = b"\xff" * width
+        elif color_type == 0:
+            for channel in range(3):
+                pixels[base + channel : base + width * 4 : 4] = row
+            pixels[base + 3 : base + width * 4 : 4] = b"\xff" * width
+        elif color_type == 4:
+            for channel in range(3):
+                pixels[base + channel : base + width * 4 : 4] = row[0::2]
+            pixels[base + 3 : base + width * 4 : 4] = row[1::2]
+        else:
+            for x, index in enumerate(row[:width]):
+                offset = base + x * 4
+                pixels[offset : offset + 3] = palette[index * 3 : index * 3 + 3].ljust(3, b"\0")
+                pixels[offset + 3] = transparency[index] if index < len(transparency) else 255
+    return pixels
+
+
+def decode_tga(data: bytes) -> RGBAImage:
+    if len(data) < 18:
+        raise ImageDecodeError("Truncated TGA header")
+    id_length, colormap_type, image_type = data[0], data[1], data[2]
+    width, height, depth, descriptor = struct.unpack("<HHBB", data[12:18])
+    if colormap_type != 0 or image_type not in (2, 10) or depth not in (24, 32):
+        raise ImageDecodeError("Only true-color TGA files are supported")
+    bpp = depth // 8
+    position = 18 + id_length
+    count = width * height
+    source = bytearray()
+    if image_type == 2:
+        source = bytearray(data[position : position + count * bpp])
+    else:
+        while len(source) < count * bpp and position < len(data):
+            packet = data[position]
+            position += 1
+            run = (packet & 0x7F) + 1
+            if packet & 0x80:
+                source += data[position : position + bpp] * run
+                position += bpp
+            else:
+                source += data[position : position + run * bpp]
+                position += run * bpp
+    if len(source) < count * bpp:
+        raise ImageDecodeError("Truncated TGA data")
+
+    pixels = bytearray(count * 4)
+    pixels[0::4] = source[2::bpp][:count]
+    pixels[1::4] = source[1::bpp][:count]
+    pixels[2::4] = source[0::bpp][:count]
+    pixels[3::4] = source[3::bpp][:count] if bpp == 4 else b"\xff" * count
+    if not descriptor & 0x20:
+        row_size = width * 4
+        pixels = bytearray(
+            b"".join(pixels[y * row_size : (y + 1) * row_size] for y in range(height - 1, -1, -1))
+        )
+    return RGBAImage(width, height, pixels)
+
+
+def encode_png(image: RGBAImage) -> bytes:
+    row_size = image.width * 4
+    raw = b"".join(
+        b"\x00" + bytes(image.data[y * row_size : (y + 1) * row_size]) for y in range(image.height)
+    )
+
+    def chunk(chunk_type: bytes, body: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(body))
+            + chunk_type
+            + body
+            + struct.pack(">I", zlib.crc32(chunk_type + body) & 0xFFFFFFFF)
+        )
+
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, 6, 0, 0, 0)
+    return PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+def write_png(path: Path, image: RGBAImage) -> None:
+    Path(path).write_bytes(encode_png(image))
+
+
+def encode_tga(image: RGBAImage) -> bytes:
+    # Uncompressed 32-bit BGRA, stored top row first.
+    header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, image.width, image.height, 32, 0x28)
+    pixels = bytearray(len(image.data))
+    pixels[0::4] = image.data[2::4]
+    pixels[1::4] = image.data[1::4]
+    pixels[2::4] = image.data[0::4]
+    pixels[3::4] = image.data[3::4]
+    return header + bytes(pixels)
+
+
+def shrink_rgba(image: RGBAImage, factor: int) -> RGBAImage:
+    # Box filter weighted by alpha, so transparent texels do not darken the edges they border.
+    if factor <= 1:
+        return image
+    width = max(1, image.width // factor)
+    height = max(1, image.height // factor)
+    stride = image.width * 4
+    step = 4 * factor
+    area = factor * factor
+    data = image.data
+    result = bytearray(width * height * 4)
+    for y in range(height):
+        alphas = [0] * width
+        sums = [[0] * width for _ in range(3)]
+        for dy in range(factor):
+            start = min(y * factor + dy, image.height - 1) * stride
+            row = data[start : start + stride]
+            for dx in range(min(factor, image.width)):
+                alpha = row[dx * 4 + 3 :: step][:width]
+                alphas = list(map(add, alphas, alpha))
+                for channel in range(3):
+                    weighted = map(mul, row[dx * 4 + channel :: step][:width], alpha)
+                    sums[channel] = list(map(add, sums[channel], weighted))
+        base = y * width * 4
+        for channel in range(3):
+            result[base + channel : base + width * 4 : 4] = bytes(
+                total // weight if weight else 0 for total, weight in zip(sums[channel], alphas)
+            )
+        result[base + 3 : base + width * 4 : 4] = bytes(weight // area for weight in alphas)
+    return RGBAImage(width, height, result)
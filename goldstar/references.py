@@ -0,0 +1,178 @@
+﻿import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from .behavior import behavior_pack_path
+from .jsonio import JsonParseError, dump_atomic, load
+from .lang import LANG_SUFFIX, iter_lang_entries
+from .paths import user_cache_dir
+from .scanner import blf_pack_dirs, walk_files
+
+REFERENCE_INDEX_VERSION = 1
+MAX_JSON_SIZE = 4 * 1024 * 1024
+# Longer strings are Molang expressions or prose, never a name another file points at.
+MAX_STRING_LENGTH = 256
+
+JsonPath = Tuple[Union[str, int], ...]
+# (string, JSON path of the key or value, whether the string is the key)
+Occurrence = Tuple[str, JsonPath, bool]
+
+
+@dataclass(frozen=True)
+class Reference:
+    pack: str
+    rel_path: str
+    path: JsonPath
+    is_key: bool
+
+
+def _walk(value, path: JsonPath, found: List[Occurrence]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if len(key) <= MAX_STRING_LENGTH:
+                found.append((key, path + (key,), True))
+            _walk(item, path + (key,), found)
+    elif isinstance(value, list):
+        for position, item in enumerate(value):
+            _walk(item, path + (position,), found)
+    elif isinstance(value, str) and len(value) <= MAX_STRING_LENGTH:
+        found.append((value, path, False))
+
+
+def extract_occurrences(pack_path: Path, rel_path: str, size: int) -> List[Occurrence]:
+    path = pack_path / rel_path
+    found: List[Occurrence] = []
+    try:
+        if rel_path.endswith(LANG_SUFFIX):
+            # Lang keys are addressed by the key alone; the line they sit on does not matter.
+            found.extend((key, (key,), True) for key, _ in iter_lang_entries(path))
+        elif rel_path.endswith(".json") and size <= MAX_JSON_SIZE:
+            _walk(load(path, cached=True), (), found)
+    except (OSError, JsonParseError):
+        return []
+    return found
+
+
+class ReferenceIndex:
+    def __init__(self) -> None:
+        self._files: Dict[Tuple[str, str], Tuple[int, int, List[Occurrence]]] = {}
+        self._strings: Dict[str, Set[Tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def packs(self) -> Set[str]:
+        return {pack for pack, _ in self._files}
+
+    def records(self) -> Iterator[Tuple[str, str, int, List[Occurrence]]]:
+        for (pack, rel_path), (size, _, occurrences) in self._files.items():
+            yield pack, rel_path, size, occurrences
+
+    def references(self, value: str) -> List[Reference]:
+        found = []
+        for key in sorted(self._strings.get(value, ())):
+            for string, path, is_key in self._files[key][2]:
+                if string == value:
+                    found.append(Reference(key[0], key[1], path, is_key))
+        return found
+
+    def update_pack(self, pack: str, pack_path: Path) -> int:
+        seen = set()
+        changed = 0
+        for rel_path, size, mtime_ns in sorted(walk_files(pack_path)):
+            key = (pack, rel_path)
+            seen.add(key)
+            known = self._files.get(key)
+            if known is None or known[0] != size or known[1] != mtime_ns:
+                self._remove_file(key)
+                self._add_file(key, size, mtime_ns, extract_occurrences(pack_path, rel_path, size))
+                changed += 1
+        for key in [key for key in self._files if key[0] == pack and key not in seen]:
+            self._remove_file(key)
+            changed += 1
+        return changed
+
+    def update_root(self, resource_root: Path) -> int:
+        # Packs are keyed relative to the folder holding both the resource and behavior pack roots.
+        base = resource_root.parent
+        pack_dirs = blf_pack_dirs(resource_root)
+        behavior_dir = behavior_pack_path(resource_root)
+        if behavior_dir.is_dir():
+            pack_dirs.append(behavior_dir)
+        present = {pack_dir.relative_to(base).as_posix(): pack_dir for pack_dir in pack_dirs}
+        changed = sum(self.update_pack(pack, pack_dir) for pack, pack_dir in present.items())
+        for key in [key for key in self._files if key[0] not in present]:
+            self._remove_file(key)
+            changed += 1
+        return changed
+
+    def _add_file(self, key: Tuple[str, str], size: int, mtime_ns: int, occurrences: List[Occurrence]) -> None:
+        self._files[key] = (size, mtime_ns, occurrences)
+        for string, _, _ in occurrences:
+            self._strings.setdefault(string, set()).add(key)
+
+    def _remove_file(self, key: Tuple[str, str]) -> None:
+        known = self._files.pop(key, None)
+        if known is None:
+            return
+        for string, _, _ in known[2]:
+            keys = self._strings.get(string)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._strings[string]
+
+    def to_dict(self) -> dict:
+        packs: Dict[str, Dict[str, list]] = {}
+        for (pack, rel_path), (size, mtime_ns, occurrences) in self._files.items():
+            packs.setdefault(pack, {})[rel_path] = [size, mtime_ns, occurrences]
+        return {"version": REFERENCE_INDEX_VERSION, "packs": packs}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReferenceIndex":
+        index = cls()
+        if not isinstance(data, dict) or data.get("version") != REFERENCE_INDEX_VERSION:
+            return index
+        packs = data.get("packs")
+        if not isinstance(packs, dict):
+            return index
+        for pack, files in packs.items():
+            if not isinstance(files, dict):
+                continue
+            for rel_path, record in files.items():
+                try:
+                    size, mtime_ns, records = record
+                    occurrences = [(string, tuple(path), bool(is_key)) for string, path, is_key in records]
+                    index._add_file((pack, rel_path), int(size), int(mtime_ns), occurrences)
+                except (TypeError, ValueError):
+                    continue
+        return index
+
+
+def reference_index_path(resource_root: Path) -> Path:
+    digest = hashlib.sha1(str(resource_root).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / "references" / f"{digest}.json"
+
+
+def load_reference_index(resource_root: Path) -> ReferenceIndex:
+    try:
+        data = load(reference_index_path(resource_root))
+    except (OSError, JsonParseError):
+        return ReferenceIndex()
+    return ReferenceIndex.from_dict(data)
+
+
+def save_reference_index(resource_root: Path, index: ReferenceIndex) -> None:
+    cache_path = reference_index_path(resource_root)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_atomic(cache_path, index.to_dict(), indent=None)
+
+
+def build_reference_index(resource_root: Path, index: Optional[ReferenceIndex] = None) -> ReferenceIndex:
+    if index is None:
+        index = load_reference_index(resource_root)
+    if index.update_root(resource_root):
+        save_reference_index(resource_root, index)
+    return index
+
@@ -0,0 +1,231 @@
+﻿import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .behavior import behavior_entity_path, behavior_pack_path, behavior_spawn_item_path, entity_pack_dirs
+from .entity import (
+    ANIMATION_KEYS,
+    MAX_NAME_LENGTH,
+    NAME_PATTERN,
+    NAMESPACE_PATTERN,
+    EntityLayout,
+    geometry_identifier_from_text,
+)
+from .file_plan import FilePlan, PlanIssue
+from .jsonio import JsonParseError, dumps, load, loads
+from .lang import LANG_SUFFIX, parse_lang_line
+from .references import JsonPath, Reference, ReferenceIndex
+
+TEXTURE_SUFFIXES = (".png", ".tga")
+
+
+@dataclass
+class RenameReport:
+    old_identifier: str
+    new_identifier: str
+    moved: List[Tuple[Path, Path]] = field(default_factory=list)
+    rewritten: List[Path] = field(default_factory=list)
+    references: int = 0
+
+
+def split_identifier(text: str) -> Tuple[Optional[str], str]:
+    namespace, separator, name = text.strip().rpartition(":")
+    return (namespace if separator else None), name
+
+
+def _bare_name_allowed(reference: Reference) -> bool:
+    # A bare entity name is too common a string to replace everywhere; only the slots the tool writes it to count.
+    path = reference.path
+    if reference.is_key:
+        return path[:-1] == ("texture_data",)
+    return path[-2:] in (("spawn_egg", "texture"), ("minecraft:icon", "texture"))
+
+
+def _defined_keys(path: Path, section: str) -> List[str]:
+    try:
+        data = load(path)
+    except (OSError, JsonParseError):
+        return []
+    keys = data.get(section) if isinstance(data, dict) else None
+    return [key for key in keys if isinstance(key, str)] if isinstance(keys, dict) else []
+
+
+def _identifier_mapping(layout: EntityLayout, old: Tuple[str, str], new: Tuple[str, str]) -> Dict[str, str]:
+    (old_namespace, old_name), (new_namespace, new_name) = old, new
+    mapping = {
+        f"{old_namespace}:{old_name}": f"{new_namespace}:{new_name}",
+        f"{old_namespace}:{old_name}_spawn": f"{new_namespace}:{new_name}_spawn",
+        f"entity.{old_namespace}:{old_name}.name": f"entity.{new_namespace}:{new_name}.name",
+        f"item.{old_namespace}:{old_name}_spawn.name": f"item.{new_namespace}:{new_name}_spawn.name",
+        f"textures/entity/{old_name}": f"textures/entity/{new_name}",
+        f"textures/items/{old_name}.icon": f"textures/items/{new_name}.icon",
+        f"{old_name} spawn": f"{new_name} spawn",
+    }
+    try:
+        geo_identifier = geometry_identifier_from_text(layout.model.read_text(encoding="utf-8-sig"))
+    except (OSError, UnicodeDecodeError, JsonParseError):
+        geo_identifier = None
+    # Imported models keep their own geometry identifier; only the one named after the entity follows it.
+    if geo_identifier == f"geometry.{old_name}":
+        mapping[geo_identifier] = f"geometry.{new_name}"
+
+    segment = re.compile(rf"(?<=\.){re.escape(old_name)}(?=\.|$)")
+    animation_ids = [f"animation.{old_name}.{key}" for key in ANIMATION_KEYS] + [f"controller.animation.{old_name}"]
+    animation_ids += _defined_keys(layout.animation, "animations")
+    animation_ids += _defined_keys(layout.controller, "animation_controllers")
+    for identifier in animation_ids:
+        renamed = segment.sub(new_name, identifier)
+        if renamed != identifier:
+            mapping[identifier] = renamed
+    return {old_value: new_value for old_value, new_value in mapping.items() if old_value != new_value}
+
+
+def _apply_json_edits(data, edits: List[Tuple[JsonPath, bool, str, str]]) -> int:
+    # Values first, then keys deepest first, so every recorded path still leads somewhere when it is used.
+    ordered = sorted(edits, key=lambda edit: (edit[1], -len(edit[0])))
+    applied = 0
+    for path, is_key, old, new in ordered:
+        parent = data
+        try:
+            for step in path[:-1]:
+                parent = parent[step]
+            last = path[-1]
+            if is_key:
+                if not isinstance(parent, dict) or old not in parent or new in parent:
+                    continue
+                items = list(parent.items())
+                parent.clear()
+                parent.update((new if key == old else key, value) for key, value in items)
+            elif parent[last] == old:
+                parent[last] = new
+            else:
+                continue
+        except (KeyError, IndexError, TypeError):
+            continue
+        applied += 1
+    return applied
+
+
+def _rewrite_lang(text: str, mapping: Dict[str, str]) -> Tuple[str, int]:
+    lines = text.splitlines(keepends=True)
+    applied = 0
+    for position, line in enumerate(lines):
+        entry = parse_lang_line(line)
+        if entry is not None and entry[0] in mapping:
+            lines[position] = f"{mapping[entry[0]]}={line.partition('=')[2]}"
+            applied += 1
+    return "".join(lines), applied
+
+
+def _entity_moves(pack_dir: Path, resource_root: Path, old_name: str, new_name: str) -> List[Tuple[Path, Path]]:
+    old_layout, new_layout = EntityLayout(pack_dir, old_name), EntityLayout(pack_dir, new_name)
+    pairs = [
+        (old_layout.entity, new_layout.entity),
+        (old_layout.model, new_layout.model),
+        (old_layout.animation, new_layout.animation),
+        (old_layout.controller, new_layout.controller),
+        (old_layout.icon, new_layout.icon),
+    ]
+    textures = [
+        (EntityLayout(pack_dir, old_name, suffix).texture, EntityLayout(pack_dir, new_name, suffix).texture)
+        for suffix in TEXTURE_SUFFIXES
+    ]
+    pairs += textures
+    # Memory-tier subpacks carry their own copy of the entity texture.
+    for tier_dir in sorted((pack_dir / "subpacks").glob("*")):
+        for old_texture, new_texture in textures:
+            rel_old, rel_new = old_texture.relative_to(pack_dir), new_texture.relative_to(pack_dir)
+            pairs.append((tier_dir / rel_old, tier_dir / rel_new))
+    behavior_dir = behavior_pack_path(resource_root)
+    pairs += [
+        (behavior_entity_path(behavior_dir, old_name), behavior_entity_path(behavior_dir, new_name)),
+        (behavior_spawn_item_path(behavior_dir, old_name), behavior_spawn_item_path(behavior_dir, new_name)),
+    ]
+    return [(source, destination) for source, destination in pairs if source.is_file()]
+
+
+def plan_entity_rename(
+    plan: FilePlan, resource_root: Path, index: ReferenceIndex, old: str, new: str
+) -> Optional[RenameReport]:
+    old_namespace, old_name = split_identifier(old)
+    new_namespace, new_name = split_identifier(new)
+    if len(new_name) > MAX_NAME_LENGTH or not NAME_PATTERN.fullmatch(new_name):
+        plan.issues.append(PlanIssue("invalid_name"))
+        return None
+    if new_namespace is not None and not NAMESPACE_PATTERN.fullmatch(new_namespace):
+        plan.issues.append(PlanIssue("invalid_prefix"))
+        return None
+
+    pack_dirs = entity_pack_dirs(resource_root)
+    pack_dir = next((p for p in pack_dirs if EntityLayout(p, old_name).entity.is_file()), None)
+    if pack_dir is None:
+        plan.issues.append(PlanIssue("file_not_found", {"path": f"entity/{old_name}.entity.json"}))
+        return None
+    layout = EntityLayout(pack_dir, old_name)
+    try:
+        data = load(layout.entity)
+    except (OSError, JsonParseError) as exc:
+        plan.issues.append(PlanIssue("invalid_json", {"error": str(exc)}))
+        return None
+    client_entity = data.get("minecraft:client_entity") if isinstance(data, dict) else None
+    description = client_entity.get("description") if isinstance(client_entity, dict) else None
+    identifier = description.get("identifier") if isinstance(description, dict) else None
+    current_namespace, current_name = split_identifier(identifier if isinstance(identifier, str) else "")
+    if current_namespace is None or current_name != old_name or old_namespace not in (None, current_namespace):
+        plan.issues.append(PlanIssue("file_not_found", {"path": f"{old_namespace or '*'}:{old_name}"}))
+        return None
+    old_pair = (current_namespace, old_name)
+    new_pair = (new_namespace or current_namespace, new_name)
+    report = RenameReport(":".join(old_pair), ":".join(new_pair))
+    if old_pair == new_pair:
+        return report
+    if new_name != old_name and any(EntityLayout(p, new_name).entity.is_file() for p in pack_dirs):
+        plan.issues.append(PlanIssue("duplicate_name", {"name": new_name}))
+        return None
+
+    mapping = _identifier_mapping(layout, old_pair, new_pair)
+    edits: Dict[Tuple[str, str], List[Tuple[JsonPath, bool, str, str]]] = {}
+    for old_value, new_value in mapping.items():
+        for reference in index.references(old_value):
+            edits.setdefault((reference.pack, reference.rel_path), []).append(
+                (reference.path, reference.is_key, old_value, new_value)
+            )
+    if new_name != old_name:
+        for reference in index.references(old_name):
+            if _bare_name_allowed(reference):
+                edits.setdefault((reference.pack, reference.rel_path), []).append(
+                    (reference.path, reference.is_key, old_name, new_name)
+                )
+
+    base = resource_root.parent
+    moves = dict(_entity_moves(pack_dir, resource_root, old_name, new_name)) if new_name != old_name else {}
+    written: Set[Path] = set()
+    for (pack, rel_path), file_edits in sorted(edits.items()):
+        path = base / pack / rel_path
+        try:
+            text = path.read_text(encoding="utf-8-sig")
+            if rel_path.endswith(LANG_SUFFIX):
+                text, applied = _rewrite_lang(text, mapping)
+            else:
+                document = loads(text, source=str(path))
+                applied = _apply_json_edits(document, file_edits)
+                text = dumps(document) + "\n"
+        except (OSError, UnicodeDecodeError, JsonParseError) as exc:
+            plan.issues.append(PlanIssue("invalid_json", {"error": str(exc)}))
+            continue
+        if not applied:
+            # The index was older than the file; nothing recorded there is still present.
+            continue
+        report.references += applied
+        destination = moves.get(path, path)
+        plan.write_text(destination, text, overwrite=destination == path)
+        report.rewritten.append(destination)
+        written.add(path)
+
+    for source, destination in moves.items():
+        if source not in written:
+            plan.copy(source, destination)
+        plan.delete(source)
+        report.moved.append((source, destination))
+    return report
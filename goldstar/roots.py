@@ -0,0 +1,217 @@
+﻿import glob
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import PackIndex
+from .pack_ops import check_missing_packs, expected_pack_names
+from .scanner import scan_pack, walk_files
+
+RESOURCE_ROOT_NAME = "development_resource_packs"
+DEFAULT_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class PackStatus:
+    name: str
+    files: int
+    size: int
+
+
+@dataclass
+class RootStatus:
+    root: Path
+    found: bool = True
+    missing: List[str] = field(default_factory=list)
+    packs: List[PackStatus] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def files(self) -> int:
+        return sum(pack.files for pack in self.packs)
+
+    @property
+    def size(self) -> int:
+        return sum(pack.size for pack in self.packs)
+
+    @property
+    def ok(self) -> bool:
+        return self.found and not self.missing and not self.errors
+
+
+class FileIndexCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, Tuple[Tuple[int, int], PackIndex]] = {}
+        self._key_locks: Dict[Path, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, pack_path: Path, refresh: bool = False) -> PackIndex:
+        key = pack_path.resolve()
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # One lock per pack, so roots that share a pack through symlinks scan it once.
+        with key_lock:
+            files = list(walk_files(key))
+            signature = files_signature(files)
+            cached = self._entries.get(key)
+            if cached is not None and not refresh and cached[0] == signature:
+                with self._lock:
+                    self.hits += 1
+                return cached[1]
+            index = scan_pack(pack_path, files)
+            index.children()
+            with self._lock:
+                self._entries[key] = (signature, index)
+                self.misses += 1
+            return index
+
+    def discard(self, pack_path: Path) -> None:
+        with self._lock:
+            self._entries.pop(pack_path.resolve(), None)
+
+
+def files_signature(files: List[Tuple[str, int, int]]) -> Tuple[int, int]:
+    # Editing a file in place leaves its directory's mtime alone, so every file's size and mtime count.
+    # The walk order is not stable, so the per-file hashes are summed rather than chained.
+    return len(files), sum(hash(item) for item in files) & 0xFFFFFFFFFFFFFFFF
+
+
+def split_patterns(text: str) -> List[str]:
+    return [part.strip() for part in re.split(r"[;\n]", text) if part.strip()]
+
+
+def read_root_list(path: Path) -> List[str]:
+    patterns = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+def discover_roots(patterns: Iterable[str]) -> List[Path]:
+    roots = []
+    seen = set()
+    for pattern in patterns:
+        expanded = os.path.expanduser(pattern.strip())
+        if not expanded:
+            continue
+        if any(char in expanded for char in "*?["):
+            candidates = [_resource_root(Path(match)) for match in sorted(glob.glob(expanded, recursive=True))]
+        else:
+            # Plain paths are kept even when missing so the status table can report them.
+            path = Path(expanded)
+            candidates = [_resource_root(path) or path]
+        for candidate in candidates:
+            if candidate is None:
+                continue
+            candidate = candidate.resolve()
+            if candidate not in seen:
+                seen.add(candidate)
+                roots.append(candidate)
+    return roots
+
+
+def _resource_root(path: Path) -> Optional[Path]:
+    if not path.is_dir():
+        return None
+    if path.name == RESOURCE_ROOT_NAME or _has_blf_packs(path):
+        return path
+    child = path / RESOURCE_ROOT_NAME
+    if child.is_dir():
+        return child
+    return None
+
+
+def _has_blf_packs(path: Path) -> bool:
+    try:
+        with os.scandir(path) as it:
+            return any(item.name.startswith("BLF_") and item.is_dir() for item in it)
+    except OSError:
+        return False
+
+
+def collect_status(
+    roots: Iterable[Path],
+    cache: Optional[FileIndexCache] = None,
+    workers: int = DEFAULT_WORKERS,
+    refresh: bool = False,
+) -> List[RootStatus]:
+    cache = cache if cache is not None else FileIndexCache()
+    statuses = [RootStatus(root) for root in roots]
+    pack_names = expected_pack_names()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        checks = {}
+        for status in statuses:
+            if status.root.is_dir():
+                checks[pool.submit(check_missing_packs, status.root)] = status
+            else:
+                status.found = False
+        scans = []
+        # Roots that share a pack through a symlink wait on one scan instead of each walking it.
+        submitted: Dict[Path, Future] = {}
+        for future in as_completed(checks):
+            status = checks[future]
+            try:
+                status.missing = future.result()
+            except OSError as exc:
+                status.errors.append(str(exc))
+                continue
+            for name in pack_names:
+                if name not in status.missing:
+                    pack_path = status.root / name
+                    key = pack_path.resolve()
+                    if key not in submitted:
+                        submitted[key] = pool.submit(cache.get, pack_path, refresh)
+                    scans.append((status, name, submitted[key]))
+        for status, name, future in scans:
+            try:
+                index = future.result()
+            except OSError as exc:
+                status.errors.append(f"{name}: {exc}")
+                continue
+            status.packs.append(PackStatus(name, len(index), index.total_size()))
+    return statuses
+
+
+def format_size(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"
+
+
+def format_status_table(statuses: List[RootStatus]) -> List[str]:
+    rows = [("ROOT", "PACKS", "FILES", "SIZE", "MISSING")]
+    total = len(expected_pack_names())
+    for status in statuses:
+        if not status.found:
+            missing = "(root not found)"
+        else:
+            missing = ", ".join(status.missing + status.errors) or "-"
+        rows.append(
+            (str(status.root), f"{len(status.packs)}/{total}", str(status.files), format_size(status.size), missing)
+        )
+    widths = [max(len(row[column]) for row in rows) for column in range(4)]
+    lines = []
+    for row in rows:
+        cells = [
+            row[0].ljust(widths[0]),
+            row[1].rjust(widths[1]),
+            row[2].rjust(widths[2]),
+            row[3].rjust(widths[3]),
+            row[4],
+        ]
+        lines.append("  ".join(cells))
+    return lines
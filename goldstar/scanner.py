@@ -1,33 +1,42 @@
-﻿from pathlib import Path
-from typing import List
+﻿import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from .models import PackMetadata
+from .models import PackIndex
 
 
-def scan_pack(pack_path: Path) -> PackMetadata:
-    default_files = sorted(
-        [p for p in pack_path.rglob("default_*") if p.is_file()]
-    )
+def scan_pack(pack_path: Path, files: Optional[Iterable[Tuple[str, int, int]]] = None) -> PackIndex:
     item_texture = pack_path / "textures" / "item_texture.json"
     if not item_texture.is_file():
         item_texture = None
-    icon_dir = pack_path / "textures" / "items"
-    default_icons: List[Path] = []
-    if icon_dir.is_dir():
-        default_icons = sorted(
-            [p for p in icon_dir.glob("default_*.png") if p.is_file()]
-        )
-    return PackMetadata(
-        name=pack_path.name,
-        path=pack_path,
-        default_files=default_files,
-        item_texture=item_texture,
-        default_icons=default_icons,
-    )
-
-
-def scan_packs(root_path: Path) -> List[PackMetadata]:
-    pack_dirs = sorted(
-        [p for p in root_path.iterdir() if p.is_dir() and p.name.startswith("BLF_")]
-    )
-    return [scan_pack(p) for p in pack_dirs]
\ No newline at end of file
+    return PackIndex.build(pack_path.name, pack_path, walk_files(pack_path) if files is None else files, item_texture)
+
+
+def blf_pack_dirs(root_path: Path) -> List[Path]:
+    return sorted(p for p in root_path.iterdir() if p.is_dir() and p.name.startswith("BLF_"))
+
+
+def scan_packs(root_path: Path) -> List[PackIndex]:
+    return [scan_pack(p) for p in blf_pack_dirs(root_path)]
+
+
+def walk_files(pack_path: Path) -> Iterator[Tuple[str, int, int]]:
+    stack = [(str(pack_path), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.name.startswith("."):
+                        continue
+                    rel_path = f"{prefix}{item.name}"
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            stack.append((item.path, f"{rel_path}/"))
+                        elif item.is_file():
+                            stat = item.stat()
+                            yield rel_path, stat.st_size, stat.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
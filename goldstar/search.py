@@ -0,0 +1,292 @@
+﻿import bisect
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .jsonio import JsonParseError, dump_atomic, load
+from .paths import user_cache_dir
+from .scanner import blf_pack_dirs, walk_files
+
+SEARCH_INDEX_VERSION = 1
+MAX_JSON_SIZE = 4 * 1024 * 1024
+MIN_FUZZY_SCORE = 0.5
+MAX_PREFIX_CANDIDATES = 2000
+
+KIND_FILE = "file"
+KIND_IDENTIFIER = "identifier"
+KIND_ITEM_TEXTURE = "item_texture"
+
+_WORD_START = re.compile(r"(?<=[:._/\-\s])[^:._/\-\s]")
+_IDENTIFIER_ROOTS = (
+    "minecraft:client_entity",
+    "minecraft:entity",
+    "minecraft:item",
+    "minecraft:block",
+    "minecraft:attachable",
+)
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    pack: str
+    rel_path: str
+    kind: str
+    term: str
+    score: float
+
+
+def _trigrams(text: str, pad_end: bool = True) -> Set[str]:
+    padded = f"  {text} " if pad_end else f"  {text}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_keys(term: str) -> Set[str]:
+    return {term, *(term[match.start():] for match in _WORD_START.finditer(term))}
+
+
+def extract_terms(pack_path: Path, rel_path: str, size: int) -> List[Tuple[str, str]]:
+    terms = [(KIND_FILE, rel_path.rsplit("/", 1)[-1])]
+    if not rel_path.endswith(".json") or size > MAX_JSON_SIZE:
+        return terms
+    try:
+        data = load(pack_path / rel_path, cached=True)
+    except (OSError, JsonParseError):
+        return terms
+    if not isinstance(data, dict):
+        return terms
+
+    if rel_path == "textures/item_texture.json":
+        texture_data = data.get("texture_data")
+        if isinstance(texture_data, dict):
+            terms.extend((KIND_ITEM_TEXTURE, key) for key in texture_data if isinstance(key, str))
+        return terms
+
+    for root_key in _IDENTIFIER_ROOTS:
+        section = data.get(root_key)
+        if isinstance(section, dict):
+            desc = section.get("description")
+            if isinstance(desc, dict) and isinstance(desc.get("identifier"), str):
+                terms.append((KIND_IDENTIFIER, desc["identifier"]))
+    geos = data.get("minecraft:geometry")
+    if isinstance(geos, list):
+        for geo in geos:
+            desc = geo.get("description") if isinstance(geo, dict) else None
+            if isinstance(desc, dict) and isinstance(desc.get("identifier"), str):
+                terms.append((KIND_IDENTIFIER, desc["identifier"]))
+    for section_key in ("animations", "animation_controllers"):
+        section = data.get(section_key)
+        if isinstance(section, dict):
+            terms.extend((KIND_IDENTIFIER, key) for key in section if isinstance(key, str))
+    return terms
+
+
+class AssetSearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._docs: Dict[int, Tuple[str, str, str, str, str]] = {}
+        self._files: Dict[Tuple[str, str], Tuple[int, int, List[int]]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._prefixes: List[Tuple[str, int]] = []
+        self._prefixes_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def packs(self) -> Set[str]:
+        with self._lock:
+            return {pack for pack, _ in self._files}
+
+    def update_pack(self, pack_path: Path, files: Optional[Iterable[Tuple[str, int, int]]] = None) -> int:
+        pack = pack_path.name
+        if files is None:
+            files = sorted(walk_files(pack_path))
+        seen = set()
+        pending = []
+        with self._lock:
+            for rel_path, size, mtime_ns in files:
+                key = (pack, rel_path)
+                seen.add(key)
+                known = self._files.get(key)
+                if known is None or known[0] != size or known[1] != mtime_ns:
+                    pending.append((rel_path, size, mtime_ns))
+            removed = [key for key in self._files if key[0] == pack and key not in seen]
+
+        # JSON parsing happens outside the lock so typing stays responsive.
+        extracted = [(item, extract_terms(pack_path, item[0], item[1])) for item in pending]
+
+        with self._lock:
+            dropped: Set[int] = set()
+            for key in removed + [(pack, item[0]) for item, _ in extracted]:
+                dropped.update(self._remove_file(key))
+            self._drop_prefixes(dropped)
+            for (rel_path, size, mtime_ns), terms in extracted:
+                self._add_file(pack, rel_path, size, mtime_ns, terms)
+            self._sort_prefixes()
+        return len(removed) + len(extracted)
+
+    def update_root(self, root_path: Path) -> int:
+        pack_dirs = blf_pack_dirs(root_path)
+        changed = 0
+        for pack_dir in pack_dirs:
+            changed += self.update_pack(pack_dir)
+        present = {p.name for p in pack_dirs}
+        for pack in self.packs() - present:
+            changed += self.remove_pack(pack)
+        return changed
+
+    def remove_pack(self, pack: str) -> int:
+        with self._lock:
+            keys = [key for key in self._files if key[0] == pack]
+            dropped: Set[int] = set()
+            for key in keys:
+                dropped.update(self._remove_file(key))
+            self._drop_prefixes(dropped)
+            return len(keys)
+
+    def _add_file(self, pack: str, rel_path: str, size: int, mtime_ns: int, terms: List[Tuple[str, str]]) -> None:
+        doc_ids = []
+        for kind, term in terms:
+            doc_id = self._next_id
+            self._next_id += 1
+            lowered = term.lower()
+            self._docs[doc_id] = (pack, rel_path, kind, term, lowered)
+            for gram in _trigrams(lowered):
+                self._trigrams.setdefault(gram, set()).add(doc_id)
+            for key in _prefix_keys(lowered):
+                self._prefixes.append((key, doc_id))
+            self._prefixes_sorted = False
+            doc_ids.append(doc_id)
+        self._files[(pack, rel_path)] = (size, mtime_ns, doc_ids)
+
+    def _remove_file(self, key: Tuple[str, str]) -> List[int]:
+        # Prefix entries are left for the caller to drop with _drop_prefixes, once per batch.
+        known = self._files.pop(key, None)
+        if known is None:
+            return []
+        for doc_id in known[2]:
+            doc = self._docs.pop(doc_id, None)
+            if doc is None:
+                continue
+            lowered = doc[4]
+            for gram in _trigrams(lowered):
+                postings = self._trigrams.get(gram)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._trigrams[gram]
+        return known[2]
+
+    def _drop_prefixes(self, doc_ids: Set[int]) -> None:
+        if doc_ids:
+            self._prefixes = [item for item in self._prefixes if item[1] not in doc_ids]
+
+    def _sort_prefixes(self) -> None:
+        if not self._prefixes_sorted:
+            self._prefixes.sort()
+            self._prefixes_sorted = True
+
+    def search(self, query: str, limit: int = 50) -> List[SearchResult]:
+        needle = query.strip().lower()
+        if not needle:
+            return []
+        with self._lock:
+            self._sort_prefixes()
+            candidates: Dict[int, float] = {}
+            index = bisect.bisect_left(self._prefixes, (needle, -1))
+            while index < len(self._prefixes) and self._prefixes[index][0].startswith(needle):
+                candidates[self._prefixes[index][1]] = 1.0
+                if len(candidates) >= MAX_PREFIX_CANDIDATES:
+                    break
+                index += 1
+
+            if len(needle) >= 3:
+                grams = _trigrams(needle, pad_end=False)
+                counts: Dict[int, int] = {}
+                for gram in grams:
+                    for doc_id in self._trigrams.get(gram, ()):
+                        counts[doc_id] = counts.get(doc_id, 0) + 1
+                for doc_id, count in counts.items():
+                    similarity = count / len(grams)
+                    if similarity >= MIN_FUZZY_SCORE:
+                        candidates[doc_id] = max(candidates.get(doc_id, 0.0), similarity)
+
+            results = []
+            for doc_id, similarity in candidates.items():
+                pack, rel_path, kind, term, lowered = self._docs[doc_id]
+                score = similarity
+                keys = _prefix_keys(lowered)
+                if lowered == needle:
+                    score += 3.0
+                elif needle in keys:
+                    score += 2.5
+                elif lowered.startswith(needle):
+                    score += 2.0
+                elif any(key.startswith(needle) for key in keys):
+                    score += 1.5
+                elif needle in lowered:
+                    score += 1.0
+                if kind != KIND_FILE:
+                    score += 0.25
+                score -= min(len(lowered) - len(needle), 40) / 400
+                results.append(SearchResult(pack, rel_path, kind, term, score))
+        results.sort(key=lambda result: (-result.score, result.term, result.pack, result.rel_path))
+        return results[:limit]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            packs: Dict[str, Dict[str, list]] = {}
+            for (pack, rel_path), (size, mtime_ns, doc_ids) in self._files.items():
+                terms = [[self._docs[doc_id][2], self._docs[doc_id][3]] for doc_id in doc_ids]
+                packs.setdefault(pack, {})[rel_path] = [size, mtime_ns, terms]
+        return {"version": SEARCH_INDEX_VERSION, "packs": packs}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AssetSearchIndex":
+        index = cls()
+        if not isinstance(data, dict) or data.get("version") != SEARCH_INDEX_VERSION:
+            return index
+        packs = data.get("packs")
+        if not isinstance(packs, dict):
+            return index
+        for pack, files in packs.items():
+            if not isinstance(files, dict):
+                continue
+            for rel_path, record in files.items():
+                try:
+                    size, mtime_ns, terms = record
+                    index._add_file(pack, rel_path, int(size), int(mtime_ns), [(k, t) for k, t in terms])
+                except (TypeError, ValueError):
+                    continue
+        return index
+
+
+def index_cache_path(root_path: Path) -> Path:
+    digest = hashlib.sha1(str(root_path).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / "search" / f"{digest}.json"
+
+
+def load_index(root_path: Path) -> AssetSearchIndex:
+    cache_path = index_cache_path(root_path)
+    try:
+        data = load(cache_path)
+    except (OSError, JsonParseError):
+        return AssetSearchIndex()
+    return AssetSearchIndex.from_dict(data)
+
+
+def save_index(root_path: Path, index: AssetSearchIndex) -> None:
+    cache_path = index_cache_path(root_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_atomic(cache_path, index.to_dict(), indent=None)
+
+
+def build_index(root_path: Path, index: Optional[AssetSearchIndex] = None) -> AssetSearchIndex:
+    if index is None:
+        index = load_index(root_path)
+    if index.update_root(root_path):
+        save_index(root_path, index)
+    return index
@@ -0,0 +1,335 @@
+﻿import hashlib
+import os
+import shutil
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .file_plan import FilePlan, execute_plan
+from .jsonio import JsonParseError, dumps, load, loads
+from .scanner import walk_files
+
+SNAPSHOT_DIR_NAME = ".goldstar_snapshots"
+DEFAULT_KEEP = 20
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    snapshot_id: str
+    created: float
+    label: str
+    packs: Dict[str, Optional[str]]
+
+
+@dataclass
+class RestoreReport:
+    snapshot_id: str
+    written: List[Path] = field(default_factory=list)
+    deleted: List[Path] = field(default_factory=list)
+    removed_packs: List[Path] = field(default_factory=list)
+
+
+@dataclass
+class GcReport:
+    removed_snapshots: List[str] = field(default_factory=list)
+    removed_objects: int = 0
+    freed_bytes: int = 0
+
+
+class SnapshotStore:
+    def __init__(self, base: Path) -> None:
+        self.base = base
+        self.path = base / SNAPSHOT_DIR_NAME
+        self.objects_dir = self.path / "objects"
+        self.trees_dir = self.path / "trees"
+        self.manifests_dir = self.path / "snapshots"
+        self._tree_cache: Dict[str, dict] = {}
+
+    def pack_key(self, pack_dir: Path) -> str:
+        try:
+            return pack_dir.relative_to(self.base).as_posix()
+        except ValueError:
+            return pack_dir.as_posix()
+
+    def pack_dir(self, key: str) -> Path:
+        path = Path(key)
+        return path if path.is_absolute() else self.base / path
+
+    def list(self) -> List[Snapshot]:
+        try:
+            names = sorted(item.name for item in os.scandir(self.manifests_dir) if item.name.endswith(".json"))
+        except OSError:
+            return []
+        snapshots = []
+        for name in names:
+            try:
+                snapshots.append(self._read_manifest(self.manifests_dir / name))
+            except (OSError, ValueError, KeyError):
+                continue
+        return snapshots
+
+    def get(self, snapshot_id: str) -> Snapshot:
+        path = self.manifests_dir / f"{snapshot_id}.json"
+        if not path.is_file():
+            matches = [snapshot for snapshot in self.list() if snapshot.snapshot_id.startswith(snapshot_id)]
+            if len(matches) != 1:
+                raise KeyError(snapshot_id)
+            return matches[0]
+        return self._read_manifest(path)
+
+    def create(self, pack_dirs: Iterable[Path], label: str) -> Snapshot:
+        previous = self._latest_trees()
+        packs: Dict[str, Optional[str]] = {}
+        for pack_dir in pack_dirs:
+            key = self.pack_key(pack_dir)
+            if not pack_dir.is_dir():
+                packs[key] = None
+                continue
+            previous_tree = self._read_tree(previous[key]) if previous.get(key) else None
+            packs[key] = self._snapshot_dir(pack_dir, previous_tree)
+
+        created = time.time()
+        snapshot_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(created)) + f"-{uuid.uuid4().hex[:6]}"
+        snapshot = Snapshot(snapshot_id, created, label, packs)
+        manifest = {"id": snapshot_id, "created": created, "label": label, "packs": packs}
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.manifests_dir / f"{snapshot_id}.json", dumps(manifest).encode("utf-8"))
+        return snapshot
+
+    def restore(self, snapshot_id: str, pack_keys: Optional[Iterable[str]] = None) -> RestoreReport:
+        snapshot = self.get(snapshot_id)
+        keys = list(pack_keys) if pack_keys is not None else list(snapshot.packs)
+        for key in keys:
+            if key not in snapshot.packs:
+                raise KeyError(key)
+        self.create([self.pack_dir(key) for key in keys], f"before restore {snapshot.snapshot_id}")
+
+        report = RestoreReport(snapshot.snapshot_id)
+        plan = FilePlan(self.base)
+        mtimes: List[Tuple[Path, int]] = []
+        for key in keys:
+            pack_dir = self.pack_dir(key)
+            wanted = dict(self._iter_tree(snapshot.packs[key], "")) if snapshot.packs[key] else {}
+            current = {rel: (size, mtime) for rel, size, mtime in walk_files(pack_dir)} if pack_dir.is_dir() else {}
+            for rel, (digest, size, mtime) in wanted.items():
+                if current.get(rel) == (size, mtime):
+                    continue
+                destination = pack_dir / rel
+                plan.copy(self._object_path(digest), destination, overwrite=True)
+                mtimes.append((destination, mtime))
+                report.written.append(destination)
+            for rel in current:
+                if rel not in wanted:
+                    plan.delete(pack_dir / rel)
+                    report.deleted.append(pack_dir / rel)
+
+        execute_plan(plan)
+        for destination, mtime in mtimes:
+            os.utime(destination, ns=(mtime, mtime))
+        for key in keys:
+            pack_dir = self.pack_dir(key)
+            if snapshot.packs[key] is None and pack_dir.is_dir():
+                shutil.rmtree(pack_dir)
+                report.removed_packs.append(pack_dir)
+            elif report.deleted:
+                _remove_empty_dirs(pack_dir)
+        return report
+
+    def gc(self, keep: int = DEFAULT_KEEP, max_age_days: Optional[float] = None) -> GcReport:
+        report = GcReport()
+        snapshots = self.list()
+        retained = snapshots[-keep:] if keep > 0 else []
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            retained = [snapshot for snapshot in retained if snapshot.created >= cutoff]
+        retained_ids = {snapshot.snapshot_id for snapshot in retained}
+        for snapshot in snapshots:
+            if snapshot.snapshot_id not in retained_ids:
+                (self.manifests_dir / f"{snapshot.snapshot_id}.json").unlink(missing_ok=True)
+                report.removed_snapshots.append(snapshot.snapshot_id)
+
+        trees: Set[str] = set()
+        objects: Set[str] = set()
+        for snapshot in retained:
+            for digest in snapshot.packs.values():
+                if digest:
+                    self._mark(digest, trees, objects)
+        for directory, reachable in ((self.objects_dir, objects), (self.trees_dir, trees)):
+            for path in _iter_store_files(directory):
+                if path.name in reachable:
+                    continue
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except OSError:
+                    continue
+                report.removed_objects += 1
+                report.freed_bytes += size
+        self._tree_cache.clear()
+        return report
+
+    def size(self) -> int:
+        total = 0
+        for directory in (self.objects_dir, self.trees_dir, self.manifests_dir):
+            for path in _iter_store_files(directory):
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    continue
+        return total
+
+    def _snapshot_dir(self, directory: Path, previous: Optional[dict]) -> str:
+        previous_files = previous.get("files", {}) if previous else {}
+        previous_dirs = previous.get("dirs", {}) if previous else {}
+        files: Dict[str, list] = {}
+        dirs: Dict[str, str] = {}
+        with os.scandir(directory) as it:
+            items = sorted((item for item in it if not item.name.startswith(".")), key=lambda item: item.name)
+        for item in items:
+            if item.is_dir(follow_symlinks=False):
+                child_previous = previous_dirs.get(item.name)
+                dirs[item.name] = self._snapshot_dir(
+                    Path(item.path), self._read_tree(child_previous) if child_previous else None
+                )
+            elif item.is_file():
+                stat = item.stat()
+                entry = previous_files.get(item.name)
+                # Unchanged size and mtime: reuse the recorded hash instead of reading the file again.
+                if entry and entry[1] == stat.st_size and entry[2] == stat.st_mtime_ns:
+                    digest = entry[0]
+                else:
+                    digest = self._store_file(Path(item.path))
+                files[item.name] = [digest, stat.st_size, stat.st_mtime_ns]
+        return self._store_tree({"files": files, "dirs": dirs})
+
+    def _store_file(self, path: Path) -> str:
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.is_file():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, object_path)
+        return digest
+
+    def _store_tree(self, tree: dict) -> str:
+        data = dumps(tree, indent=None, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        tree_path = self._tree_path(digest)
+        if not tree_path.is_file():
+            tree_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(tree_path, zlib.compress(data, 6))
+        self._tree_cache[digest] = tree
+        return digest
+
+    def _read_tree(self, digest: str) -> dict:
+        tree = self._tree_cache.get(digest)
+        if tree is None:
+            tree = loads(zlib.decompress(self._tree_path(digest).read_bytes()), digest)
+            self._tree_cache[digest] = tree
+        return tree
+
+    def _iter_tree(self, digest: str, prefix: str) -> Iterator[Tuple[str, Tuple[str, int, int]]]:
+        tree = self._read_tree(digest)
+        for name, (file_digest, size, mtime) in tree["files"].items():
+            yield f"{prefix}{name}", (file_digest, size, mtime)
+        for name, child in tree["dirs"].items():
+            yield from self._iter_tree(child, f"{prefix}{name}/")
+
+    def _mark(self, digest: str, trees: Set[str], objects: Set[str]) -> None:
+        if digest in trees:
+            return
+        trees.add(digest)
+        try:
+            tree = self._read_tree(digest)
+        except (OSError, JsonParseError, zlib.error):
+            return
+        for entry in tree["files"].values():
+            objects.add(entry[0])
+        for child in tree["dirs"].values():
+            self._mark(child, trees, objects)
+
+    def _latest_trees(self) -> Dict[str, str]:
+        latest: Dict[str, str] = {}
+        for snapshot in self.list():
+            for key, digest in snapshot.packs.items():
+                if digest:
+                    latest[key] = digest
+        return latest
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _tree_path(self, digest: str) -> Path:
+        return self.trees_dir / digest[:2] / digest
+
+    def _read_manifest(self, path: Path) -> Snapshot:
+        data = load(path)
+        return Snapshot(data["id"], float(data["created"]), data.get("label", ""), dict(data["packs"]))
+
+
+def snapshot_store(resource_root: Path) -> SnapshotStore:
+    return SnapshotStore(resource_root.parent)
+
+
+def take_snapshot(resource_root: Path, pack_dirs: Iterable[Path], label: str, keep: int = DEFAULT_KEEP) -> Snapshot:
+    store = snapshot_store(resource_root)
+    snapshot = store.create(pack_dirs, label)
+    if len(store.list()) > keep:
+        store.gc(keep)
+    return snapshot
+
+
+def plan_pack_dirs(plan: FilePlan) -> List[Path]:
+    pack_dirs = []
+    for operation in plan.operations:
+        try:
+            parts = operation.destination.relative_to(plan.staging_parent).parts
+        except ValueError:
+            continue
+        if len(parts) > 2:
+            pack_dir = plan.staging_parent / parts[0] / parts[1]
+            if pack_dir not in pack_dirs:
+                pack_dirs.append(pack_dir)
+    return pack_dirs
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _iter_store_files(directory: Path) -> Iterator[Path]:
+    try:
+        buckets = list(os.scandir(directory))
+    except OSError:
+        return
+    for bucket in buckets:
+        if bucket.is_file():
+            yield Path(bucket.path)
+            continue
+        try:
+            with os.scandir(bucket.path) as it:
+                for item in it:
+                    yield Path(item.path)
+        except OSError:
+            continue
+
+
+def _remove_empty_dirs(root: Path) -> None:
+    for directory, _, _ in sorted(os.walk(root), key=lambda entry: -len(entry[0])):
+        if directory == str(root):
+            continue
+        try:
+            os.rmdir(directory)
+        except OSError:
+            continue
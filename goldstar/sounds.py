@@ -0,0 +1,306 @@
+﻿import hashlib
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .jsonio import JsonParseError, dump_atomic, load
+from .models import PackIndex
+from .paths import user_cache_dir
+from .roots import format_size
+
+SOUNDS_DIR = "sounds"
+DEFINITIONS_PATH = "sounds/sound_definitions.json"
+# The order the game tries when a definition names a sound without an extension.
+SOUND_EXTENSIONS = (".ogg", ".fsb", ".wav")
+SOUND_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_STREAM_SECONDS = 10.0
+HEADER_BYTES = 4096
+TAIL_BYTES = 64 * 1024
+OPUS_RATE = 48000
+
+ISSUE_MISSING = "missing_file"
+ISSUE_CASE = "case_mismatch"
+ISSUE_UNUSED = "unused_file"
+ISSUE_OVER_BUDGET = "over_budget"
+ISSUE_UNCOMPRESSED = "uncompressed"
+ISSUE_NOT_STREAMED = "not_streamed"
+ISSUE_UNREADABLE = "unreadable"
+
+
+@dataclass(frozen=True)
+class SoundInfo:
+    pack: str
+    rel_path: str
+    size: int
+    codec: str = ""
+    channels: int = 0
+    sample_rate: int = 0
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SoundReference:
+    pack: str
+    event: str
+    name: str
+    stream: bool = False
+
+
+@dataclass(frozen=True)
+class SoundIssue:
+    kind: str
+    path: str
+    detail: str = ""
+    event: str = ""
+
+    def __str__(self) -> str:
+        text = f"{self.kind}: {self.path}"
+        if self.event:
+            text += f" [{self.event}]"
+        return text + (f" ({self.detail})" if self.detail else "")
+
+
+@dataclass
+class SoundAudit:
+    sounds: List[SoundInfo] = field(default_factory=list)
+    references: List[SoundReference] = field(default_factory=list)
+    issues: List[SoundIssue] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    headers_read: int = 0
+
+    @property
+    def events(self) -> int:
+        return len({(reference.pack, reference.event) for reference in self.references})
+
+    @property
+    def total_size(self) -> int:
+        return sum(sound.size for sound in self.sounds)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for issue in self.issues if issue.kind == kind)
+
+
+def read_sound_definitions(pack: str, path: Path) -> List[SoundReference]:
+    data = load(path)
+    if not isinstance(data, dict):
+        return []
+    # format_version 1.14+ nests events under "sound_definitions"; older files list them at the top level.
+    definitions = data.get("sound_definitions", data)
+    references = []
+    for event, definition in definitions.items() if isinstance(definitions, dict) else ():
+        if not isinstance(definition, dict):
+            continue
+        sounds = definition.get("sounds")
+        for sound in sounds if isinstance(sounds, list) else []:
+            if isinstance(sound, str):
+                references.append(SoundReference(pack, event, sound))
+            elif isinstance(sound, dict) and isinstance(sound.get("name"), str):
+                references.append(SoundReference(pack, event, sound["name"], bool(sound.get("stream", False))))
+    return references
+
+
+def read_audio_header(path: Path) -> Tuple[str, int, int, Optional[float]]:
+    with path.open("rb") as handle:
+        head = handle.read(HEADER_BYTES)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _read_wav(handle)
+        if head[:4] == b"OggS":
+            return _read_ogg(handle, head)
+        if head[:3] == b"FSB":
+            return "fsb", 0, 0, None
+    raise ValueError("unknown audio container")
+
+
+def _read_wav(handle) -> Tuple[str, int, int, Optional[float]]:
+    handle.seek(12)
+    codec, channels, sample_rate, byte_rate = "", 0, 0, 0
+    while True:
+        chunk = handle.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"fmt ":
+            fmt = handle.read(chunk_size)
+            if len(fmt) < 16:
+                raise ValueError("truncated fmt chunk")
+            tag, channels, sample_rate, byte_rate = struct.unpack("<HHII", fmt[:12])
+            # 0xFFFE (extensible) carries plain PCM in every file the game accepts.
+            codec = "pcm" if tag in (1, 0xFFFE) else f"wav:{tag}"
+            if chunk_size % 2:
+                handle.seek(1, 1)
+        elif chunk_id == b"data":
+            if not codec:
+                raise ValueError("data chunk before fmt chunk")
+            duration = chunk_size / byte_rate if byte_rate else None
+            return codec, channels, sample_rate, duration
+        else:
+            handle.seek(chunk_size + chunk_size % 2, 1)
+    raise ValueError("no data chunk")
+
+
+def _read_ogg(handle, head: bytes) -> Tuple[str, int, int, Optional[float]]:
+    segments = head[26] if len(head) > 26 else 0
+    packet = head[27 + segments :]
+    if packet[:7] == b"\x01vorbis" and len(packet) >= 16:
+        codec = "vorbis"
+        channels = packet[11]
+        sample_rate = struct.unpack("<I", packet[12:16])[0]
+        pre_skip, clock = 0, sample_rate
+    elif packet[:8] == b"OpusHead" and len(packet) >= 16:
+        codec = "opus"
+        channels = packet[9]
+        pre_skip, sample_rate = struct.unpack("<HI", packet[10:16])
+        clock = OPUS_RATE
+    else:
+        raise ValueError("unsupported ogg codec")
+
+    # The last page's granule position is the total sample count, so only the tail is read.
+    handle.seek(0, 2)
+    size = handle.tell()
+    handle.seek(max(0, size - TAIL_BYTES))
+    tail = handle.read()
+    position = tail.rfind(b"OggS")
+    while position >= 0:
+        granule = struct.unpack("<q", tail[position + 6 : position + 14])[0] if position + 14 <= len(tail) else -1
+        if granule >= 0:
+            return codec, channels, sample_rate, max(0, granule - pre_skip) / clock if clock else None
+        position = tail.rfind(b"OggS", 0, position)
+    return codec, channels, sample_rate, None
+
+
+class SoundHeaderCache:
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._entries: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if path is not None:
+            try:
+                data = load(path)
+            except (OSError, JsonParseError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == SOUND_CACHE_VERSION:
+                files = data.get("files")
+                self._entries = files if isinstance(files, dict) else {}
+
+    def get(self, pack: str, pack_path: Path, rel_path: str, size: int, mtime_ns: int) -> SoundInfo:
+        key = f"{pack}/{rel_path}"
+        entry = self._entries.get(key)
+        if isinstance(entry, list) and len(entry) == 7 and entry[0] == size and entry[1] == mtime_ns:
+            self.hits += 1
+            return SoundInfo(pack, rel_path, size, entry[2], entry[3], entry[4], entry[5], entry[6])
+        self.misses += 1
+        try:
+            codec, channels, sample_rate, duration = read_audio_header(pack_path / rel_path)
+            error = None
+        except (OSError, ValueError, struct.error) as exc:
+            codec, channels, sample_rate, duration, error = "", 0, 0, None, str(exc)
+        self._entries[key] = [size, mtime_ns, codec, channels, sample_rate, duration, error]
+        self._dirty = True
+        return SoundInfo(pack, rel_path, size, codec, channels, sample_rate, duration, error)
+
+    def prune(self, keys: Iterable[str]) -> None:
+        keep = set(keys)
+        for key in [key for key in self._entries if key not in keep]:
+            del self._entries[key]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        dump_atomic(self.path, {"version": SOUND_CACHE_VERSION, "files": self._entries}, indent=None)
+        self._dirty = False
+
+
+def sound_cache_path(root_path: Path) -> Path:
+    digest = hashlib.sha1(str(root_path).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / "sounds" / f"{digest}.json"
+
+
+def audit_sounds(
+    indexes: Iterable[PackIndex],
+    cache: Optional[SoundHeaderCache] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    stream_seconds: float = DEFAULT_STREAM_SECONDS,
+) -> SoundAudit:
+    cache = cache if cache is not None else SoundHeaderCache()
+    audit = SoundAudit()
+    misses = cache.misses
+    by_path: Dict[str, SoundInfo] = {}
+    by_lower: Dict[str, str] = {}
+    for index in indexes:
+        for entry in index.files_under(SOUNDS_DIR):
+            if not entry.rel_path.lower().endswith(SOUND_EXTENSIONS):
+                continue
+            sound = cache.get(index.name, index.path, entry.rel_path, entry.size, entry.mtime_ns)
+            audit.sounds.append(sound)
+            # Packs stack in game, so a definition may point at a file shipped by any BLF_ pack.
+            by_path.setdefault(entry.rel_path, sound)
+            by_lower.setdefault(entry.rel_path.lower(), entry.rel_path)
+        if DEFINITIONS_PATH in index:
+            try:
+                audit.references.extend(read_sound_definitions(index.name, index.path / DEFINITIONS_PATH))
+            except (OSError, JsonParseError) as exc:
+                audit.errors.append(str(exc))
+    audit.headers_read = cache.misses - misses
+    cache.prune(f"{sound.pack}/{sound.rel_path}" for sound in audit.sounds)
+
+    used: Dict[str, List[SoundReference]] = {}
+    for reference in audit.references:
+        rel_path = _resolve(reference.name, by_path, by_lower)
+        if rel_path is None:
+            audit.issues.append(SoundIssue(ISSUE_MISSING, reference.name, reference.pack, reference.event))
+            continue
+        if rel_path not in by_path:
+            audit.issues.append(SoundIssue(ISSUE_CASE, reference.name, by_lower[rel_path.lower()], reference.event))
+            rel_path = by_lower[rel_path.lower()]
+        used.setdefault(rel_path, []).append(reference)
+
+    for sound in audit.sounds:
+        location = f"{sound.pack}/{sound.rel_path}"
+        if sound.error:
+            audit.issues.append(SoundIssue(ISSUE_UNREADABLE, location, sound.error))
+        if sound.rel_path not in used:
+            audit.issues.append(SoundIssue(ISSUE_UNUSED, location, _describe(sound)))
+            continue
+        if sound.size > max_bytes:
+            audit.issues.append(SoundIssue(ISSUE_OVER_BUDGET, location, _describe(sound)))
+        if sound.codec == "pcm":
+            audit.issues.append(SoundIssue(ISSUE_UNCOMPRESSED, location, _describe(sound)))
+        if sound.duration is not None and sound.duration > stream_seconds:
+            # Non-streamed sounds are decoded into memory in full.
+            for reference in used[sound.rel_path]:
+                if not reference.stream:
+                    audit.issues.append(SoundIssue(ISSUE_NOT_STREAMED, location, _describe(sound), reference.event))
+    cache.save()
+    return audit
+
+
+def _resolve(name: str, by_path: Dict[str, SoundInfo], by_lower: Dict[str, str]) -> Optional[str]:
+    name = name.strip().lstrip("/")
+    candidates = [name] if name.lower().endswith(SOUND_EXTENSIONS) else [name + ext for ext in SOUND_EXTENSIONS]
+    for candidate in candidates:
+        if candidate in by_path:
+            return candidate
+    for candidate in candidates:
+        if candidate.lower() in by_lower:
+            return candidate
+    return None
+
+
+def _describe(sound: SoundInfo) -> str:
+    parts = [format_size(sound.size)]
+    if sound.codec:
+        parts.append(sound.codec)
+    if sound.channels:
+        parts.append(f"{sound.channels}ch")
+    if sound.sample_rate:
+        parts.append(f"{sound.sample_rate} Hz")
+    if sound.duration is not None:
+        parts.append(f"{sound.duration:.1f}s")
+    return ", ".join(parts)
@@ -0,0 +1,232 @@
+﻿import hashlib
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .file_plan import FilePlan
+from .jsonio import JsonParseError, dump_atomic, load
+from .pack_ops import plan_manifest_subpacks
+from .paths import user_cache_dir
+from .pixels import RGBAImage, decode_image, encode_png, encode_tga, shrink_rgba
+
+SUBPACKS_DIR = "subpacks"
+TEXTURE_DIRS = ("textures/entity",)
+TEXTURE_SUFFIXES = (".png", ".tga")
+MIN_TEXTURE_SIZE = 16
+SUBPACK_STATE_VERSION = 1
+# Starting worker processes costs more than shrinking a handful of textures in-process.
+MIN_POOL_JOBS = 8
+SHRINK_ERRORS = (ValueError, IndexError, struct.error, zlib.error)
+
+
+@dataclass(frozen=True)
+class MemoryTier:
+    folder: str
+    name: str
+    memory_tier: int
+    scale: int
+
+    def manifest_entry(self) -> dict:
+        return {"folder_name": self.folder, "name": self.name, "memory_tier": self.memory_tier}
+
+
+# memory_tier counts 0.25 GB steps of device memory; the game offers a subpack only when the device has that much.
+DEFAULT_TIERS = (
+    MemoryTier("low", "Low memory (1/4 textures)", 0, 4),
+    MemoryTier("medium", "Medium memory (1/2 textures)", 1, 2),
+    MemoryTier("full", "Full textures", 2, 1),
+)
+
+
+@dataclass
+class SubpackReport:
+    pack: str
+    textures: int = 0
+    rebuilt: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    manifest_changed: bool = False
+    bytes_before: int = 0
+    bytes_after: Dict[str, int] = field(default_factory=dict)
+
+
+def parse_tier(text: str) -> MemoryTier:
+    parts = text.split(":")
+    if len(parts) != 3 or not parts[0] or not parts[1].isdigit() or not parts[2].isdigit() or int(parts[2]) < 1:
+        raise ValueError(f"expected folder:memory_tier:scale, got {text!r}")
+    folder, memory_tier, scale = parts[0], int(parts[1]), int(parts[2])
+    name = "Full textures" if scale == 1 else f"{folder} (1/{scale} textures)"
+    return MemoryTier(folder, name, memory_tier, scale)
+
+
+def subpack_state_path(pack_dir: Path) -> Path:
+    digest = hashlib.sha1(str(pack_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / "subpacks" / f"{digest}.json"
+
+
+def load_subpack_state(path: Path) -> dict:
+    try:
+        data = load(path)
+    except (OSError, JsonParseError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SUBPACK_STATE_VERSION:
+        return {}
+    return data
+
+
+def save_subpack_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dump_atomic(path, dict(state, version=SUBPACK_STATE_VERSION), indent=None)
+
+
+def texture_files(pack_dir: Path) -> List[Tuple[str, int, int]]:
+    found = []
+    for texture_dir in TEXTURE_DIRS:
+        stack = [pack_dir / texture_dir]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(Path(entry.path))
+                elif entry.name.lower().endswith(TEXTURE_SUFFIXES):
+                    stat = entry.stat()
+                    rel_path = Path(entry.path).relative_to(pack_dir).as_posix()
+                    found.append((rel_path, stat.st_size, stat.st_mtime_ns))
+    return sorted(found)
+
+
+def _usable_scale(width: int, height: int, scale: int) -> int:
+    # Only whole divisors keep the aspect ratio, so UVs still line up on the smaller texture.
+    while scale > 1 and (width % scale or height % scale or min(width, height) // scale < MIN_TEXTURE_SIZE):
+        scale //= 2
+    return scale
+
+
+def shrink_texture(path: Path, scales: Sequence[int]) -> Tuple[List[Optional[bytes]], Optional[str]]:
+    try:
+        image = decode_image(path.read_bytes(), path.suffix, str(path))
+        outputs: List[Optional[bytes]] = []
+        shrunk: Dict[int, RGBAImage] = {1: image}
+        for scale in scales:
+            scale = _usable_scale(image.width, image.height, scale)
+            if scale == 1:
+                outputs.append(None)
+                continue
+            if scale not in shrunk:
+                # Halving the previous level is cheaper than filtering the full image again.
+                previous = max(level for level in shrunk if scale % level == 0)
+                shrunk[scale] = shrink_rgba(shrunk[previous], scale // previous)
+            encode = encode_tga if path.suffix.lower() == ".tga" else encode_png
+            outputs.append(encode(shrunk[scale]))
+        return outputs, None
+    except (OSError,) + SHRINK_ERRORS as exc:
+        return [], str(exc)
+
+
+def _shrink_many(paths: List[Path], scales: Tuple[int, ...], workers: Optional[int]):
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) < MIN_POOL_JOBS:
+        return [shrink_texture(path, scales) for path in paths]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            chunk = max(1, len(paths) // (workers * 4))
+            return list(pool.map(shrink_texture, paths, [scales] * len(paths), chunksize=chunk))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return [shrink_texture(path, scales) for path in paths]
+
+
+def plan_subpacks(
+    plan: FilePlan,
+    pack_dir: Path,
+    tiers: Iterable[MemoryTier] = DEFAULT_TIERS,
+    state: Optional[dict] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Tuple[SubpackReport, dict]:
+    tiers = list(tiers)
+    scaled = [tier for tier in tiers if tier.scale > 1]
+    scales = tuple(tier.scale for tier in scaled)
+    report = SubpackReport(pack_dir.name)
+    state = state or {}
+    folders = [tier.folder for tier in tiers]
+    # Tiers this tool built before but that are no longer requested are taken out of the pack.
+    dropped = [folder for folder in state.get("folders", []) if folder not in folders]
+    entries = [tier.manifest_entry() for tier in tiers]
+    report.manifest_changed = plan_manifest_subpacks(plan, pack_dir, entries, dropped)
+    for folder in dropped:
+        for rel_path, _, _ in texture_files(pack_dir / SUBPACKS_DIR / folder):
+            plan.delete(pack_dir / SUBPACKS_DIR / folder / rel_path)
+            report.removed.append(f"{folder}/{rel_path}")
+
+    layout = {tier.folder: tier.scale for tier in scaled}
+    # Changing the tier layout invalidates every output, not just the textures that changed.
+    known = state.get("files") if state.get("tiers") == layout and not force else None
+    known = known if isinstance(known, dict) else {}
+    textures = texture_files(pack_dir)
+    report.textures = len(textures)
+    report.bytes_before = sum(size for _, size, _ in textures)
+
+    def outputs(rel_path: str) -> List[Path]:
+        return [pack_dir / SUBPACKS_DIR / tier.folder / rel_path for tier in scaled]
+
+    files: Dict[str, list] = {}
+    report.bytes_after = {tier.folder: 0 for tier in scaled}
+    todo = []
+    for rel_path, size, mtime_ns in textures:
+        entry = known.get(rel_path)
+        sizes = [_file_size(path) for path in outputs(rel_path)]
+        if (
+            isinstance(entry, list)
+            and entry[:2] == [size, mtime_ns]
+            and [int(found is not None) for found in sizes] == entry[2:]
+        ):
+            files[rel_path] = entry
+            for tier, found in zip(scaled, sizes):
+                report.bytes_after[tier.folder] += found or 0
+        else:
+            todo.append((rel_path, size, mtime_ns))
+
+    results = _shrink_many([pack_dir / rel_path for rel_path, _, _ in todo], scales, workers)
+    for (rel_path, size, mtime_ns), (data, error) in zip(todo, results):
+        if error:
+            report.errors.append(f"{rel_path}: {error}")
+            continue
+        for tier, path, output in zip(scaled, outputs(rel_path), data):
+            if output is not None:
+                plan.write_bytes(path, output, overwrite=True)
+                report.bytes_after[tier.folder] += len(output)
+            elif path.is_file():
+                # Too small to shrink for this tier: the main pack's texture is used instead.
+                plan.delete(path)
+        files[rel_path] = [size, mtime_ns] + [int(output is not None) for output in data]
+        report.rebuilt.append(rel_path)
+
+    current = {rel_path for rel_path, _, _ in textures}
+    for tier in scaled:
+        tier_root = pack_dir / SUBPACKS_DIR / tier.folder
+        for rel_path, _, _ in texture_files(tier_root):
+            if rel_path not in current and plan.planned(tier_root / rel_path) is None:
+                plan.delete(tier_root / rel_path)
+                report.removed.append(f"{tier.folder}/{rel_path}")
+    return report, {"folders": folders, "tiers": layout, "files": files}
+
+
+def _file_size(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def ensure_subpack_dirs(pack_dir: Path, tiers: Iterable[MemoryTier] = DEFAULT_TIERS) -> None:
+    # Tiers that reuse the main pack's textures still need their folder to exist.
+    for tier in tiers:
+        (pack_dir / SUBPACKS_DIR / tier.folder).mkdir(parents=True, exist_ok=True)
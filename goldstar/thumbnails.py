@@ -0,0 +1,142 @@
+﻿import hashlib
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .images import PIL_AVAILABLE, write_scaled_png
+from .jsonio import JsonParseError, dump_atomic, load
+from .paths import user_cache_dir
+
+THUMBNAIL_SIZES = (48, 128)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir: Optional[Path] = None, sizes: Optional[Iterable[int]] = THUMBNAIL_SIZES) -> None:
+        self.cache_dir = cache_dir or user_cache_dir() / "thumbnails"
+        self.sizes = tuple(sizes) if sizes is not None else None
+        self._lock = threading.Lock()
+        self._hash_index_path = self.cache_dir / "hashes.json"
+        self._hashes: Dict[str, Tuple[int, int, str]] = self._load_hash_index()
+
+    def _load_hash_index(self) -> Dict[str, Tuple[int, int, str]]:
+        try:
+            data = load(self._hash_index_path)
+        except (OSError, JsonParseError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {key: tuple(value) for key, value in data.items() if isinstance(value, list) and len(value) == 3}
+
+    def _save_hash_index(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {key: list(value) for key, value in self._hashes.items()}
+        dump_atomic(self._hash_index_path, data, indent=None)
+
+    def _hash_for(self, source: Path) -> str:
+        # Size + mtime stand in for the content hash so unchanged files are never re-read.
+        stat = source.stat()
+        key = str(source.resolve())
+        with self._lock:
+            known = self._hashes.get(key)
+        if known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = content_hash(source)
+        with self._lock:
+            self._hashes[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        try:
+            self._save_hash_index()
+        except OSError:
+            pass
+        return digest
+
+    def cache_path(self, digest: str, size: int) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}_{size}.png"
+
+    def get(self, source: Path, size: int, write: Callable[[Path, Path, int], None] = write_scaled_png) -> Path:
+        if self.sizes is not None and size not in self.sizes:
+            raise ValueError(f"Unsupported thumbnail size: {size}")
+        destination = self.cache_path(self._hash_for(source), size)
+        if not destination.is_file():
+            write(source, destination, size)
+        return destination
+
+
+class ThumbnailLoader:
+    def __init__(self, cache: Optional[ThumbnailCache] = None) -> None:
+        self.cache = cache or ThumbnailCache()
+        self._requests: "queue.Queue[Optional[Tuple[str, Path, int]]]" = queue.Queue()
+        self._results: "queue.Queue[Tuple[str, Path, int, Optional[Path], Optional[Exception]]]" = queue.Queue()
+        self._callbacks: Dict[str, Tuple[Path, int, Callable]] = {}
+        self._thread: Optional[threading.Thread] = None
+        # Without Pillow a 4K texture takes seconds of pure-Python decoding; a child process keeps the GIL free for Tk.
+        self._use_pool = not PIL_AVAILABLE
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def request(self, slot: str, source: Path, size: int, callback: Callable) -> None:
+        # Only the newest request per slot is delivered; older ones are dropped.
+        self._callbacks[slot] = (source, size, callback)
+        self._requests.put((slot, source, size))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def cancel(self, slot: str) -> None:
+        self._callbacks.pop(slot, None)
+
+    def _run(self) -> None:
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            slot, source, size = item
+            current = self._callbacks.get(slot)
+            if current is None or current[0] != source or current[1] != size:
+                continue
+            try:
+                self._results.put((slot, source, size, self.cache.get(source, size, self._write), None))
+            except Exception as exc:
+                self._results.put((slot, source, size, None, exc))
+
+    def _write(self, source: Path, destination: Path, size: int) -> None:
+        future = None
+        if self._use_pool:
+            try:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=1)
+                future = self._pool.submit(write_scaled_png, source, destination, size)
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # Some sandboxes forbid child processes; decoding on this thread is only slower.
+                self._use_pool = False
+        if future is None:
+            write_scaled_png(source, destination, size)
+        else:
+            future.result()
+
+    def deliver(self) -> None:
+        # Call from the Tk thread; callbacks receive (cache_path, error).
+        while True:
+            try:
+                slot, source, size, path, error = self._results.get_nowait()
+            except queue.Empty:
+                return
+            current = self._callbacks.get(slot)
+            if current is None or current[0] != source or current[1] != size:
+                continue
+            del self._callbacks[slot]
+            current[2](path, error)
+
+    def pending(self) -> bool:
+        return bool(self._callbacks)
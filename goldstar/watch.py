@@ -0,0 +1,290 @@
+﻿import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import DEFAULT_NAMESPACE
+from .archives import is_archive
+from .entity import (
+    EntitySpec,
+    commit_entity_batch,
+    expand_archive_spec,
+    plan_entities,
+    source_issue,
+    validate_entity_spec,
+)
+from .file_plan import PlanIssue
+from .jsonio import JsonParseError, dump_atomic, load, load_or_default
+
+STATE_FILE_NAME = ".goldstar_watch.json"
+LOG_FILE_NAME = "goldstar_watch.log"
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_WATCH_WORKERS = 4
+STATUS_CREATED = "created"
+STATUS_FAILED = "failed"
+# Longest suffixes first so "foo.icon.png" is an icon, not the texture of "foo.icon".
+ROLE_SUFFIXES = [
+    (".animation_controllers.json", "controller"),
+    (".animation.json", "animation"),
+    (".ac.json", "controller"),
+    (".geo.json", "model"),
+    (".icon.png", "icon"),
+    (".png", "texture"),
+    (".tga", "texture"),
+    (".zip", "archive"),
+    (".bbmodel", "archive"),
+]
+REQUIRED_ROLES = ("model", "texture")
+ARCHIVE_ROLE = "archive"
+
+FileSignature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class WatchJob:
+    name: str
+    files: Dict[str, Path] = field(default_factory=dict)
+    signature: FileSignature = ()
+    changed_at: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return ARCHIVE_ROLE in self.files or all(role in self.files for role in REQUIRED_ROLES)
+
+
+@dataclass
+class JobResult:
+    name: str
+    status: str
+    files: List[str]
+    issues: List[PlanIssue] = field(default_factory=list)
+    created: List[Path] = field(default_factory=list)
+    finished: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_CREATED
+
+    def describe(self) -> str:
+        if self.ok:
+            return f"{self.name}: created {len(self.created)} files from {', '.join(self.files)}"
+        return f"{self.name}: failed ({'; '.join(str(issue) for issue in self.issues)})"
+
+
+def split_role(file_name: str) -> Optional[Tuple[str, str]]:
+    lowered = file_name.lower()
+    for suffix, role in ROLE_SUFFIXES:
+        if lowered.endswith(suffix) and len(file_name) > len(suffix):
+            return file_name[: -len(suffix)], role
+    return None
+
+
+def _unexpected_issue(exc: Exception) -> PlanIssue:
+    return PlanIssue("create_failed", {"error": f"{type(exc).__name__}: {exc}"})
+
+
+def group_drop_folder(drop_dir: Path) -> Dict[str, WatchJob]:
+    jobs: Dict[str, WatchJob] = {}
+    stats: Dict[str, List[Tuple[str, int, int]]] = {}
+    with os.scandir(drop_dir) as it:
+        for item in it:
+            if item.name.startswith(".") or not item.is_file():
+                continue
+            split = split_role(item.name)
+            if split is None:
+                continue
+            base, role = split
+            name = base.lower()
+            job = jobs.setdefault(name, WatchJob(name))
+            if role in job.files:
+                continue
+            job.files[role] = Path(item.path)
+            stat = item.stat()
+            stats.setdefault(name, []).append((item.name, stat.st_size, stat.st_mtime_ns))
+    for name, job in jobs.items():
+        job.signature = tuple(sorted(stats.get(name, [])))
+    return jobs
+
+
+class DropFolderWatcher:
+    def __init__(
+        self,
+        drop_dir: Path,
+        resource_root: Path,
+        namespace: str = DEFAULT_NAMESPACE,
+        settle: float = DEFAULT_SETTLE_SECONDS,
+        workers: int = DEFAULT_WATCH_WORKERS,
+        behavior: bool = False,
+        optimize_geometry: bool = False,
+        shared_animations: bool = False,
+        fallback_icon: Optional[Path] = None,
+        on_result: Optional[Callable[[JobResult], None]] = None,
+    ) -> None:
+        self.drop_dir = drop_dir
+        self.resource_root = resource_root
+        self.namespace = namespace
+        self.settle = settle
+        self.workers = max(1, workers)
+        self.behavior = behavior
+        self.optimize_geometry = optimize_geometry
+        self.shared_animations = shared_animations
+        self.fallback_icon = fallback_icon
+        self.on_result = on_result
+        self.state_path = drop_dir / STATE_FILE_NAME
+        self.log_path = drop_dir / LOG_FILE_NAME
+        self.pending: Dict[str, WatchJob] = {}
+        self._state = self._load_state()
+        self._stop = threading.Event()
+
+    def _load_state(self) -> Dict[str, dict]:
+        data = load_or_default(self.state_path)
+        jobs = data.get("jobs") if isinstance(data, dict) else None
+        return jobs if isinstance(jobs, dict) else {}
+
+    def _save_state(self) -> None:
+        try:
+            dump_atomic(self.state_path, {"jobs": self._state})
+        except OSError:
+            pass
+
+    def _already_done(self, job: WatchJob) -> bool:
+        # A job that was handled with exactly these files (names, sizes, mtimes) is not repeated after a restart.
+        entry = self._state.get(job.name)
+        return isinstance(entry, dict) and [list(item) for item in job.signature] == entry.get("signature")
+
+    def poll(self, now: Optional[float] = None) -> List[JobResult]:
+        now = time.time() if now is None else now
+        try:
+            found = group_drop_folder(self.drop_dir)
+        except OSError:
+            return []
+        for name in list(self.pending):
+            if name not in found:
+                del self.pending[name]
+        ready = []
+        for name, job in found.items():
+            if self._already_done(job):
+                self.pending.pop(name, None)
+                continue
+            previous = self.pending.get(name)
+            if previous is None or previous.signature != job.signature:
+                job.changed_at = now
+                self.pending[name] = job
+                previous = job
+            if previous.complete and now - previous.changed_at >= self.settle:
+                ready.append(previous)
+        if not ready:
+            return []
+        for job in ready:
+            del self.pending[job.name]
+        return self.process(ready)
+
+    def process(self, jobs: List[WatchJob]) -> List[JobResult]:
+        # Reading and validating the sources runs in parallel; the commit itself is one transaction.
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+            prepared = list(pool.map(self._prepare, jobs))
+        results: List[JobResult] = []
+        specs = []
+        for job, spec, issues in prepared:
+            if issues:
+                results.append(self._result(job, STATUS_FAILED, issues))
+            else:
+                specs.append((job, spec))
+        if specs:
+            results.extend(self._commit(specs))
+        by_name = {job.name: job for job in jobs}
+        for result in results:
+            job = by_name[result.name]
+            self._state[job.name] = {
+                "signature": [list(item) for item in job.signature],
+                "status": result.status,
+                "issues": [str(issue) for issue in result.issues],
+                "finished": result.finished,
+            }
+            self._log(result)
+            if self.on_result is not None:
+                self.on_result(result)
+        self._save_state()
+        return results
+
+    def _prepare(self, job: WatchJob) -> Tuple[WatchJob, EntitySpec, List[PlanIssue]]:
+        spec = EntitySpec(
+            name=job.name,
+            namespace=self.namespace,
+            model_source=job.files.get(ARCHIVE_ROLE) or job.files.get("model"),
+            texture_source=job.files.get("texture"),
+            animation_source=job.files.get("animation"),
+            controller_source=job.files.get("controller"),
+            icon_source=job.files.get("icon"),
+            optimize_geometry=self.optimize_geometry,
+            shared_animations=self.shared_animations,
+        )
+        try:
+            spec, issues = expand_archive_spec(spec)
+            issues = issues or validate_entity_spec(spec)
+            if issues:
+                return job, spec, issues
+            for path in (spec.model_source, spec.animation_source, spec.controller_source):
+                # Archive members are parsed by plan_entity_files, which reports a bad member the same way.
+                if path is None or is_archive(path):
+                    continue
+                try:
+                    load(path)
+                except (OSError, JsonParseError) as exc:
+                    return job, spec, [source_issue(exc)]
+        except Exception as exc:
+            return job, spec, [_unexpected_issue(exc)]
+        return job, spec, []
+
+    def _commit(self, specs: List[Tuple[WatchJob, EntitySpec]]) -> List[JobResult]:
+        try:
+            batch = commit_entity_batch(
+                self.resource_root,
+                [spec for _, spec in specs],
+                lambda chosen: plan_entities(self.resource_root, chosen, self.behavior, self.fallback_icon),
+            )
+        except Exception as exc:
+            # One job's unexpected error must not stop the watcher; retry alone to find it and fail only that job.
+            if len(specs) > 1:
+                return [result for item in specs for result in self._commit([item])]
+            return [self._result(specs[0][0], STATUS_FAILED, [_unexpected_issue(exc)])]
+        results = []
+        for (job, _), outcome in zip(specs, batch):
+            result = self._result(job, STATUS_FAILED if outcome.issues else STATUS_CREATED, outcome.issues)
+            result.created = outcome.created
+            results.append(result)
+        return results
+
+    def _result(self, job: WatchJob, status: str, issues: List[PlanIssue]) -> JobResult:
+        files = sorted(path.name for path in job.files.values())
+        return JobResult(job.name, status, files, list(issues), [], time.time())
+
+    def _log(self, result: JobResult) -> None:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(result.finished))
+        try:
+            with self.log_path.open("a", encoding="utf-8") as handle:
+                handle.write(f"{stamp} {result.describe()}\n")
+        except OSError:
+            pass
+
+    @property
+    def waiting(self) -> List[WatchJob]:
+        return [job for job in self.pending.values() if job.complete]
+
+    def status(self) -> Dict[str, dict]:
+        return dict(self._state)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, interval: float = DEFAULT_INTERVAL_SECONDS, once: bool = False) -> None:
+        self._stop.clear()
+        while not self._stop.is_set():
+            self.poll()
+            if once and not self.waiting:
+                return
+            self._stop.wait(interval)
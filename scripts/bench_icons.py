@@ -0,0 +1,85 @@
+﻿import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from goldstar.icons import ICON_SIZE, IconCache, IconJob, render_icons  # noqa: E402
+from goldstar.pixels import RGBAImage, encode_png  # noqa: E402
+
+
+def synthetic_texture(seed: int, size: int) -> bytes:
+    rng = random.Random(seed)
+    data = bytearray(rng.getrandbits(8) for _ in range(size * size * 4))
+    data[3::4] = b"\xff" * (size * size)
+    return encode_png(RGBAImage(size, size, data))
+
+
+def synthetic_model(seed: int, bones: int, cubes_per_bone: int, texture_size: int) -> bytes:
+    rng = random.Random(seed)
+    bone_list = []
+    for i in range(bones):
+        bone = {"name": f"bone_{i}", "pivot": [0, rng.uniform(0, 16), 0]}
+        if i:
+            bone["parent"] = f"bone_{rng.randrange(i)}"
+            bone["rotation"] = [rng.choice([0, 15, -30]), rng.choice([0, 45]), 0]
+        bone["cubes"] = [
+            {
+                "origin": [rng.uniform(-8, 4), rng.uniform(0, 20), rng.uniform(-8, 4)],
+                "size": [rng.randint(1, 8), rng.randint(1, 8), rng.randint(1, 8)],
+                "uv": [rng.randrange(texture_size // 2), rng.randrange(texture_size // 2)],
+            }
+            for _ in range(cubes_per_bone)
+        ]
+        bone_list.append(bone)
+    geometry = {
+        "description": {
+            "identifier": f"geometry.bench_{seed}",
+            "texture_width": texture_size,
+            "texture_height": texture_size,
+        },
+        "bones": bone_list,
+    }
+    return json.dumps({"format_version": "1.12.0", "minecraft:geometry": [geometry]}).encode("utf-8")
+
+
+def run(label: str, jobs, size: int, cache: IconCache, workers: int) -> None:
+    start = time.perf_counter()
+    results = render_icons(jobs, size, cache, workers)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if result.png is None)
+    cached = sum(1 for result in results if result.cached)
+    print(
+        f"{label:<18} {elapsed:7.2f} s  {elapsed / len(jobs) * 1000:6.1f} ms/icon  "
+        f"({cached} cached, {failed} failed)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time spawn-egg icon rendering for a batch of entities.")
+    parser.add_argument("--entities", type=int, default=500)
+    parser.add_argument("--bones", type=int, default=8)
+    parser.add_argument("--cubes", type=int, default=3)
+    parser.add_argument("--texture", type=int, default=64)
+    parser.add_argument("--size", type=int, default=ICON_SIZE)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    args = parser.parse_args()
+
+    jobs = [
+        IconJob(synthetic_model(i, args.bones, args.cubes, args.texture), synthetic_texture(i, args.texture))
+        for i in range(args.entities)
+    ]
+    print(f"{args.entities} entities, {args.bones * args.cubes} cubes, {args.texture}px textures, {args.size}px icons")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("single process", jobs, args.size, IconCache(Path(tmp) / "serial"), 1)
+        cache = IconCache(Path(tmp) / "pool")
+        run("process pool", jobs, args.size, cache, args.workers or None)
+        run("cached", jobs, args.size, cache, args.workers or None)
+
+
+if __name__ == "__main__":
+    main()
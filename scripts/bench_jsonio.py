@@ -0,0 +1,98 @@
+﻿import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from goldstar import jsonio  # noqa: E402
+
+
+def synthetic_geometry(bones: int, cubes_per_bone: int) -> dict:
+    rng = random.Random(1)
+
+    def vec():
+        return [round(rng.uniform(-16, 16), 4) for _ in range(3)]
+
+    bone_list = []
+    for i in range(bones):
+        bone = {"name": f"bone_{i}", "pivot": vec(), "rotation": vec()}
+        if i:
+            bone["parent"] = f"bone_{rng.randrange(i)}"
+        bone["cubes"] = [
+            {"origin": vec(), "size": vec(), "uv": [rng.randrange(256), rng.randrange(256)], "inflate": 0.01}
+            for _ in range(cubes_per_bone)
+        ]
+        bone_list.append(bone)
+    return {
+        "format_version": "1.12.0",
+        "minecraft:geometry": [
+            {
+                "description": {
+                    "identifier": "geometry.bench",
+                    "texture_width": 256,
+                    "texture_height": 256,
+                    "visible_bounds_width": 4,
+                    "visible_bounds_height": 4,
+                    "visible_bounds_offset": [0, 1.5, 0],
+                },
+                "bones": bone_list,
+            }
+        ],
+    }
+
+
+def stdlib_load(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def stdlib_dump(data) -> str:
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def best_of(label: str, func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    best = min(timings) * 1000
+    print(f"{label:<28} {best:9.2f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare stdlib json with goldstar.jsonio on a large geometry file.")
+    parser.add_argument("--bones", type=int, default=4000)
+    parser.add_argument("--cubes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_geometry(args.bones, args.cubes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.geo.json"
+        commented = Path(tmp) / "bench_comments.geo.json"
+        text = stdlib_dump(data)
+        path.write_text(text, encoding="utf-8")
+        commented.write_text("// exported by blockbench\n" + text.replace("\n", " // row\n", 50), encoding="utf-8")
+        print(f"{path.stat().st_size / 1e6:.1f} MB geometry, {args.bones} bones, backend: {jsonio.backend_name()}")
+
+        base_load = best_of("load: stdlib json", lambda: stdlib_load(path), args.repeat)
+        fast_load = best_of("load: jsonio", lambda: jsonio.load(path), args.repeat)
+        jsonio.load(path, cached=True)
+        cached_load = best_of("load: jsonio (cached)", lambda: jsonio.load(path, cached=True), args.repeat)
+        best_of("load: jsonio (comments)", lambda: jsonio.load(commented), args.repeat)
+        base_dump = best_of("dump: stdlib json", lambda: stdlib_dump(data), args.repeat)
+        fast_dump = best_of("dump: jsonio", lambda: jsonio.dumps(data), args.repeat)
+
+        print(
+            f"speedup: load {base_load / fast_load:.1f}x, cached load {base_load / max(cached_load, 1e-6):.0f}x, "
+            f"dump {base_dump / fast_dump:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
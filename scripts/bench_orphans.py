@@ -0,0 +1,88 @@
+﻿import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from goldstar.orphans import find_orphans  # noqa: E402
+from goldstar.references import ReferenceIndex  # noqa: E402
+
+
+def write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def synthetic_pack(pack_dir: Path, entities: int, abandon_every: int) -> None:
+    texture_data = {}
+    for i in range(entities):
+        name = f"mob_{i}"
+        if i % abandon_every:
+            write_json(
+                pack_dir / "entity" / f"{name}.entity.json",
+                {
+                    "minecraft:client_entity": {
+                        "description": {
+                            "identifier": f"blf:{name}",
+                            "textures": {"default": f"textures/entity/{name}"},
+                            "geometry": {"default": f"geometry.{name}"},
+                            "animations": {"setup": f"animation.{name}.setup"},
+                            "scripts": {"animate": ["setup", f"controller.animation.{name}"]},
+                            "spawn_egg": {"texture": name},
+                        }
+                    }
+                },
+            )
+        bones = [{"name": f"bone_{b}", "cubes": [{"origin": [0, 0, 0], "size": [1, 1, 1]}]} for b in range(4)]
+        write_json(
+            pack_dir / "models" / "entity" / f"{name}.geo.json",
+            {"minecraft:geometry": [{"description": {"identifier": f"geometry.{name}"}, "bones": bones}]},
+        )
+        write_json(
+            pack_dir / "animations" / f"{name}.animation.json",
+            {"animations": {f"animation.{name}.setup": {"bones": {"bone_0": {"rotation": [0, 0, 0]}}}}},
+        )
+        write_json(
+            pack_dir / "animation_controllers" / f"{name}.ac.json",
+            {"animation_controllers": {f"controller.animation.{name}": {"states": {"default": {}}}}},
+        )
+        for texture in (pack_dir / "textures" / "entity" / f"{name}.png", pack_dir / "textures" / "items" / f"{name}.icon.png"):
+            texture.parent.mkdir(parents=True, exist_ok=True)
+            texture.write_bytes(b"\x89PNG" + bytes(60))
+        texture_data[name] = {"textures": f"textures/items/{name}.icon"}
+    write_json(pack_dir / "textures" / "item_texture.json", {"texture_data": texture_data})
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<22} {time.perf_counter() - start:7.2f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time orphan detection over a synthetic pack.")
+    parser.add_argument("--entities", type=int, default=17000, help="six files per entity")
+    parser.add_argument("--abandon-every", type=int, default=10, help="every Nth entity loses its client entity")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "development_resource_packs"
+        timed("generate", lambda: synthetic_pack(root / "BLF_CustomEntity", args.entities, args.abandon_every))
+        index = ReferenceIndex()
+        timed("index (cold)", lambda: index.update_root(root))
+        saved = timed("index save", index.to_dict)
+        cached = timed("index load", lambda: ReferenceIndex.from_dict(saved))
+        timed("index refresh", lambda: cached.update_root(root))
+        report = timed("reachability", lambda: find_orphans(cached))
+        print(
+            f"{len(cached)} files, {report.roots} roots, {report.reachable} reachable, "
+            f"{len(report.files)} unreachable ({report.size} bytes), {len(report.entries)} atlas entries not named by any indexed file"
+        )
+
+
+if __name__ == "__main__":
+    main()
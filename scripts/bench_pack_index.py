@@ -0,0 +1,174 @@
+﻿import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from goldstar.models import PackIndex  # noqa: E402
+
+PACK_PATH = Path("/packs/BLF_CustomEntity")
+LAYOUT = [
+    ("entity", ".entity.json"),
+    ("models/entity", ".geo.json"),
+    ("animations", ".animation.json"),
+    ("animation_controllers", ".ac.json"),
+    ("textures/entity", ".png"),
+    ("textures/items", ".icon.png"),
+]
+
+
+def synthetic_rows(count: int):
+    # Generated lazily so every measured structure pays for its own strings.
+    for i in range(count):
+        directory, suffix = LAYOUT[i % len(LAYOUT)]
+        prefix = "default_" if i % 1000 < len(LAYOUT) else "entity_"
+        yield f"{directory}/{prefix}{i:06d}{suffix}", 1024 + i, 1_700_000_000_000_000_000 + i
+
+
+# Copies of the list-based types PackIndex replaced, so the baseline does not follow later edits to models.py.
+@dataclass(frozen=True)
+class BaselineFileEntry:
+    rel_path: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def name(self) -> str:
+        return self.rel_path.rsplit("/", 1)[-1]
+
+
+@dataclass
+class BaselinePackMetadata:
+    name: str
+    path: Path
+    default_files: List[Path] = field(default_factory=list)
+    item_texture: Optional[Path] = None
+    default_icons: List[Path] = field(default_factory=list)
+    files: List[BaselineFileEntry] = field(default_factory=list)
+    _directories: Optional[Dict[str, Tuple[Set[str], List[int]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def children(self, rel_dir: str = "") -> Tuple[List[str], List[BaselineFileEntry]]:
+        if self._directories is None:
+            self._directories = _baseline_directories(entry.rel_path for entry in self.files)
+        subdirs, indices = self._directories.get(rel_dir.strip("/"), (set(), []))
+        return sorted(subdirs), [self.files[i] for i in indices]
+
+    def summary_line(self) -> str:
+        item_texture_flag = "yes" if self.item_texture else "no"
+        return (
+            f"{self.name} | defaults: {len(self.default_files)} | "
+            f"item_texture: {item_texture_flag} | icons: {len(self.default_icons)}"
+        )
+
+
+def _baseline_directories(rel_paths) -> Dict[str, Tuple[Set[str], List[int]]]:
+    directories: Dict[str, Tuple[Set[str], List[int]]] = {"": (set(), [])}
+    for index, rel_path in enumerate(rel_paths):
+        parent, _, _ = rel_path.rpartition("/")
+        missing = []
+        child = parent
+        while child not in directories:
+            missing.append(child)
+            child = child.rpartition("/")[0]
+        for child in reversed(missing):
+            ancestor, _, name = child.rpartition("/")
+            directories[ancestor][0].add(name)
+            directories[child] = (set(), [])
+        directories[parent][1].append(index)
+    return directories
+
+
+def build_metadata(rows) -> BaselinePackMetadata:
+    # Same steps as the list-based scan_pack: FileEntry per file, then Path lists for defaults and icons.
+    files = sorted((BaselineFileEntry(*row) for row in rows), key=lambda entry: entry.rel_path)
+    return BaselinePackMetadata(
+        name=PACK_PATH.name,
+        path=PACK_PATH,
+        default_files=sorted(PACK_PATH / entry.rel_path for entry in files if entry.name.startswith("default_")),
+        item_texture=PACK_PATH / "textures" / "item_texture.json",
+        default_icons=sorted(
+            PACK_PATH / entry.rel_path
+            for entry in files
+            if entry.rel_path.startswith("textures/items/")
+            and entry.rel_path.count("/") == 2
+            and entry.name.startswith("default_")
+            and entry.name.endswith(".png")
+        ),
+        files=files,
+    )
+
+
+def build_original(rows) -> BaselinePackMetadata:
+    # Before the pack browser, scan_pack kept only the default file and icon paths, not one record per file.
+    default_files = []
+    for rel_path, _, _ in rows:
+        if rel_path.rsplit("/", 1)[-1].startswith("default_"):
+            default_files.append(PACK_PATH / rel_path)
+    return BaselinePackMetadata(
+        name=PACK_PATH.name,
+        path=PACK_PATH,
+        default_files=sorted(default_files),
+        item_texture=PACK_PATH / "textures" / "item_texture.json",
+        default_icons=sorted(p for p in default_files if p.parent.name == "items" and p.suffix == ".png"),
+    )
+
+
+def build_index(rows) -> PackIndex:
+    return PackIndex.build(PACK_PATH.name, PACK_PATH, rows, PACK_PATH / "textures" / "item_texture.json")
+
+
+def measure(label: str, factory, count: int) -> object:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = factory(synthetic_rows(count))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_file = retained / count
+    print(
+        f"{label:<16} retained {retained / 1e6:8.2f} MB  ({per_file:6.1f} B/file)  "
+        f"peak {peak / 1e6:8.2f} MB  build {elapsed * 1000:8.1f} ms"
+    )
+    return result
+
+
+def time_queries(label: str, pack) -> None:
+    start = time.perf_counter()
+    pack.children("textures/entity")
+    children_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    summary = pack.summary_line()
+    summary_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    total = sum(entry.size for entry in pack.files)
+    iterate_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"{label:<16} children {children_ms:7.1f} ms  summary {summary_ms:6.2f} ms  "
+        f"iterate {iterate_ms:7.1f} ms  ({summary.split(' | ', 1)[1]}, {total} bytes)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the list-based PackMetadata and PackIndex memory use.")
+    parser.add_argument("--files", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.files} files")
+    measure("no file list", build_original, args.files)
+    metadata = measure("PackMetadata", build_metadata, args.files)
+    index = measure("PackIndex", build_index, args.files)
+    time_queries("PackMetadata", metadata)
+    time_queries("PackIndex", index)
+
+
+if __name__ == "__main__":
+    main()